@@ -15,6 +15,33 @@ os.makedirs(TRAINED_MODELS_DIR, exist_ok=True)
 os.makedirs(TRAINING_DATA_DIR, exist_ok=True)
 
 NLP_MODEL_CONFIG = {
+    "encoder_model": "sentence-transformers/all-MiniLM-L6-v2",  # shared encoder used for embeddings and skill extraction
+    "encoder_backend": "torch",  # "torch" or "onnx" (CPU inference through onnxruntime)
+    "quantization": None,  # None (fp32) or "int8" dynamic quantization, see benchmark_quantization
+    "onnx_path": None,  # exported graph, defaults to <cache_dir>/encoder-<model>.onnx
+    "onnx_threads": None,  # onnxruntime intra-op threads, None lets onnxruntime decide
+    "cache_dir": TRAINED_MODELS_DIR,  # precomputed skill embeddings and other derived artifacts
+    # long documents are embedded as overlapping token windows instead of being truncated
+    "chunk_tokens": 256,
+    "chunk_overlap": 32,
+    "max_tokens_per_batch": 8192,  # caps padded tokens per forward pass (memory)
+    "embedding_cache_size": 2048,  # documents kept in the in-process embedding cache (plus the database tier)
+    "embedding_dtype": "float32",  # stored document embeddings, "float16" halves their size
+    # approximate nearest-neighbour index over resume embeddings, see build_resume_index
+    "index_nlist": None,  # inverted lists, defaults to 4 * sqrt(number of resumes)
+    "index_nprobe": 16,  # lists scanned per query, higher is slower but finds more true neighbours
+    "index_compact_ops": 1000,  # saved/deleted resumes logged before the index is compacted in the background
+    "index_method": "ivf",  # "sketch" scans compact PCA/sign-bit sketches of every resume, then reranks
+    "index_sketch_dims": 64,  # PCA dimensions (= sign bits) stored per resume
+    # run inference in the worker pool started by `manage.py run_inference_pool` instead of
+    # loading the weights into every web worker, e.g. "/tmp/resume-screener-inference.sock"
+    "inference_address": os.getenv('INFERENCE_ADDRESS'),
+    "inference_authkey": None,  # defaults to SECRET_KEY
+    "inference_timeout": 60,  # seconds before a request to a stuck inference worker fails
+    # coalesce concurrent inference calls from request threads into shared batches
+    "micro_batching": False,
+    "batch_max_size": 64,  # texts per coalesced batch
+    "batch_max_wait_ms": 5,  # how long the first request waits for company
     "embedding_model": "sentence-transformers/all-mpnet-base-v2",
     "token_classifier": "dslim/bert-base-NER",
     "zero_shot_classifier": "facebook/bart-large-mnli",
@@ -23,6 +50,7 @@ NLP_MODEL_CONFIG = {
 SKILL_EXTRACTION_CONFIG = {
     "confidence_threshold": 0.7,
     "max_phrase_length": 4,
+    "write_taxonomy_artifacts": True,
 }
 
 INSTALLED_APPS = [
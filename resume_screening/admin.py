@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Resume, JobDescription
+from .models import Resume, JobDescription, Skill, SkillAlias
 
 @admin.register(Resume)
 class ResumeAdmin(admin.ModelAdmin):
@@ -11,4 +11,16 @@ class ResumeAdmin(admin.ModelAdmin):
 class JobDescriptionAdmin(admin.ModelAdmin):
     list_display = ('id', 'raw_text', 'uploaded_at', 'resume')
     list_filter = ('resume',)
-    search_fields = ('raw_text',)
\ No newline at end of file
+    search_fields = ('raw_text',)
+
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 1
+
+# skills and aliases added here reach every worker's matcher within taxonomy_poll_seconds
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ('name', 'category', 'subcategory')
+    list_filter = ('category', 'subcategory')
+    search_fields = ('name', 'aliases__alias')
+    inlines = [SkillAliasInline]
@@ -0,0 +1,157 @@
+import ast
+import time
+from pathlib import Path
+import numpy as np
+import torch
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from resume_screening.utils.analyze_job_requirements import JobRequirementsAnalyzer
+from resume_screening.utils.bert_utils import embed_documents
+from resume_screening.utils.enhanced_skill_extraction import EnhancedSkillExtractor
+from resume_screening.utils.model_registry import get_model
+from resume_screening.views import EnhancedSkillMatchingAPI
+
+REPO_DIR = Path(__file__).resolve().parents[3]
+FIXTURE_FILES = [
+    *sorted((REPO_DIR / 'resume_screening' / 'tests').glob('test_*.py')),
+    REPO_DIR / 'test_enhanced_api.py',
+]
+
+
+def load_fixture_texts():
+    """
+    Collect the sample resumes and job descriptions used by the test scripts
+    every string literal assigned to a name containing "text" or starting with
+    "sample" is taken; names containing "resume" are treated as resumes
+    returns: (resume texts, job texts)
+    """
+    resumes, jobs = [], []
+    for path in FIXTURE_FILES:
+        if not path.exists():
+            continue
+        tree = ast.parse(path.read_text(encoding='utf-8'))
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Assign) or not isinstance(node.value, ast.Constant):
+                continue
+            if not isinstance(node.value.value, str):
+                continue
+            for target in node.targets:
+                if isinstance(target, ast.Name) and ('text' in target.id or target.id.startswith('sample')):
+                    text = node.value.value.strip()
+                    if text and text not in resumes and text not in jobs:
+                        (resumes if 'resume' in target.id else jobs).append(text)
+    return resumes, jobs
+
+
+def weights_size(model):
+    """Bytes held by the model weights (quantized linears keep int8 weights in packed params)"""
+    def size(value):
+        if isinstance(value, torch.Tensor):
+            return value.numel() * value.element_size()
+        if isinstance(value, (tuple, list)):
+            return sum(size(item) for item in value)
+        return 0
+    return sum(size(value) for value in model.state_dict().values())
+
+
+def model_size(loaded):
+    """Bytes of the weights the encoder backend runs: the exported graph for onnx, the torch module otherwise"""
+    if loaded.backend == 'onnx':
+        return loaded.encoder.onnx_path.stat().st_size
+    return weights_size(loaded.model)
+
+
+def timed(fn, repeat):
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat
+
+
+class Command(BaseCommand):
+    help = "Compare the int8 quantized encoder with fp32: speed, memory and drift of embeddings, skills and match scores"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='timed repetitions per variant')
+        parser.add_argument('--max-score-drift', type=float, default=None,
+                            help='fail if any resume/job match score moves by more than this')
+        parser.add_argument('--semantic-threshold', type=float, default=None,
+                            help='similarity threshold of the semantic skill matches of both variants '
+                                 '(defaults to the configured or calibrated one of the fp32 model)')
+
+    def handle(self, *args, **options):
+        resumes, jobs = load_fixture_texts()
+        texts = resumes + jobs
+        if not texts:
+            raise CommandError("No fixture texts found")
+        self.stdout.write(f"{len(resumes)} resumes and {len(jobs)} job descriptions from {len(FIXTURE_FILES)} files")
+
+        # lexical matches do not depend on the encoder, so skills are extracted with semantic
+        # matching on and one threshold for both variants: only the similarities can move
+        threshold = options['semantic_threshold']
+        if threshold is None:
+            threshold = EnhancedSkillExtractor(get_model(quantization=None)).semantic_threshold
+        if threshold is None:
+            raise CommandError("No semantic threshold configured or calibrated for the fp32 model; "
+                               "pass --semantic-threshold or run `manage.py calibrate_semantic_threshold`")
+        self.stdout.write(f"semantic skill matching at threshold {threshold:.4f}")
+        skill_config = dict(getattr(settings, 'SKILL_EXTRACTION_CONFIG', {}),
+                            semantic_matching=True, semantic_threshold=threshold)
+
+        variants = {}
+        for quantization in (None, 'int8'):
+            loaded = get_model(quantization=quantization)
+            extractor = EnhancedSkillExtractor(loaded)
+            analyzer = JobRequirementsAnalyzer(extractor)
+            embeddings, embed_seconds = timed(lambda: embed_documents(texts, loaded=loaded), options['repeat'])
+            with override_settings(SKILL_EXTRACTION_CONFIG=skill_config):
+                skills, extract_seconds = timed(
+                    lambda: [extractor.extract_skills_with_confidence(text) for text in texts], options['repeat'])
+                job_analyses = [analyzer.analyze(job) for job in jobs]
+            matcher = EnhancedSkillMatchingAPI()
+            scores = np.array([
+                [matcher.calculate_enhanced_matching_score(skills[i], job_analysis)['overall_score']
+                 for job_analysis in job_analyses]
+                for i in range(len(resumes))
+            ])
+            variants[quantization] = {
+                'size': model_size(loaded),
+                'embed_seconds': embed_seconds,
+                'extract_seconds': extract_seconds,
+                'embeddings': embeddings,
+                'skills': skills,
+                'scores': scores,
+            }
+
+        fp32, int8 = variants[None], variants['int8']
+
+        a, b = fp32['embeddings'], int8['embeddings']
+        cosine = (a * b).sum(axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1) + 1e-12)
+
+        jaccards, confidence_drift = [], []
+        for before, after in zip(fp32['skills'], int8['skills']):
+            before_map = {s['name']: s['confidence'] for s in before}
+            after_map = {s['name']: s['confidence'] for s in after}
+            union = set(before_map) | set(after_map)
+            jaccards.append(len(set(before_map) & set(after_map)) / len(union) if union else 1.0)
+            confidence_drift.extend(abs(before_map[n] - after_map[n]) for n in set(before_map) & set(after_map))
+        score_drift = np.abs(fp32['scores'] - int8['scores'])
+
+        self.stdout.write("")
+        self.stdout.write(f"model size        fp32 {fp32['size'] / 2**20:8.1f} MB   int8 {int8['size'] / 2**20:8.1f} MB"
+                          f"   saved {(fp32['size'] - int8['size']) / 2**20:.1f} MB")
+        self.stdout.write(f"embedding time    fp32 {fp32['embed_seconds'] * 1000:8.1f} ms   int8 {int8['embed_seconds'] * 1000:8.1f} ms"
+                          f"   speedup {fp32['embed_seconds'] / int8['embed_seconds']:.2f}x")
+        self.stdout.write(f"extraction time   fp32 {fp32['extract_seconds'] * 1000:8.1f} ms   int8 {int8['extract_seconds'] * 1000:8.1f} ms"
+                          f"   speedup {fp32['extract_seconds'] / int8['extract_seconds']:.2f}x")
+        self.stdout.write(f"embedding cosine  min {cosine.min():.4f}   mean {cosine.mean():.4f}")
+        self.stdout.write(f"skill overlap     min jaccard {min(jaccards):.3f}   mean {np.mean(jaccards):.3f}"
+                          f"   max confidence drift {max(confidence_drift, default=0.0):.4f}")
+        if score_drift.size:
+            self.stdout.write(f"match score drift max {score_drift.max():.4f}   mean {score_drift.mean():.4f}"
+                              f"   over {score_drift.size} resume/job pairs")
+
+        if options['max_score_drift'] is not None and score_drift.size and score_drift.max() > options['max_score_drift']:
+            raise CommandError(f"Match scores drift by {score_drift.max():.4f} (> {options['max_score_drift']})")
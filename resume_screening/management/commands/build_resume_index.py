@@ -0,0 +1,51 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from resume_screening.models import Resume
+from resume_screening.utils.model_registry import get_resume_index_store
+from resume_screening.utils.resume_index import build_resume_index
+
+
+class Command(BaseCommand):
+    help = "Build the approximate nearest-neighbour index over stored resume embeddings"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--nlist', type=int, default=None,
+                            help='number of inverted lists (defaults to NLP_MODEL_CONFIG or 4 * sqrt(resumes))')
+        parser.add_argument('--iterations', type=int, default=10, help='k-means iterations')
+        parser.add_argument('--model-id', default=None,
+                            help='only index embeddings of this model (defaults to the current encoder)')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='rows loaded per database round trip')
+        parser.add_argument('--compact', action='store_true',
+                            help='only fold logged resume changes into a new generation, without retraining')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options['compact']:
+            manifest = get_resume_index_store().compact()
+            if manifest is None:
+                self.stdout.write("Nothing to compact (no logged changes, or another process is compacting)")
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Compacted into {manifest['generation']} ({manifest['count']} resumes) "
+                    f"in {time.perf_counter() - started:.1f}s"
+                ))
+            return
+        try:
+            manifest = build_resume_index(
+                model_id=options['model_id'],
+                nlist=options['nlist'],
+                iterations=options['iterations'],
+                chunk_size=options['chunk_size'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        unlabelled = Resume.objects.filter(embedding__isnull=False, embedding_model='').count()
+        if unlabelled:
+            self.stdout.write(self.style.WARNING(
+                f"Left out {unlabelled} resumes embedded before the model was recorded; "
+                f"run `manage.py reindex_embeddings --only resumes` and build the index again"
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {manifest['count']} resumes into {manifest['nlist']} lists "
+            f"({manifest['generation']}) in {time.perf_counter() - started:.1f}s"
+        ))
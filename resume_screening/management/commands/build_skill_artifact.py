@@ -0,0 +1,21 @@
+import time
+from django.core.management.base import BaseCommand
+from resume_screening.utils.skill_taxonomy import SkillTaxonomy, write_artifact
+
+
+class Command(BaseCommand):
+    help = "Compile the skill dictionaries (skills, acronyms, matcher automaton, fuzzy index) into the artifact workers load at startup"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output-dir', default=None,
+                            help='directory to write the artifact to (defaults to NLP_MODEL_CONFIG["cache_dir"])')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        taxonomy = SkillTaxonomy.from_dictionaries()
+        path = write_artifact(taxonomy, options['output_dir'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Compiled {len(taxonomy)} skills and {len(taxonomy.acronym_map)} acronyms "
+            f"(version {taxonomy.version}) into {path} ({path.stat().st_size / 1024:.0f} KiB) "
+            f"in {time.perf_counter() - started:.2f}s"
+        ))
@@ -0,0 +1,66 @@
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from resume_screening.utils.bert_utils import embed_many
+from resume_screening.utils.model_registry import get_skill_extractor
+from resume_screening.utils.semantic_calibration import (
+    NON_SKILLS, PARAPHRASES, measure_thresholds, pick_threshold, save_calibration, top_matches,
+)
+
+
+class Command(BaseCommand):
+    help = "Measure the semantic skill matching threshold for the configured encoder and store it for the workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pairs', default=None,
+                            help='tab-separated file of "phrase<TAB>skill name" paraphrases added to the built-in ones')
+        parser.add_argument('--negatives', default=None,
+                            help='file with one phrase per line that must match no skill, added to the built-in ones')
+        parser.add_argument('--min-precision', type=float, default=0.95,
+                            help='precision the stored threshold must reach on these phrases')
+        parser.add_argument('--dry-run', action='store_true', help='report the measurement without storing it')
+
+    def handle(self, *args, **options):
+        extractor = get_skill_extractor()
+        paraphrases = dict(PARAPHRASES)
+        negatives = list(NON_SKILLS)
+        if options['pairs']:
+            with open(options['pairs'], encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        phrase, skill_name = line.rstrip('\n').split('\t')[:2]
+                        paraphrases[phrase.strip().lower()] = skill_name.strip()
+        if options['negatives']:
+            with open(options['negatives'], encoding='utf-8') as f:
+                negatives.extend(line.strip().lower() for line in f if line.strip())
+        paraphrases = {phrase: skill for phrase, skill in paraphrases.items() if skill.lower() in extractor.skills}
+        if not paraphrases:
+            raise CommandError("None of the paraphrased skills is in the skill taxonomy")
+
+        loaded = extractor.loaded_model
+        phrases = list(paraphrases) + negatives
+        best, scores = top_matches(embed_many(phrases, loaded=loaded), extractor.skill_unit_matrix)
+        positive_hits = [
+            (extractor.skill_names[best[i]].lower() == paraphrases[phrase].lower(), float(scores[i]))
+            for i, phrase in enumerate(paraphrases)
+        ]
+        negative_scores = [float(score) for score in scores[len(paraphrases):]]
+        # every observed similarity is a point where precision or recall changes
+        rows = measure_thresholds(positive_hits, negative_scores, sorted(set(np.round(scores, 4).tolist())))
+
+        for row in rows:
+            self.stdout.write(f"  {row['threshold']:.4f}  precision {row['precision']:.2f}  recall {row['recall']:.2f}")
+        chosen = pick_threshold(rows, options['min_precision'])
+        if chosen is None:
+            raise CommandError(f"No threshold reaches a precision of {options['min_precision']} for {loaded.model_id}; "
+                               f"keep semantic_matching off for this model")
+        summary = (f"{loaded.model_id}: threshold {chosen['threshold']:.4f} "
+                   f"(precision {chosen['precision']:.2f}, recall {chosen['recall']:.2f} "
+                   f"on {len(paraphrases)} paraphrases and {len(negatives)} non-skills)")
+        if options['dry_run']:
+            self.stdout.write(summary)
+            return
+        path = save_calibration(loaded.model_id, {
+            **chosen, 'min_precision': options['min_precision'],
+            'paraphrases': len(paraphrases), 'negatives': len(negatives), 'measurements': rows,
+        })
+        self.stdout.write(self.style.SUCCESS(f"{summary} stored in {path}"))
@@ -0,0 +1,44 @@
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from resume_screening.utils.bert_utils import MAX_LENGTH, collate
+from resume_screening.utils.encoders import OnnxEncoder, TorchEncoder, check_parity, export_onnx, onnx_path_for
+from resume_screening.utils.model_registry import get_model
+from resume_screening.utils.skills_dictionaries import ALL_SKILLS
+
+PARITY_TEXTS = [
+    "Strong Python programming skills required. Experience with React and Node.js preferred.",
+    "Senior Full Stack Developer with 5+ years of Django, PostgreSQL and AWS experience.",
+    "Excellent communication and teamwork, familiar with Agile/Scrum and CI/CD pipelines.",
+    "Machine learning engineer: TensorFlow, PyTorch, NLP, model deployment on Kubernetes.",
+]
+
+
+class Command(BaseCommand):
+    help = "Export the encoder to ONNX and check that its embeddings match the torch backend"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='where to write the graph (defaults to NLP_MODEL_CONFIG onnx_path)')
+        parser.add_argument('--opset', type=int, default=17)
+        parser.add_argument('--atol', type=float, default=1e-4, help='max allowed absolute difference per dimension')
+        parser.add_argument('--force', action='store_true', help='re-export even if the graph already exists')
+
+    def handle(self, *args, **options):
+        # always the local fp32 weights: a quantized or remote model cannot be exported or compared
+        loaded = get_model(quantization=None, remote=None)
+        onnx_path = Path(options['output']) if options['output'] else onnx_path_for(loaded.name)
+        if options['force'] or not onnx_path.exists():
+            export_onnx(loaded.model, onnx_path, opset=options['opset'])
+            self.stdout.write(f"Exported {loaded.name} to {onnx_path}")
+
+        texts = PARITY_TEXTS + [skill_info['name'] for skill_info in ALL_SKILLS.values()]
+        encoded = loaded.tokenize(texts, truncation=True, max_length=MAX_LENGTH)['input_ids']
+        batches = [collate(loaded, encoded[i:i + 16]) for i in range(0, len(encoded), 16)]
+
+        result = check_parity(TorchEncoder(loaded.model), OnnxEncoder(onnx_path), batches, atol=options['atol'])
+        self.stdout.write(
+            f"max abs diff {result['max_abs_diff']:.2e}, min cosine {result['min_cosine']:.6f} "
+            f"over {len(texts)} texts"
+        )
+        if not result['passed']:
+            raise CommandError(f"ONNX embeddings differ from torch by more than {options['atol']}")
+        self.stdout.write(self.style.SUCCESS("ONNX encoder matches the torch backend"))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from resume_screening.utils.import_profile import STARTUP_IMPORTS, heavy_imports, profile_startup
+
+
+class Command(BaseCommand):
+    help = "Report import time of Django startup and fail if torch/transformers/onnxruntime are imported eagerly"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=15, help='number of slowest modules to list')
+        parser.add_argument('--budget-ms', type=float, default=None,
+                            help='fail when total startup import time exceeds this many milliseconds')
+        parser.add_argument('--allow-heavy', action='store_true',
+                            help='only report heavy imports instead of failing')
+
+    def handle(self, *args, **options):
+        try:
+            timings, total_us = profile_startup(STARTUP_IMPORTS)
+        except RuntimeError as e:
+            raise CommandError(f"Startup imports failed: {e}")
+
+        slowest = sorted(timings.items(), key=lambda item: item[1][1], reverse=True)[:options['top']]
+        self.stdout.write(f"Imported {len(timings)} modules in {total_us / 1000:.1f} ms")
+        for name, (self_us, cumulative_us) in slowest:
+            self.stdout.write(f"  {cumulative_us / 1000:8.1f} ms cumulative  {self_us / 1000:8.1f} ms self  {name}")
+
+        heavy = heavy_imports(timings)
+        for name, cumulative_us in heavy.items():
+            self.stdout.write(self.style.WARNING(f"{name} imported at startup ({cumulative_us / 1000:.1f} ms)"))
+        if heavy and not options['allow_heavy']:
+            raise CommandError(f"Heavy modules imported at startup: {', '.join(heavy)}")
+        if options['budget_ms'] is not None and total_us / 1000 > options['budget_ms']:
+            raise CommandError(f"Startup imports took {total_us / 1000:.1f} ms, budget is {options['budget_ms']} ms")
+        self.stdout.write(self.style.SUCCESS("No heavy modules imported at startup"))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from resume_screening.models import Resume, JobDescription
+
+
+class Command(BaseCommand):
+    help = "Recompute embedding_vector for stored resumes and job descriptions using batched inference"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', choices=['resumes', 'jobs'], help='re-index only one of the two tables')
+        parser.add_argument('--max-tokens-per-batch', type=int, default=None,
+                            help='padded tokens per forward pass (defaults to NLP_MODEL_CONFIG)')
+        parser.add_argument('--chunk-size', type=int, default=500, help='rows loaded and written per database round trip')
+
+    def handle(self, *args, **options):
+        targets = [
+            ('resumes', Resume, 'extracted_text'),
+            ('jobs', JobDescription, 'raw_text'),
+        ]
+        for label, model, text_field in targets:
+            if options['only'] and options['only'] != label:
+                continue
+            queryset = (
+                model.objects.exclude(**{f'{text_field}__isnull': True})
+                .exclude(**{text_field: ''})
+                .only('pk', text_field)
+                .order_by('pk')
+            )
+            total = 0
+            chunk = []
+            for obj in queryset.iterator(chunk_size=options['chunk_size']):
+                chunk.append(obj)
+                if len(chunk) >= options['chunk_size']:
+                    total += model.update_embeddings(chunk, max_tokens_per_batch=options['max_tokens_per_batch'])
+                    chunk = []
+            if chunk:
+                total += model.update_embeddings(chunk, max_tokens_per_batch=options['max_tokens_per_batch'])
+            self.stdout.write(self.style.SUCCESS(f"Re-indexed {total} {label}"))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from resume_screening.utils.config import nlp_setting
+from resume_screening.utils.inference_pool import serve
+
+
+class Command(BaseCommand):
+    help = "Run model inference in forked worker processes that share the encoder weights copy-on-write"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--address', default=None,
+                            help='unix socket path (defaults to NLP_MODEL_CONFIG inference_address)')
+        parser.add_argument('--workers', type=int, default=2, help='number of inference processes')
+        parser.add_argument('--threads-per-worker', type=int, default=1, help='torch intra-op threads per process')
+
+    def handle(self, *args, **options):
+        address = options['address'] or nlp_setting("inference_address")
+        if not address:
+            raise CommandError("Pass --address or set NLP_MODEL_CONFIG['inference_address']")
+        serve(
+            address,
+            workers=options['workers'],
+            threads_per_worker=options['threads_per_worker'],
+            log=self.stdout.write,
+        )
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from resume_screening.models import Skill, SkillAlias, TaxonomyVersion
+from resume_screening.utils.skills_dictionaries import ALL_SKILLS
+from resume_screening.utils.taxonomy_watcher import build_taxonomy
+
+
+class Command(BaseCommand):
+    help = "Store the skills of skills_dictionaries.py as Skill rows and compile the database-backed skill taxonomy"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--update', action='store_true',
+                            help='also reset the category and subcategory of existing skills to the dictionary values')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            existing = {skill.name: skill for skill in Skill.objects.all()}
+            missing = [
+                Skill(name=info['name'], category=info['category'], subcategory=info['subcategory'])
+                for info in ALL_SKILLS.values() if info['name'] not in existing
+            ]
+            Skill.objects.bulk_create(missing, ignore_conflicts=True)
+
+            changed = []
+            if options['update']:
+                for info in ALL_SKILLS.values():
+                    skill = existing.get(info['name'])
+                    if skill and (skill.category, skill.subcategory) != (info['category'], info['subcategory']):
+                        skill.category, skill.subcategory = info['category'], info['subcategory']
+                        changed.append(skill)
+                Skill.objects.bulk_update(changed, ['category', 'subcategory'])
+
+            # bulk operations send no signals, so workers are told here
+            if missing or changed:
+                TaxonomyVersion.bump()
+
+        # compile the artifact now, so workers unpickle it instead of each compiling it
+        taxonomy = build_taxonomy(TaxonomyVersion.current())
+        self.stdout.write(self.style.SUCCESS(
+            f"Added {len(missing)} and updated {len(changed)} skills; taxonomy {taxonomy.version} has "
+            f"{Skill.objects.count()} stored skills, {SkillAlias.objects.count()} aliases and {len(taxonomy)} phrases"
+        ))
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.3 on 2026-10-18 01:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_screening', '0003_alter_resumeskill_unique_together_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmbeddingCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64)),
+                ('model_id', models.CharField(max_length=255)),
+                ('vector', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='embeddingcacheentry',
+            constraint=models.UniqueConstraint(fields=('content_hash', 'model_id'), name='unique_embedding_cache_entry'),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 4.2.3 on 2026-10-18 01:42
+
+import numpy as np
+from django.db import migrations, models
+
+CHUNK_SIZE = 500
+
+
+def _convert(apps, model_names, source, write, fields):
+    # rows are read and written in chunks so large tables never sit in memory at once
+    for model_name in model_names:
+        model = apps.get_model('resume_screening', model_name)
+        queryset = model.objects.exclude(**{f'{source}__isnull': True}).only('pk', source).order_by('pk')
+        chunk = []
+        for obj in queryset.iterator(chunk_size=CHUNK_SIZE):
+            write(obj)
+            chunk.append(obj)
+            if len(chunk) >= CHUNK_SIZE:
+                model.objects.bulk_update(chunk, fields)
+                chunk = []
+        if chunk:
+            model.objects.bulk_update(chunk, fields)
+
+
+def json_to_binary(apps, schema_editor):
+    def write(obj):
+        vector = np.asarray(obj.embedding_vector, dtype='<f4').reshape(-1)
+        obj.embedding = vector.tobytes()
+        obj.embedding_dim = vector.shape[0]
+        obj.embedding_dtype = 'float32'
+        obj.embedding_model = ''  # not recorded for JSON embeddings
+    _convert(apps, ['resume', 'jobdescription'], 'embedding_vector', write,
+             ['embedding', 'embedding_dim', 'embedding_dtype', 'embedding_model'])
+
+
+def binary_to_json(apps, schema_editor):
+    def write(obj):
+        dtype = '<f2' if obj.embedding_dtype == 'float16' else '<f4'
+        obj.embedding_vector = np.frombuffer(obj.embedding, dtype=dtype).astype(np.float64).tolist()
+    _convert(apps, ['resume', 'jobdescription'], 'embedding', write, ['embedding_vector'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_screening', '0004_embeddingcacheentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobdescription',
+            name='embedding',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobdescription',
+            name='embedding_dim',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobdescription',
+            name='embedding_dtype',
+            field=models.CharField(choices=[('float32', 'float32'), ('float16', 'float16')], default='float32', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='jobdescription',
+            name='embedding_model',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='embedding',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='embedding_dim',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='embedding_dtype',
+            field=models.CharField(choices=[('float32', 'float32'), ('float16', 'float16')], default='float32', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='embedding_model',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.RunPython(json_to_binary, binary_to_json, elidable=True),
+        migrations.RemoveField(
+            model_name='jobdescription',
+            name='embedding_vector',
+        ),
+        migrations.RemoveField(
+            model_name='resume',
+            name='embedding_vector',
+        ),
+    ]
@@ -1,19 +1,52 @@
-from django.db import models
+from django.db import models, transaction, IntegrityError
+from django.utils import timezone
 from pathlib import Path
 from django.core.exceptions import ValidationError
 from .utils.text_extraction import extract_text
-from .utils.bert_utils import get_bert_embedding
 import os
 from .utils.extract_skills import extract_skills_from_text
-from .utils.enhanced_skill_extraction import EnhancedSkillExtractor
-from .utils.analyze_job_requirements import JobRequirementsAnalyzer
+from .utils.model_registry import get_skill_extractor, get_job_analyzer, get_embedding_cache
+from .utils.config import nlp_setting
+from .utils import vector_codec
+from .utils.resume_index import index_resumes
         
 
-class Resume(models.Model):
+class EmbeddedDocument(models.Model):
+    """Packed document embedding (float32 or float16 bytes) with its dimension and producing model"""
+    EMBEDDING_DTYPES = [(dtype, dtype) for dtype in vector_codec.STORAGE_DTYPES]
+    EMBEDDING_FIELDS = ['embedding', 'embedding_dim', 'embedding_dtype', 'embedding_model']
+    
+    embedding = models.BinaryField(blank=True, null=True)
+    embedding_dim = models.PositiveIntegerField(blank=True, null=True)
+    embedding_dtype = models.CharField(max_length=10, choices=EMBEDDING_DTYPES, default='float32')
+    embedding_model = models.CharField(max_length=255, blank=True)  # model and pooling that produced the vector
+    
+    class Meta:
+        abstract = True
+    
+    @property
+    def embedding_vector(self):
+        """Read-only numpy view over the stored bytes, or None when not embedded yet"""
+        return vector_codec.unpack(self.embedding, self.embedding_dtype, self.embedding_dim)
+    
+    @embedding_vector.setter
+    def embedding_vector(self, vector):
+        self.set_embedding(vector)
+    
+    def set_embedding(self, vector, model_id=''):
+        if vector is None:
+            self.embedding, self.embedding_dim, self.embedding_model = None, None, ''
+            return
+        dtype = nlp_setting("embedding_dtype")
+        self.embedding, self.embedding_dim = vector_codec.pack(vector, dtype)
+        self.embedding_dtype = dtype
+        self.embedding_model = model_id
+
+
+class Resume(EmbeddedDocument):
     file = models.FileField(upload_to='resumes/')
     uploaded_at = models.DateTimeField(auto_now_add=True)  # for tracking
     extracted_text = models.TextField(blank=True, null=True)
-    embedding_vector = models.JSONField(blank=True, null=True)
     
     def __str__(self):
         return self.extracted_text[:50] if self.extracted_text else f"Resume {self.id}"
@@ -32,7 +65,8 @@ class Resume(models.Model):
                 raise ValidationError(f"File size exceeds maximum limit of {max_file_size / (1024*1024)} MB")
     
     # extracts text, generates embedding vectors
-    def save(self, *args, **kwargs):
+    # embed=False leaves the embedding to a later batched update_embeddings() call
+    def save(self, *args, embed=True, **kwargs):
         super().save(*args, **kwargs)
         file_path = self.file.path
         if os.path.exists(file_path):
@@ -41,17 +75,35 @@ class Resume(models.Model):
                 if extracted_text:
                     self.extracted_text = extracted_text 
                     super().save(update_fields=['extracted_text'])
-                    self.embedding_vector = get_bert_embedding(self.extracted_text)
-                    super().save(update_fields=['embedding_vector'])
+                    if embed:
+                        # identical text (e.g. a re-upload) is served from the embedding cache
+                        cache = get_embedding_cache()
+                        self.set_embedding(cache.get(self.extracted_text), cache.model_id())
+                        super().save(update_fields=self.EMBEDDING_FIELDS)
+                        index_resumes([self])
                     
                     # Use enhanced skill extraction
-                    extractor = EnhancedSkillExtractor()
+                    extractor = get_skill_extractor()
                     enhanced_skills = extractor.extract_skills_with_confidence(self.extracted_text)
                     self.save_enhanced_skills(enhanced_skills)
                 else:
                     print("No text could be extracted.")
             except Exception as e:
                 print(f"Error during extraction: {e}")
+
+    @classmethod
+    def update_embeddings(cls, resumes, max_tokens_per_batch=None):
+        """Embed many resumes with batched forward passes and store the vectors in one query"""
+        resumes = [resume for resume in resumes if resume.extracted_text]
+        cache = get_embedding_cache()
+        vectors = cache.get_many(
+            [resume.extracted_text for resume in resumes], max_tokens_per_batch=max_tokens_per_batch)
+        model_id = cache.model_id()
+        for resume, vector in zip(resumes, vectors):
+            resume.set_embedding(vector, model_id)
+        cls.objects.bulk_update(resumes, cls.EMBEDDING_FIELDS)
+        index_resumes(resumes)
+        return len(resumes)
                 
     def save_enhanced_skills(self, enhanced_skills):
         """Save skills with enhanced AI analysis data"""
@@ -103,10 +155,9 @@ class Resume(models.Model):
             )
 
 
-class JobDescription(models.Model):
+class JobDescription(EmbeddedDocument):
     raw_text = models.TextField()
     uploaded_at = models.DateTimeField(auto_now_add=True)
-    embedding_vector = models.JSONField(blank=True, null=True)
     
     # relationship to Resume model (ForeignKey - one resume to many job desc)
     resume = models.ForeignKey(
@@ -121,20 +172,37 @@ class JobDescription(models.Model):
         return self.raw_text[:50]  # first 50 characters of the raw text
     
     # generating bert embeddings for job description text
-    def save(self, *args, **kwargs):
+    # embed=False leaves the embedding to a later batched update_embeddings() call
+    def save(self, *args, embed=True, **kwargs):
         super().save(*args, **kwargs)
         try:
             if self.raw_text:
-                self.embedding_vector = get_bert_embedding(self.raw_text)
-                super().save(update_fields=['embedding_vector'])
+                if embed:
+                    # recruiters re-upload the same posting, identical text is served from the cache
+                    cache = get_embedding_cache()
+                    self.set_embedding(cache.get(self.raw_text), cache.model_id())
+                    super().save(update_fields=self.EMBEDDING_FIELDS)
                 # Use enhanced job requirements analyzer
-                analyzer = JobRequirementsAnalyzer()
+                analyzer = get_job_analyzer()
                 job_analysis = analyzer.analyze(self.raw_text)
                 self.save_enhanced_job_skills(job_analysis['all_skills'])
             else:
                 print("No text could be embedded.")
         except Exception as e:
             print(f"Error embedding text: {e}")
+
+    @classmethod
+    def update_embeddings(cls, jobs, max_tokens_per_batch=None):
+        """Embed many job descriptions with batched forward passes and store the vectors in one query"""
+        jobs = [job for job in jobs if job.raw_text]
+        cache = get_embedding_cache()
+        vectors = cache.get_many(
+            [job.raw_text for job in jobs], max_tokens_per_batch=max_tokens_per_batch)
+        model_id = cache.model_id()
+        for job, vector in zip(jobs, vectors):
+            job.set_embedding(vector, model_id)
+        cls.objects.bulk_update(jobs, cls.EMBEDDING_FIELDS)
+        return len(jobs)
             
     def save_enhanced_job_skills(self, analyzed_skills):
         """Save job skills with enhanced AI analysis data"""
@@ -187,6 +255,25 @@ class JobDescription(models.Model):
                 importance=1.0  # default
             )
                 
+class EmbeddingCacheEntry(models.Model):
+    """Persistent tier of the content-hash embedding cache (see utils/embedding_cache.py)"""
+    content_hash = models.CharField(max_length=64)  # sha256 of the normalized text
+    model_id = models.CharField(max_length=255)  # model, quantization and pooling that produced the vector
+    vector = models.BinaryField()  # float32, packed by vector_codec
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['content_hash', 'model_id'], name='unique_embedding_cache_entry')
+        ]
+    
+    @staticmethod
+    def pack(vector):
+        return vector_codec.pack(vector)[0]
+    
+    def as_array(self):
+        return vector_codec.unpack(self.vector)
+
 class Skill(models.Model):
     name = models.CharField(max_length=100, unique=True, db_index=True)
     category = models.CharField(max_length=50, db_index=True)  # 'technical' or 'soft'
@@ -201,6 +288,43 @@ class Skill(models.Model):
             models.Index(fields=['category', 'subcategory']),
         ]
 
+class SkillAlias(models.Model):
+    """Another phrase that names a skill (e.g. 'k8s' for Kubernetes), matched like the skill name itself"""
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='aliases')
+    alias = models.CharField(max_length=100, unique=True)  # lowercased, single-spaced
+    
+    def __str__(self):
+        return f"{self.alias} -> {self.skill.name}"
+    
+    def save(self, *args, **kwargs):
+        self.alias = ' '.join(self.alias.lower().split())
+        super().save(*args, **kwargs)
+
+class TaxonomyVersion(models.Model):
+    """
+    Single row counting changes to Skill and SkillAlias (bumped by signals.py)
+    workers poll it to notice that their compiled skill taxonomy is out of date
+    """
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    @classmethod
+    def current(cls):
+        return cls.objects.filter(pk=1).values_list('version', flat=True).first() or 0
+    
+    @classmethod
+    def bump(cls):
+        # one atomic UPDATE, so concurrent bumps are never lost
+        updated = cls.objects.filter(pk=1).update(version=models.F('version') + 1, updated_at=timezone.now())
+        if updated:
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(pk=1, version=1)
+        except IntegrityError:
+            # another process created the row first
+            cls.objects.filter(pk=1).update(version=models.F('version') + 1, updated_at=timezone.now())
+
 class ResumeSkill(models.Model):
     SKILL_LEVELS = [
         ('unspecified', 'Unspecified'),
@@ -0,0 +1,30 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Resume, Skill, SkillAlias, TaxonomyVersion
+from .utils.model_registry import get_skill_taxonomy
+from .utils.resume_index import unindex_resumes
+from .utils.taxonomy_watcher import describes_known_skill
+
+
+# covers instance.delete() and queryset deletes alike
+@receiver(post_delete, sender=Resume)
+def remove_deleted_resume_from_index(sender, instance, **kwargs):
+    unindex_resumes([instance.pk])
+
+
+# every worker polls the version and recompiles its skill matcher (see utils/taxonomy_watcher.py)
+# bulk_create/update send no signals: bump TaxonomyVersion yourself after those
+@receiver(post_save, sender=Skill)
+def bump_taxonomy_version_for_skill(sender, instance, created, **kwargs):
+    # resume and job saves create a Skill row for every skill they are first to mention;
+    # those come from the taxonomy itself and leave the compiled taxonomy unchanged
+    if created and describes_known_skill(get_skill_taxonomy(), instance.name, instance.category, instance.subcategory):
+        return
+    TaxonomyVersion.bump()
+
+
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=SkillAlias)
+@receiver(post_delete, sender=SkillAlias)
+def bump_taxonomy_version(sender, **kwargs):
+    TaxonomyVersion.bump()
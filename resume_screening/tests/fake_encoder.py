@@ -0,0 +1,31 @@
+from unittest import mock
+import numpy as np
+from ..utils import config, enhanced_skill_extraction
+from ..utils.enhanced_skill_extraction import EnhancedSkillExtractor
+
+class FakeEncoderMixin:
+    """
+    unittest.TestCase mixin: self.extractor with an encoder that only knows self.paraphrases
+    every skill gets an orthogonal direction and each paraphrase the direction of its skill,
+    any other phrase stays far below the semantic threshold of 0.9
+    """
+    paraphrases = {}  # phrase -> skill name
+
+    def use_fake_encoder(self):
+        self.extractor = EnhancedSkillExtractor(loaded_model=object())
+        # one orthogonal direction per skill instead of real encoder embeddings
+        self.extractor._skill_matrix = np.eye(len(self.extractor.skill_names), dtype=np.float32)
+        patcher = mock.patch.object(enhanced_skill_extraction, 'embed_many', side_effect=self._embed)
+        self.embed_many = patcher.start()
+        self.addCleanup(patcher.stop)
+        settings_patcher = mock.patch.dict(config.SKILL_EXTRACTION_DEFAULTS, {'semantic_threshold': 0.9})
+        settings_patcher.start()
+        self.addCleanup(settings_patcher.stop)
+
+    def _embed(self, texts, loaded=None):
+        vectors = np.zeros((len(texts), len(self.extractor.skill_names)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            if text in self.paraphrases:
+                vectors[row, self.extractor.skill_names.index(self.paraphrases[text])] = 1.0
+            vectors[row] += 0.01  # unrelated phrases stay far below the threshold
+        return vectors
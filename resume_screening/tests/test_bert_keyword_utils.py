@@ -0,0 +1,39 @@
+import unittest
+from types import SimpleNamespace
+import numpy as np
+import torch
+from transformers import BertConfig, BertModel
+from ..utils.bert_keyword_utils import _last_layer_attention, _merge_wordpieces
+
+class TestBatchedKeywordAttention(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        # tiny randomly initialised encoder so the test needs no downloaded weights
+        config = BertConfig(vocab_size=100, hidden_size=32, num_hidden_layers=2,
+                            num_attention_heads=4, intermediate_size=64, attn_implementation='eager')
+        self.model = BertModel(config).eval()
+        self.loaded = SimpleNamespace(tokenizer=SimpleNamespace(pad_token_id=0), model=self.model)
+        rng = np.random.default_rng(0)
+        self.sequences = [list(rng.integers(1, 100, size=n)) for n in (5, 12, 9)]
+    
+    def test_matches_reference_attentions(self):
+        received = _last_layer_attention(self.loaded, self.sequences)
+        for row, ids in enumerate(self.sequences):
+            # reference: one unpadded text with the model's own last-layer attentions
+            with torch.no_grad():
+                outputs = self.model(input_ids=torch.tensor([ids]), output_attentions=True)
+            expected = outputs.attentions[-1][0].mean(dim=0).sum(dim=0).numpy()
+            np.testing.assert_allclose(received[row, :len(ids)], expected, atol=1e-5)
+            # padding receives nothing
+            self.assertTrue(np.all(received[row, len(ids):] == 0))
+    
+    def test_wordpieces_are_merged(self):
+        tokens = ['[CLS]', 'kube', '##rne', '##tes', 'and', 'docker', '[SEP]']
+        scores = np.array([5.0, 1.0, 0.5, 0.25, 0.1, 2.0, 5.0])
+        special = np.array([True, False, False, False, False, False, True])
+        words, word_scores = _merge_wordpieces(tokens, scores, special)
+        self.assertEqual(words, ['kubernetes', 'and', 'docker'])
+        np.testing.assert_allclose(word_scores, [1.75, 0.1, 2.0])
+
+if __name__ == '__main__':
+    unittest.main()
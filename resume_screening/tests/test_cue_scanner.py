@@ -0,0 +1,53 @@
+import random
+import re
+import unittest
+from ..utils.cue_scanner import Cue, CueScanner
+from ..utils.enhanced_skill_extraction import EnhancedSkillExtractor
+
+class TestCueScanner(unittest.TestCase):
+    def setUp(self):
+        self.scanner = CueScanner([
+            Cue('good', 'intermediate', True, True),
+            Cue('strong', 'expert', True, True),
+            Cue('good to have', 'medium'),
+            Cue('strong', 'medium'),
+            Cue('key', 'high'),
+            Cue('optional', 'negation', False, True),
+        ])
+    
+    def test_overlapping_cues_are_all_recorded(self):
+        cues = self.scanner.scan('good to have: strong sql')
+        self.assertEqual(cues.spans('intermediate'), [(0, 4)])
+        self.assertEqual(cues.spans('medium'), [(0, 12), (14, 20)])
+        self.assertEqual(cues.spans('expert'), [(14, 20)])
+    
+    def test_word_boundaries(self):
+        cues = self.scanner.scan('goodness, keyboard, optionally, strongest')
+        self.assertEqual(cues.spans('intermediate'), [])
+        self.assertEqual(cues.spans('expert'), [])
+        self.assertEqual(cues.spans('negation'), [])
+        # importance terms are substrings, like the term-in-sentence checks they replace
+        self.assertEqual(cues.spans('high'), [(10, 13)])
+        self.assertEqual(cues.spans('medium'), [(32, 38)])
+    
+    def test_within(self):
+        cues = self.scanner.scan('a strong team')
+        self.assertTrue(cues.within('expert', 2, 8))
+        self.assertFalse(cues.within('expert', 3, 13))
+        self.assertFalse(cues.within('expert', 0, 7))
+        self.assertFalse(cues.within('unknown', 0, 13))
+    
+    def test_matches_regex_search_per_window(self):
+        extractor = EnhancedSkillExtractor(loaded_model=object())
+        patterns = {level: re.compile(r'\b(%s)\b' % '|'.join(words)) for level, words in extractor.proficiency_cues.items()}
+        vocabulary = [word for words in extractor.proficiency_cues.values() for word in words] + ['python', 'a', 'goods', '-', 'team']
+        rng = random.Random(0)
+        for _ in range(100):
+            text = ' '.join(rng.choice(vocabulary) for _ in range(30))
+            cues = extractor.cue_scanner.scan(text)
+            for level, pattern in patterns.items():
+                expected = [match.span() for match in pattern.finditer(text)]
+                self.assertEqual(cues.spans(level), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import random
+import unittest
+from ..utils.document_index import DocumentIndex
+from ..utils.enhanced_skill_extraction import EnhancedSkillExtractor
+
+class TestDocumentIndex(unittest.TestCase):
+    def setUp(self):
+        self.doc = DocumentIndex("Senior Engineer.  Python and Node.js\nrequired!  (Docker) is a plus")
+    
+    def test_words_and_spans(self):
+        self.assertEqual(self.doc.words, self.doc.lower.split())
+        for word, (start, end) in zip(self.doc.words, self.doc.spans):
+            self.assertEqual(self.doc.lower[start:end], word)
+    
+    def test_phrase_span(self):
+        start, end = self.doc.phrase_span(4, 2)
+        self.assertEqual(self.doc.lower[start:end], 'node.js\nrequired!')
+        start, end = self.doc.phrase_span(6, 1, strip='()')
+        self.assertEqual(self.doc.lower[start:end], 'docker')
+    
+    def test_words_end_matches_split(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            position = rng.randrange(len(self.doc) + 1)
+            limit = rng.randrange(position, len(self.doc) + 1)
+            words_end = self.doc.words_end(position, limit, 3)
+            self.assertEqual(self.doc.lower[position:words_end].split(), self.doc.lower[position:limit].split()[:3])
+            self.assertFalse(self.doc.lower[position:words_end].endswith(' '))
+    
+    def test_sentence(self):
+        start = self.doc.lower.index('node.js')
+        sentence_start, sentence_end = self.doc.sentence(start, start + len('node.js'))
+        self.assertEqual(self.doc.lower[sentence_start:sentence_end].strip(), 'python and node.js\nrequired')
+        start = self.doc.lower.index('docker')
+        sentence_start, sentence_end = self.doc.sentence(start, start + 6)
+        self.assertEqual(self.doc.lower[sentence_start:sentence_end].strip(), '(docker) is a plus')
+
+class TestMatchesAnchoredOnOccurrence(unittest.TestCase):
+    def setUp(self):
+        self.extractor = EnhancedSkillExtractor(loaded_model=object())
+    
+    def test_later_occurrence_keeps_its_own_context(self):
+        filler = ' '.join(['the team ships features every week'] * 3)
+        text = f"Python scripts are used by {filler}. Docker and advanced Python knowledge is required."
+        skills = self.extractor.extract_skills_with_confidence(text, semantic=False)
+        python = next(skill for skill in skills if skill['name'] == 'Python')
+        self.assertEqual(python['skill_level'], 'expert')
+        self.assertIn('advanced Python', python['context'])
+    
+    def test_phrase_across_line_break(self):
+        text = "Experience with machine\nlearning is required."
+        names = [skill['name'] for skill in self.extractor.extract_skills_with_confidence(text, semantic=False)]
+        self.assertIn('Machine Learning', names)
+
+if __name__ == '__main__':
+    unittest.main()
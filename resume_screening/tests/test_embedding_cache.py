@@ -0,0 +1,38 @@
+import unittest
+from ..utils.embedding_cache import content_hash, normalize_text
+from ..utils.lru_cache import LRUCache
+
+class TestContentHash(unittest.TestCase):
+    def test_whitespace_does_not_change_hash(self):
+        self.assertEqual(content_hash("Senior  Python\nDeveloper "), content_hash("Senior Python Developer"))
+        self.assertEqual(normalize_text("  a\tb \n c "), "a b c")
+    
+    def test_different_text_different_hash(self):
+        self.assertNotEqual(content_hash("Python developer"), content_hash("Java developer"))
+
+class TestLRUCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')  # 'b' is now the least recently used
+        cache.put('c', 3)
+        
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(len(cache), 2)
+    
+    def test_counters(self):
+        cache = LRUCache(maxsize=4)
+        cache.put('a', 1)
+        cache.get('a')
+        cache.get('a')
+        cache.get('missing')
+        
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 1)
+        self.assertAlmostEqual(stats['hit_rate'], 2 / 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+import numpy as np
+import torch
+from transformers import BertConfig, BertModel
+from ..utils.encoders import TorchEncoder, export_onnx, check_parity, quantize_onnx_int8
+from ..utils.model_registry import LoadedModel
+
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+class TestEncoderBackends(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        # tiny randomly initialised encoder so the test needs no downloaded weights
+        config = BertConfig(vocab_size=100, hidden_size=32, num_hidden_layers=2,
+                            num_attention_heads=4, intermediate_size=64)
+        self.model = BertModel(config).eval()
+        rng = np.random.default_rng(0)
+        self.batches = []
+        for batch_size, seq_len in [(1, 5), (4, 17), (3, 64)]:
+            input_ids = rng.integers(1, 100, size=(batch_size, seq_len)).astype(np.int64)
+            attention_mask = np.ones_like(input_ids)
+            attention_mask[0, seq_len // 2:] = 0  # one padded row per batch
+            self.batches.append({
+                'input_ids': input_ids,
+                'attention_mask': attention_mask,
+                'token_type_ids': np.zeros_like(input_ids),
+            })
+    
+    def test_torch_backend_shape(self):
+        vectors = TorchEncoder(self.model).cls_vectors(self.batches[1])
+        self.assertEqual(vectors.shape, (4, 32))
+    
+    @unittest.skipIf(onnxruntime is None, "onnxruntime is not installed")
+    def test_onnx_matches_torch(self):
+        from ..utils.encoders import OnnxEncoder
+        with tempfile.TemporaryDirectory() as tmp:
+            onnx_path = export_onnx(self.model, Path(tmp) / 'encoder.onnx')
+            result = check_parity(TorchEncoder(self.model), OnnxEncoder(onnx_path), self.batches)
+        
+        self.assertTrue(result['passed'], result)
+        self.assertGreater(result['min_cosine'], 0.9999)
+    
+    @unittest.skipIf(onnxruntime is None, "onnxruntime is not installed")
+    def test_quantized_graph_follows_re_exports(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            onnx_path = export_onnx(self.model, Path(tmp) / 'encoder.onnx')
+            quantized_path = quantize_onnx_int8(onnx_path)
+            os.utime(quantized_path, (1000, 1000))
+            os.utime(onnx_path, (2000, 2000))  # re-exported after the int8 copy was made
+            self.assertEqual(quantize_onnx_int8(onnx_path), quantized_path)
+            self.assertGreater(quantized_path.stat().st_mtime, 2000)
+            stamp = quantized_path.stat().st_mtime
+            quantize_onnx_int8(onnx_path)
+            self.assertEqual(quantized_path.stat().st_mtime, stamp)  # up to date, kept
+            self.assertEqual(sorted(p.name for p in Path(tmp).iterdir()), ['encoder-int8.onnx', 'encoder.onnx'])
+
+class TestModelId(unittest.TestCase):
+    def model_id(self, backend, quantization):
+        encoder = type('Encoder', (), {'name': backend})()
+        return LoadedModel('bert', None, None, encoder, quantization).model_id
+    
+    def test_backend_and_quantization_are_part_of_the_id(self):
+        ids = {self.model_id(backend, quantization) for backend in ('torch', 'onnx') for quantization in (None, 'int8')}
+        self.assertEqual(ids, {'bert', 'bert#int8', 'bert#onnx', 'bert#onnx-int8'})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import random
+import unittest
+from Levenshtein import distance
+from ..utils.fuzzy_index import FuzzyIndex
+from ..utils.skills_dictionaries import ALL_SKILLS
+
+class TestFuzzyIndex(unittest.TestCase):
+    def setUp(self):
+        self.names = [skill_info['name'].lower() for skill_info in ALL_SKILLS.values()]
+        self.index = FuzzyIndex((name, position) for position, name in enumerate(self.names))
+    
+    def scan(self, query, max_distance):
+        return sorted((distance(query, name), position) for position, name in enumerate(self.names)
+                      if distance(query, name) <= max_distance)
+    
+    def test_same_results_as_scan(self):
+        rng = random.Random(0)
+        alphabet = 'abcdefghijklmnopqrstuvwxyz .+#'
+        queries = list(self.names)
+        for name in self.names:
+            # misspell every name a few ways
+            for _ in range(3):
+                chars = list(name)
+                i = rng.randrange(len(chars) + 1)
+                edit = rng.choice('ids')
+                if edit == 'i':
+                    chars.insert(i, rng.choice(alphabet))
+                elif chars and i < len(chars):
+                    chars[i] = rng.choice(alphabet) if edit == 's' else ''
+                queries.append(''.join(chars))
+        queries += [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 12))) for _ in range(300)]
+        for max_distance in (0, 1, 2, 3):
+            for query in queries:
+                self.assertEqual(sorted(self.index.lookup(query, max_distance)), self.scan(query, max_distance), query)
+    
+    def test_duplicate_keys_keep_every_value(self):
+        index = FuzzyIndex([('java', 1), ('java', 2), ('lava', 3)])
+        self.assertEqual(len(index), 3)
+        self.assertEqual(sorted(index.lookup('java', 1)), [(0, 1), (0, 2), (1, 3)])
+        self.assertEqual(index.lookup('javascript', 2), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import subprocess
+import sys
+import unittest
+from ..utils.import_profile import HEAVY_MODULES, heavy_imports, parse_importtime
+
+# minimal settings: importing the app must not need the database or the encoder
+STARTUP_CHECK = """
+import sys
+from django.conf import settings
+settings.configure(
+    INSTALLED_APPS=['django.contrib.contenttypes', 'django.contrib.auth', 'rest_framework', 'resume_screening'],
+    DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+    ROOT_URLCONF='resume_screening.urls',
+)
+import django
+django.setup()
+import resume_screening.models, resume_screening.views, resume_screening.urls
+print(','.join(name for name in %r if name in sys.modules))
+""" % (HEAVY_MODULES,)
+
+class TestImportProfile(unittest.TestCase):
+    def test_parse_importtime(self):
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   _io\n"
+            "import time:      5000 |     900000 | torch\n"
+            "some unrelated warning\n"
+        )
+        timings = parse_importtime(stderr)
+        self.assertEqual(timings, {'_io': (120, 120), 'torch': (5000, 900000)})
+        self.assertEqual(heavy_imports(timings), {'torch': 900000})
+    
+    def test_startup_does_not_import_heavy_modules(self):
+        result = subprocess.run([sys.executable, '-c', STARTUP_CHECK], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), '')
+
+if __name__ == '__main__':
+    unittest.main()
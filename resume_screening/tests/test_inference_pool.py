@@ -0,0 +1,49 @@
+import os
+import tempfile
+import threading
+import unittest
+from multiprocessing.connection import Listener
+from ..utils.inference_pool import InferenceClient
+
+class TestInferenceClient(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.address = os.path.join(tmp.name, 'inference.sock')
+        self.authkey = b'test'
+        self.listener = Listener(self.address, family='AF_UNIX', authkey=self.authkey)
+        self.addCleanup(self.listener.close)
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+    
+    def serve_once(self, answer):
+        def worker():
+            with self.listener.accept() as conn:
+                operation, args = conn.recv()
+                if answer is None:
+                    self.release.wait(5)  # a stuck worker
+                else:
+                    conn.send(answer)
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        return thread
+    
+    def test_answer_is_returned(self):
+        self.serve_once(('ok', {'model_id': 'm', 'hidden_size': 4}))
+        client = InferenceClient(self.address, authkey=self.authkey, timeout=5)
+        self.assertEqual(client.info()['model_id'], 'm')
+    
+    def test_stuck_worker_fails_the_request(self):
+        self.serve_once(None)
+        client = InferenceClient(self.address, authkey=self.authkey, timeout=0.2)
+        with self.assertRaises(TimeoutError):
+            client.embed_many(['python'])
+    
+    def test_worker_error_is_raised(self):
+        self.serve_once(('error', "ValueError('boom')"))
+        client = InferenceClient(self.address, authkey=self.authkey, timeout=5)
+        with self.assertRaisesRegex(RuntimeError, 'boom'):
+            client.embed_many(['python'])
+
+if __name__ == '__main__':
+    unittest.main()
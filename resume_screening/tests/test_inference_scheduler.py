@@ -0,0 +1,74 @@
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+import numpy as np
+from ..utils import bert_utils, config, model_registry
+from ..utils.inference_scheduler import InferenceScheduler
+
+class TestInferenceScheduler(unittest.TestCase):
+    def setUp(self):
+        self.batches = []
+        
+        def run_batch(items):
+            self.batches.append(list(items))
+            return [item * 10 for item in items]
+        
+        self.scheduler = InferenceScheduler(run_batch, max_batch_size=16, max_wait_ms=100)
+    
+    def test_concurrent_requests_share_batches(self):
+        results = {}
+        barrier = threading.Barrier(8)
+        
+        def caller(n):
+            barrier.wait()
+            results[n] = self.scheduler.run([n, n + 100])
+        
+        threads = [threading.Thread(target=caller, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # every caller gets exactly its own slice back
+        for n in range(8):
+            self.assertEqual(list(results[n]), [n * 10, (n + 100) * 10])
+        # 8 requests of 2 items fit in max_batch_size, so far fewer than 8 forward passes
+        self.assertLess(len(self.batches), 8)
+        self.assertTrue(all(len(batch) <= 16 for batch in self.batches))
+    
+    def test_max_batch_size_is_respected(self):
+        futures = [self.scheduler.submit(list(range(6))) for _ in range(5)]
+        for future in futures:
+            self.assertEqual(list(future.result()), [i * 10 for i in range(6)])
+        self.assertTrue(all(len(batch) <= 16 for batch in self.batches))
+    
+    def test_errors_reach_every_caller(self):
+        scheduler = InferenceScheduler(lambda items: 1 / 0, max_wait_ms=1)
+        with self.assertRaises(ZeroDivisionError):
+            scheduler.run([1, 2])
+        # the worker survives a failed batch
+        scheduler.run_batch = lambda items: items
+        self.assertEqual(scheduler.run([3]), [3])
+
+class TestEmbedManyScheduling(unittest.TestCase):
+    def setUp(self):
+        model_registry.clear()
+        self.addCleanup(model_registry.clear)
+        patcher = mock.patch.dict(config.NLP_MODEL_DEFAULTS, {'micro_batching': True})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.loaded = SimpleNamespace(model_id='model-a', hidden_size=4, remote=None)
+    
+    def test_every_caller_gets_its_batch_size(self):
+        batch_sizes = []
+        def embed(texts, batch_size, loaded):
+            batch_sizes.append(batch_size)
+            return np.zeros((len(texts), 4), dtype=np.float32)
+        with mock.patch.object(bert_utils, '_embed_many', side_effect=embed):
+            bert_utils.embed_many(['python'], batch_size=8, loaded=self.loaded)
+            bert_utils.embed_many(['react'], batch_size=64, loaded=self.loaded)
+        self.assertEqual(batch_sizes, [8, 64])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import tempfile
+import unittest
+from pathlib import Path
+import numpy as np
+from ..utils.semantic_calibration import (
+    calibration_path, load_calibrated_threshold, measure_thresholds, pick_threshold, save_calibration, top_matches,
+)
+
+class TestSemanticCalibration(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.directory = Path(self.tmp.name)
+    
+    def test_top_matches_are_cosine_similarities(self):
+        skills = np.eye(3, dtype=np.float32)
+        best, scores = top_matches(np.array([[0.0, 2.0, 0.0], [1.0, 1.0, 0.0]]), skills)
+        self.assertEqual(best.tolist(), [1, 0])
+        np.testing.assert_allclose(scores, [1.0, np.sqrt(0.5)], rtol=1e-6)
+    
+    def test_lowest_threshold_reaching_the_precision_is_picked(self):
+        positives = [(True, 0.95), (True, 0.9), (False, 0.85), (True, 0.8)]
+        negatives = [0.88, 0.5]
+        rows = measure_thresholds(positives, negatives, [0.5, 0.8, 0.85, 0.88, 0.9, 0.95])
+        by_threshold = {row['threshold']: row for row in rows}
+        self.assertEqual(by_threshold[0.9]['precision'], 1.0)
+        self.assertEqual(by_threshold[0.9]['recall'], 0.5)
+        self.assertEqual(by_threshold[0.88]['precision'], 2 / 3)
+        self.assertEqual(pick_threshold(rows, 0.95)['threshold'], 0.9)
+        self.assertEqual(pick_threshold(rows, 0.5)['threshold'], 0.5)
+        self.assertIsNone(pick_threshold(measure_thresholds([(False, 0.9)], [], [0.5, 0.9]), 0.5))
+    
+    def test_threshold_is_stored_per_model(self):
+        self.assertIsNone(load_calibrated_threshold('model-a#int8-onnx', self.directory))
+        save_calibration('model-a#int8-onnx', {'threshold': 0.83}, self.directory)
+        self.assertEqual(load_calibrated_threshold('model-a#int8-onnx', self.directory), 0.83)
+        self.assertIsNone(load_calibrated_threshold('model-a', self.directory))
+        calibration_path('model-a', self.directory).write_text('not json')
+        self.assertIsNone(load_calibrated_threshold('model-a', self.directory))
+
+if __name__ == '__main__':
+    unittest.main()
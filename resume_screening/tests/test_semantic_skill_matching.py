@@ -0,0 +1,55 @@
+import unittest
+from unittest import mock
+from ..utils import config, enhanced_skill_extraction
+from ..utils.enhanced_skill_extraction import EnhancedSkillExtractor
+from .fake_encoder import FakeEncoderMixin
+
+class TestSemanticSkillMatching(FakeEncoderMixin, unittest.TestCase):
+    paraphrases = {
+        'container orchestration platform': 'Kubernetes',
+        'statistical learning': 'Machine Learning',
+    }
+    
+    def setUp(self):
+        self.use_fake_encoder()
+        # skill vectors longer than the phrase vectors: similarities are cosines all the same
+        self.extractor._skill_matrix *= 3.0
+    
+    def test_semantic_matches_are_top_k_above_threshold(self):
+        phrases = ['container orchestration platform', 'weekend hiking', 'statistical learning']
+        matches = self.extractor._semantic_matches(phrases, top_k=2, threshold=0.9)
+        self.assertEqual([(phrase, skill) for phrase, skill, _ in matches], [
+            ('container orchestration platform', 'Kubernetes'),
+            ('statistical learning', 'Machine Learning'),
+        ])
+        self.assertTrue(all(0.9 <= similarity <= 1.0 for _, _, similarity in matches))
+    
+    def test_paraphrase_found_with_one_embedding_batch(self):
+        text = "Experience with a container orchestration platform is required. Python preferred."
+        skills = self.extractor.extract_skills_with_confidence(text, semantic=True)
+        names = [skill['name'] for skill in skills]
+        self.assertIn('Kubernetes', names)
+        self.assertIn('Python', names)
+        self.assertEqual(self.embed_many.call_count, 1)
+        # the dictionary match is not embedded again
+        self.assertNotIn('python', self.embed_many.call_args[0][0])
+    
+    def test_semantic_match_respects_negation(self):
+        text = "No experience with statistical learning needed."
+        skills = self.extractor.extract_skills_with_confidence(text, semantic=True)
+        self.assertNotIn('Machine Learning', [skill['name'] for skill in skills])
+    
+    def test_uncalibrated_model_is_not_run(self):
+        with mock.patch.dict(config.SKILL_EXTRACTION_DEFAULTS, {'semantic_threshold': None}), \
+                mock.patch.object(enhanced_skill_extraction, 'load_calibrated_threshold', return_value=None):
+            extractor = EnhancedSkillExtractor(loaded_model=mock.Mock(model_id='uncalibrated'))
+            skills = extractor.extract_skills_with_confidence("container orchestration platform", semantic=True)
+        self.assertEqual(skills, [])
+        self.embed_many.assert_not_called()
+    
+    def test_semantic_stage_can_be_disabled(self):
+        self.extractor.extract_skills_with_confidence("container orchestration platform", semantic=False)
+        self.embed_many.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import random
+import re
+import unittest
+from ..utils.skill_automaton import SkillAutomaton, tokenize
+from ..utils.skills_dictionaries import ALL_SKILLS
+from ..utils.extract_skills import extract_skills_from_text
+
+def ngram_hits(patterns, text, max_words=4):
+    # what the nested n-gram lookups produced: (first word, length, phrase) per dictionary phrase
+    words = text.split()
+    hits = []
+    for i in range(len(words)):
+        for length in range(1, min(max_words, len(words) - i) + 1):
+            phrase = ' '.join(words[i:i + length])
+            if phrase in patterns:
+                hits.append((i, length, phrase))
+    return hits
+
+class TestSkillAutomaton(unittest.TestCase):
+    def test_overlapping_phrases(self):
+        automaton = SkillAutomaton({'machine learning': 1, 'learning': 2, 'deep machine learning models': 3})
+        hits = automaton.find('deep machine learning models and machine learning')
+        self.assertEqual([(hit.word, hit.n_words, hit.value) for hit in hits],
+                         [(0, 4, 3), (1, 2, 1), (2, 1, 2), (5, 2, 1), (6, 1, 2)])
+    
+    def test_offsets_point_into_text(self):
+        text = 'Senior  engineer:\tmachine learning,  aws'
+        automaton = SkillAutomaton({'machine learning,': 'ml'})
+        hit, = automaton.find(text)
+        self.assertEqual(text[hit.start:hit.end], 'machine learning,')
+        self.assertEqual(tokenize(text)[0][hit.word], 'machine')
+    
+    def test_whole_words_only(self):
+        automaton = SkillAutomaton({'react': 1, 'java': 2})
+        self.assertEqual(automaton.find('reactjs and javascript'), [])
+    
+    def test_long_phrases_are_left_out(self):
+        automaton = SkillAutomaton({'a b c d e': 1, 'a b': 2})
+        self.assertEqual(len(automaton), 1)
+    
+    def test_matches_ngram_lookups(self):
+        rng = random.Random(0)
+        vocabulary = sorted({word for phrase in ALL_SKILLS for word in phrase.split()}) + ['and', 'with', 'years']
+        automaton = SkillAutomaton(ALL_SKILLS)
+        for _ in range(200):
+            text = ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(0, 40)))
+            self.assertEqual([(hit.word, hit.n_words, hit.phrase) for hit in automaton.find(text)],
+                             ngram_hits(ALL_SKILLS, text))
+    
+    def test_extract_skills_order(self):
+        text = 'Built machine learning pipelines in Python, deployed on AWS with Docker. Python again.'
+        normalized = re.sub(r'[^\w\s+#\./-]', ' ', text.lower())
+        expected = {}
+        for _, _, phrase in sorted(ngram_hits(ALL_SKILLS, normalized), key=lambda hit: (hit[1], hit[0])):
+            expected.setdefault(ALL_SKILLS[phrase]['name'], ALL_SKILLS[phrase])
+        self.assertEqual(extract_skills_from_text(text), list(expected.values()))
+
+if __name__ == '__main__':
+    unittest.main()
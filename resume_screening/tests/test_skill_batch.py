@@ -0,0 +1,38 @@
+import unittest
+from .fake_encoder import FakeEncoderMixin
+
+class TestSkillBatch(FakeEncoderMixin, unittest.TestCase):
+    paraphrases = {'container orchestration platform': 'Kubernetes'}
+
+    def setUp(self):
+        self.use_fake_encoder()
+        self.texts = [
+            "Advanced Python and Django required.",
+            "Experience with a container orchestration platform is required.",
+            "",
+            "Basic knowlege of Kubernets is a plus. No experience with Java needed.",
+            "Strong React skills. AWS preferred.",
+        ]
+
+    def test_pool_matches_one_document_at_a_time(self):
+        expected = [self.extractor.extract_skills_with_confidence(text, semantic=False) for text in self.texts]
+        self.assertEqual(self.extractor.extract_skills_batch(self.texts, semantic=False, workers=2, chunk_size=2), expected)
+        self.assertEqual(self.extractor.extract_skills_batch(self.texts, semantic=False, workers=1), expected)
+        self.embed_many.assert_not_called()
+
+    def test_semantic_phase_embeds_each_chunk_once(self):
+        expected = [self.extractor.extract_skills_with_confidence(text, semantic=True) for text in self.texts]
+        self.embed_many.reset_mock()
+        batch = self.extractor.extract_skills_batch(self.texts, semantic=True, workers=2, chunk_size=2)
+        self.assertEqual(batch, expected)
+        self.assertIn('Kubernetes', [skill['name'] for skill in batch[1]])
+        self.assertEqual(self.embed_many.call_count, 3)
+        # phrases repeated across the documents of a chunk are embedded once
+        for call in self.embed_many.call_args_list:
+            self.assertEqual(len(call[0][0]), len(set(call[0][0])))
+
+    def test_empty_batch(self):
+        self.assertEqual(self.extractor.extract_skills_batch([], workers=4), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+import numpy as np
+from ..utils import skill_embedding_cache
+from ..utils.skill_embedding_cache import load_skill_embeddings, cache_path
+
+class TestSkillEmbeddingCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self.tmp.name)
+        self.names = ['Python', 'React', 'Django']
+        self.calls = 0
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def compute(self, names):
+        self.calls += 1
+        return np.arange(len(names) * 4, dtype=np.float64).reshape(len(names), 4)
+    
+    def test_cold_then_warm_start(self):
+        cold = load_skill_embeddings('model-a', self.names, self.compute, self.directory)
+        warm = load_skill_embeddings('model-a', self.names, self.compute, self.directory)
+        
+        self.assertEqual(self.calls, 1)  # warm start must not run the model
+        self.assertIsInstance(warm, np.memmap)
+        self.assertEqual(warm.dtype, np.float32)
+        np.testing.assert_array_equal(cold, warm)
+    
+    def test_rebuilds_when_model_changes(self):
+        load_skill_embeddings('model-a', self.names, self.compute, self.directory)
+        load_skill_embeddings('model-b', self.names, self.compute, self.directory)
+        self.assertEqual(self.calls, 2)
+    
+    def test_rebuilds_when_dictionary_changes(self):
+        load_skill_embeddings('model-a', self.names, self.compute, self.directory)
+        old_path = cache_path('model-a', self.directory)
+        
+        with mock.patch.object(skill_embedding_cache, 'dictionary_hash', return_value='0' * 16):
+            load_skill_embeddings('model-a', self.names, self.compute, self.directory)
+            new_path = cache_path('model-a', self.directory)
+        
+        self.assertEqual(self.calls, 2)
+        self.assertNotEqual(old_path, new_path)
+        self.assertTrue(old_path.exists())  # workers of the previous release may still map it
+        self.assertTrue(new_path.exists())
+    
+    def test_older_database_versions_are_removed(self):
+        base = '0' * 16
+        for version in (base, f"{base}-db1", f"{base}-db2"):
+            load_skill_embeddings('model-a', self.names, self.compute, self.directory, version=version)
+        self.assertTrue(cache_path('model-a', self.directory, base).exists())
+        self.assertFalse(cache_path('model-a', self.directory, f"{base}-db1").exists())
+        self.assertTrue(cache_path('model-a', self.directory, f"{base}-db2").exists())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+from ..utils import model_registry
+from ..utils.enhanced_skill_extraction import EnhancedSkillExtractor
+
+class TestSkillMatchCache(unittest.TestCase):
+    def setUp(self):
+        model_registry.clear()
+        self.addCleanup(model_registry.clear)
+        self.extractor = EnhancedSkillExtractor(loaded_model=object())
+    
+    def test_shared_between_extractors(self):
+        first = self.extractor._get_fuzzy_matches('pythn')
+        cache = model_registry.get_skill_match_cache()
+        self.assertEqual(cache.stats()['misses'], 1)
+        other = EnhancedSkillExtractor(loaded_model=object())
+        self.assertIs(other.match_cache, cache)
+        self.assertEqual(other._get_fuzzy_matches('pythn'), first)
+        self.assertEqual(cache.stats()['hits'], 1)
+    
+    def test_results_are_not_shared_mutable_state(self):
+        self.extractor._get_fuzzy_matches('javascrpt').clear()
+        self.assertTrue(self.extractor._get_fuzzy_matches('javascrpt'))
+    
+    def test_dictionary_version_change_misses(self):
+        self.extractor._get_fuzzy_matches('pythn')
+        self.extractor.dictionary_version = 'edited'
+        self.extractor._get_fuzzy_matches('pythn')
+        self.assertEqual(self.extractor.match_cache.stats()['misses'], 2)
+    
+    def test_repeated_phrases_across_documents_hit(self):
+        text = "Strong communication and pythn experience"
+        self.extractor.extract_skills_with_confidence(text, semantic=False)
+        misses = self.extractor.match_cache.stats()['misses']
+        self.extractor.extract_skills_with_confidence(text, semantic=False)
+        stats = self.extractor.match_cache.stats()
+        self.assertEqual(stats['misses'], misses)
+        self.assertGreater(stats['hit_rate'], 0.4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from ..utils.enhanced_skill_extraction import EnhancedSkillExtractor
+
+# matches no skill, not even fuzzily
+FILLER = "Everybody welcomes newcomers warmly throughout onboarding."
+
+class TestSkillStream(unittest.TestCase):
+    def setUp(self):
+        self.extractor = EnhancedSkillExtractor(loaded_model=object())
+        skills = ['Docker', 'Kubernetes', 'React', 'PostgreSQL', 'Machine Learning', 'Java', 'Terraform', 'Django']
+        lines = []
+        for skill in skills:
+            lines.append(f"{FILLER} Advanced {skill} required. {FILLER}\n")
+            lines.append(f"Python. {FILLER}\n")
+        self.lines = lines
+        self.text = ''.join(lines)
+    
+    def stream(self, text, **kwargs):
+        return list(self.extractor.iter_skills_with_confidence(text, semantic=False, **kwargs))
+    
+    def test_single_window_equals_extract(self):
+        expected = self.extractor.extract_skills_with_confidence(self.text, semantic=False)
+        self.assertEqual(self.stream(self.text, window_size=len(self.text) + 1), expected)
+    
+    def test_windows_score_occurrences_like_the_whole_document(self):
+        full = {skill['name']: skill for skill in self.extractor.extract_skills_with_confidence(self.text, semantic=False)}
+        for window_size in (300, 700, 2000):
+            streamed = self.stream(self.text, window_size=window_size)
+            names = [skill['name'] for skill in streamed]
+            self.assertEqual(len(names), len(set(names)))
+            self.assertEqual(set(names), set(full))
+            for skill in streamed:
+                # python occurs in every window, the other skills only once
+                if skill['name'] != 'Python':
+                    self.assertEqual(skill, full[skill['name']], (window_size, skill['name']))
+    
+    def test_chunked_input(self):
+        self.assertEqual(self.stream(iter(self.lines), window_size=700), self.stream(self.text, window_size=700))
+    
+    def test_yields_before_the_input_is_exhausted(self):
+        consumed = []
+        def chunks():
+            for line in self.lines:
+                consumed.append(line)
+                yield line
+        stream = self.extractor.iter_skills_with_confidence(chunks(), semantic=False, window_size=300)
+        next(stream)
+        self.assertLess(len(consumed), len(self.lines))
+    
+    def test_empty_input(self):
+        self.assertEqual(self.stream(''), [])
+        self.assertEqual(self.stream([]), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from ..utils import skill_taxonomy
+from ..utils.enhanced_skill_extraction import EnhancedSkillExtractor
+from ..utils.skill_taxonomy import SkillTaxonomy, artifact_path, load_skill_taxonomy, write_artifact
+
+class TestSkillTaxonomy(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = Path(tmp.name)
+        self.taxonomy = SkillTaxonomy.from_dictionaries()
+    
+    def test_round_trip(self):
+        path = write_artifact(self.taxonomy, self.directory)
+        loaded = SkillTaxonomy.load(path)
+        self.assertEqual(loaded.version, self.taxonomy.version)
+        self.assertEqual(loaded.skills, self.taxonomy.skills)
+        self.assertEqual(loaded.acronym_map, self.taxonomy.acronym_map)
+        self.assertEqual(loaded.automaton.find('aws and machine learning'), self.taxonomy.automaton.find('aws and machine learning'))
+        self.assertEqual(sorted(loaded.fuzzy_index.lookup('pythn')), sorted(self.taxonomy.fuzzy_index.lookup('pythn')))
+    
+    def test_extraction_from_loaded_artifact(self):
+        text = "Expert in Pythn and AWS. Experience with ML and Docker is a plus."
+        loaded = SkillTaxonomy.load(write_artifact(self.taxonomy, self.directory))
+        fresh = EnhancedSkillExtractor(loaded_model=object(), taxonomy=self.taxonomy)
+        from_artifact = EnhancedSkillExtractor(loaded_model=object(), taxonomy=loaded)
+        skills = from_artifact.extract_skills_with_confidence(text, semantic=False)
+        self.assertEqual(skills, fresh.extract_skills_with_confidence(text, semantic=False))
+        self.assertTrue(skills)
+        self.assertTrue(all(skill['dictionary_version'] == self.taxonomy.version for skill in skills))
+    
+    def test_load_builds_and_writes_on_miss(self):
+        self.assertEqual(load_skill_taxonomy(self.directory).version, self.taxonomy.version)
+        # workers only share what they compile when asked to
+        self.assertEqual(list(self.directory.iterdir()), [])
+        taxonomy = load_skill_taxonomy(self.directory, write=True)
+        self.assertTrue(artifact_path(taxonomy.version, self.directory).exists())
+        # the next load unpickles instead of compiling
+        with mock.patch.object(SkillTaxonomy, 'from_dictionaries', side_effect=AssertionError):
+            self.assertEqual(load_skill_taxonomy(self.directory).skills, taxonomy.skills)
+    
+    def test_only_older_database_versions_are_removed(self):
+        dictionary = self.taxonomy.version
+        other_release = artifact_path('0' * 16, self.directory)
+        other_release.write_bytes(b'old')
+        write_artifact(self.taxonomy, self.directory)
+        write_artifact(SkillTaxonomy(self.taxonomy.skills, f"{dictionary}-db2"), self.directory)
+        write_artifact(SkillTaxonomy(self.taxonomy.skills, f"{dictionary}-db3"), self.directory)
+        remaining = sorted(path.name for path in self.directory.glob("skill_taxonomy-*.pkl"))
+        self.assertEqual(remaining, sorted(artifact_path(version, self.directory).name
+                                           for version in ('0' * 16, dictionary, f"{dictionary}-db3")))
+    
+    def test_aliases_match_like_names(self):
+        skills = {'kubernetes': {'name': 'Kubernetes', 'category': 'technical', 'subcategory': 'tools'}}
+        skills['k8s'] = skills['kubernetes']
+        taxonomy = SkillTaxonomy(skills, 'test')
+        self.assertEqual(taxonomy.skill_names, ['Kubernetes'])
+        self.assertEqual(taxonomy.dictionary_matches['k8s'], ('Kubernetes', 1.0))
+        self.assertEqual(len(taxonomy.fuzzy_index.lookup('kubernets')), 1)
+    
+    def test_unreadable_or_old_format_is_rebuilt(self):
+        path = artifact_path(self.taxonomy.version, self.directory)
+        path.write_bytes(b'not a pickle')
+        self.assertIsNone(SkillTaxonomy.load(path))
+        write_artifact(self.taxonomy, self.directory)
+        with mock.patch.object(skill_taxonomy, 'ARTIFACT_FORMAT', skill_taxonomy.ARTIFACT_FORMAT + 1):
+            self.assertIsNone(SkillTaxonomy.load(path))
+        self.assertEqual(load_skill_taxonomy(self.directory).version, self.taxonomy.version)
+    
+    def test_artifact_of_other_compiler_code_is_rebuilt(self):
+        path = write_artifact(self.taxonomy, self.directory)
+        with mock.patch.object(skill_taxonomy, 'compiler_hash', return_value='0' * 16):
+            self.assertIsNone(SkillTaxonomy.load(path))
+            self.assertIsNotNone(load_skill_taxonomy(self.directory, write=True))
+            self.assertIsNotNone(SkillTaxonomy.load(path))
+        self.assertIsNone(SkillTaxonomy.load(path))
+
+if __name__ == '__main__':
+    unittest.main()
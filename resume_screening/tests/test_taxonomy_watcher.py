@@ -0,0 +1,99 @@
+import contextlib
+import io
+import threading
+import time
+import unittest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DatabaseError
+from ..utils.skill_taxonomy import SkillTaxonomy
+from ..utils.taxonomy_watcher import TaxonomyWatcher, describes_known_skill
+
+def taxonomy(version, *names):
+    return SkillTaxonomy({name.lower(): {'name': name, 'category': 'technical', 'subcategory': 'tools'} for name in names}, version)
+
+class TestTaxonomyWatcher(unittest.TestCase):
+    def setUp(self):
+        self.db_version = 1
+        self.builds = []
+        self.warmed = []
+        self.release = threading.Event()
+        self.release.set()
+    
+    def build(self, db_version):
+        self.builds.append(db_version)
+        self.release.wait(5)
+        return taxonomy(f"db{db_version}", 'Python', *(['Bazel'] if db_version > 1 else []))
+    
+    def watcher(self, poll_interval=60):
+        return TaxonomyWatcher(read_version=lambda: self.db_version, build=self.build,
+                               warm=self.warmed.append, poll_interval=poll_interval)
+    
+    def test_refresh_swaps_only_when_the_version_moves(self):
+        watcher = self.watcher()
+        first = watcher.current()
+        self.assertFalse(watcher.refresh())
+        self.assertIs(watcher.current(), first)
+        self.db_version = 2
+        self.assertTrue(watcher.refresh())
+        self.assertEqual(watcher.current().version, 'db2')
+        self.assertIn('bazel', watcher.current().skills)
+        self.assertEqual(self.builds, [1, 2])
+        self.assertEqual([t.version for t in self.warmed], ['db2'])
+    
+    def test_failed_refresh_keeps_serving(self):
+        watcher = self.watcher()
+        first = watcher.current()
+        def unavailable():
+            raise RuntimeError('database down')
+        watcher.read_version = unavailable
+        watcher._run_refresh()
+        self.assertIs(watcher.current(), first)
+        self.assertFalse(watcher._refreshing)
+    
+    def test_background_rebuild_does_not_block_requests(self):
+        watcher = self.watcher(poll_interval=0.01)
+        first = watcher.current()
+        self.db_version = 2
+        self.release.clear()  # the rebuild hangs until released
+        time.sleep(0.02)
+        started = time.monotonic()
+        self.assertIs(watcher.current(), first)
+        self.assertIs(watcher.current(), first)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.release.set()
+        for _ in range(100):
+            if watcher.current().version == 'db2':
+                break
+            time.sleep(0.01)
+        self.assertEqual(watcher.current().version, 'db2')
+        self.assertEqual(self.builds.count(2), 1)
+    
+    def test_without_django_falls_back_to_the_dictionaries(self):
+        def unconfigured():
+            raise ImproperlyConfigured('settings are not configured')
+        watcher = TaxonomyWatcher(read_version=unconfigured, warm=self.warmed.append, poll_interval=60)
+        self.assertEqual(len(watcher.current()), len(SkillTaxonomy.from_dictionaries()))
+        self.assertEqual(watcher.poll_interval, 0)
+    
+    def test_unavailable_database_keeps_polling(self):
+        def no_table():
+            raise DatabaseError('no such table: resume_screening_taxonomyversion')
+        watcher = TaxonomyWatcher(read_version=no_table, build=self.build, warm=self.warmed.append, poll_interval=60)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(watcher.current().version, 'db0')
+        self.assertEqual(watcher.poll_interval, 60)
+        # once migrated, the next poll picks up the database version
+        watcher.read_version = lambda: self.db_version
+        self.assertTrue(watcher.refresh())
+        self.assertEqual(watcher.current().version, 'db1')
+
+class TestDescribesKnownSkill(unittest.TestCase):
+    def test_only_rows_repeating_the_taxonomy_are_known(self):
+        compiled = taxonomy('v1', 'Python')
+        self.assertTrue(describes_known_skill(compiled, 'Python', 'technical', 'tools'))
+        self.assertFalse(describes_known_skill(compiled, 'Bazel', 'technical', 'tools'))
+        self.assertFalse(describes_known_skill(compiled, 'Python', 'technical', 'languages'))
+        self.assertFalse(describes_known_skill(compiled, 'python', 'technical', 'tools'))
+
+if __name__ == '__main__':
+    unittest.main()
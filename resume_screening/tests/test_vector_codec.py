@@ -0,0 +1,39 @@
+import unittest
+import numpy as np
+from ..utils.vector_codec import pack, unpack, stack
+
+class TestVectorCodec(unittest.TestCase):
+    def setUp(self):
+        self.vector = np.random.default_rng(0).standard_normal(384).astype(np.float32)
+    
+    def test_float32_round_trip_is_exact(self):
+        data, dim = pack(self.vector)
+        self.assertEqual((len(data), dim), (384 * 4, 384))
+        np.testing.assert_array_equal(unpack(data, 'float32', dim), self.vector)
+    
+    def test_float16_halves_storage(self):
+        data, dim = pack(self.vector, 'float16')
+        self.assertEqual(len(data), 384 * 2)
+        np.testing.assert_allclose(unpack(data, 'float16', dim), self.vector, atol=1e-2)
+    
+    def test_unpack_is_a_view(self):
+        data = memoryview(pack(self.vector)[0])  # what postgres returns for bytea
+        vector = unpack(data)
+        self.assertIsNotNone(vector.base)
+        self.assertFalse(vector.flags.writeable)
+    
+    def test_rejects_bad_input(self):
+        with self.assertRaises(ValueError):
+            pack(self.vector, 'float64')
+        with self.assertRaises(ValueError):
+            unpack(pack(self.vector)[0], 'float32', 100)
+        self.assertIsNone(unpack(None))
+    
+    def test_stack(self):
+        rows = [pack(self.vector) + ('float32',), pack(self.vector * 2, 'float16') + ('float16',)]
+        matrix = stack([(data, dtype, dim) for data, dim, dtype in rows])
+        self.assertEqual(matrix.shape, (2, 384))
+        np.testing.assert_allclose(matrix[1], self.vector * 2, atol=1e-2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from ..utils.vector_index import IVFIndex, IndexStore, normalize
+
+class TestIVFIndex(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        # clustered data, like embeddings of resumes from a handful of professions
+        centers = rng.standard_normal((20, 32))
+        self.vectors = (centers[rng.integers(0, 20, 5000)] + 0.3 * rng.standard_normal((5000, 32))).astype(np.float32)
+        self.ids = np.arange(1000, 6000)
+        self.queries = self.vectors[rng.choice(5000, 50, replace=False)] + 0.1 * rng.standard_normal((50, 32))
+        self.index = IVFIndex.build(self.ids, self.vectors, nlist=64, meta={'model_id': 'test'})
+    
+    def _exact(self, query, k):
+        scores = normalize(self.vectors) @ normalize(query)
+        return set(self.ids[np.argsort(-scores)[:k]])
+    
+    def test_recall_against_brute_force(self):
+        found = sum(len({i for i, _ in self.index.search(q, 10, nprobe=8)} & self._exact(q, 10)) for q in self.queries)
+        self.assertGreater(found / (10 * len(self.queries)), 0.9)
+    
+    def test_probing_every_list_is_exact(self):
+        for query in self.queries[:5]:
+            results = self.index.search(query, 10, nprobe=self.index.nlist)
+            self.assertEqual({i for i, _ in results}, self._exact(query, 10))
+            scores = [score for _, score in results]
+            self.assertEqual(scores, sorted(scores, reverse=True))
+    
+    def test_store_publishes_and_reloads(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = IndexStore(tmp)
+            self.assertIsNone(store.load())
+            store.publish(self.index)
+            loaded = store.load()
+            self.assertIsInstance(loaded.base.vectors, np.memmap)
+            self.assertEqual(loaded.meta['model_id'], 'test')
+            self.assertEqual(loaded.search(self.queries[0], 5, 8), self.index.search(self.queries[0], 5, 8))
+            
+            # a second generation replaces the first one for every reader
+            smaller = IVFIndex.build(self.ids[:100], self.vectors[:100], nlist=4)
+            IndexStore(tmp).publish(smaller)
+            self.assertEqual(len(store.load()), 100)
+            self.assertEqual(len(list(store.root.glob('gen-*'))), 1)
+    
+    def test_logged_changes_are_visible_and_compacted(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = IndexStore(tmp)
+            store.publish(self.index)
+            reader = IndexStore(tmp)  # e.g. another worker process
+            query = self.queries[0]
+            top_id, _ = reader.load().search(query, 1, 8)[0]
+            
+            # a new row equal to the query, the current best row deleted, another row moved
+            pending = store.append(upserts=[(99999, query), (1000, -query)], deletes=[top_id])
+            self.assertEqual(pending, 3)
+            results = reader.load().search(query, 10, 8)
+            self.assertEqual(results[0][0], 99999)
+            self.assertNotIn(top_id, [i for i, _ in results])
+            self.assertEqual(len(reader.load()), 5000)
+            
+            before = reader.load().search(self.queries[1], 10, 8)
+            manifest = store.compact()
+            self.assertEqual(manifest['count'], 5000)
+            compacted = reader.load()
+            self.assertEqual(compacted.pending_ops, 0)
+            self.assertEqual(compacted.search(query, 1, 8)[0][0], 99999)
+            self.assertEqual([i for i, _ in compacted.search(self.queries[1], 10, 8)], [i for i, _ in before])
+            self.assertIsNone(store.compact())  # nothing left to fold in
+    
+    def test_rebuild_keeps_changes_logged_while_building(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = IndexStore(tmp)
+            store.publish(self.index)
+            position = store.log_position()
+            store.append(deletes=[1000])  # arrives while the rebuild reads the database
+            store.publish(IVFIndex.build(self.ids, self.vectors, nlist=16), replay_from=position)
+            self.assertEqual(store.load().pending_ops, 1)
+            self.assertEqual(len(store.load()), 4999)
+    
+    def test_interleaved_publishes_never_remove_a_live_generation(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store, other = IndexStore(tmp), IndexStore(tmp)  # e.g. build_resume_index and a compaction
+            store.publish(self.index)
+            smaller = IVFIndex.build(self.ids[:100], self.vectors[:100], nlist=4)
+            save = smaller.save
+            
+            def save_while_other_publishes(directory):
+                save(directory)
+                # the other process publishes while this generation is still being written
+                other.publish(IVFIndex.build(self.ids[:200], self.vectors[:200], nlist=4))
+                self.assertTrue(directory.exists())
+            
+            with mock.patch.object(smaller, 'save', side_effect=save_while_other_publishes):
+                store.publish(smaller)
+            self.assertEqual(len(IndexStore(tmp).load()), 100)
+            self.assertEqual(len(other.load()), 100)
+            # the superseded generations are gone, nothing half-written is left behind
+            self.assertEqual(len(list(store.root.glob('gen-*'))), 1)
+    
+    def test_newer_generation_is_kept(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = IndexStore(tmp)
+            manifest = store.publish(self.index)
+            newer = store.root / f"gen-{int(manifest['generation'][4:]) + 10**12}"
+            newer.mkdir()
+            store.publish(IVFIndex.build(self.ids[:100], self.vectors[:100], nlist=4))
+            self.assertTrue(newer.exists())
+            self.assertFalse((store.root / manifest['generation']).exists())
+
+if __name__ == '__main__':
+    unittest.main()
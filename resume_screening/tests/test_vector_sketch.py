@@ -0,0 +1,54 @@
+import tempfile
+import unittest
+import numpy as np
+from ..utils.vector_index import IVFIndex, IndexStore, normalize
+from ..utils.vector_sketch import hamming
+
+class TestVectorSketch(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        centers = rng.standard_normal((20, 128))
+        self.vectors = (centers[rng.integers(0, 20, 4000)] + 0.4 * rng.standard_normal((4000, 128))).astype(np.float32)
+        self.ids = np.arange(4000)
+        self.queries = self.vectors[rng.choice(4000, 30, replace=False)] + 0.1 * rng.standard_normal((30, 128))
+        self.index = IVFIndex.build(self.ids, self.vectors, nlist=32, sketch_dims=32)
+    
+    def test_hamming(self):
+        bits = np.packbits(np.array([[1, 0, 1, 1, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0]], dtype=bool), axis=1)
+        query = np.packbits(np.array([1, 0, 0, 1, 0, 0, 0, 1], dtype=bool))
+        self.assertEqual(hamming(bits, query).tolist(), [2, 3])
+        # whole 64-bit words take the word-at-a-time path
+        wide = np.tile(bits, (1, 8))
+        self.assertEqual(hamming(wide, np.tile(query, 8)).tolist(), [16, 24])
+    
+    def test_sketches_are_compact(self):
+        self.assertEqual(self.index.bits.shape, (4000, 8))  # 32 sign bits padded to one 64-bit word
+        # the prefilter reads 8 bytes per row instead of 512
+        self.assertLessEqual(self.index.bits.nbytes * 10, self.index.vectors.nbytes)
+    
+    def test_scan_recall_against_brute_force(self):
+        exact_vectors = normalize(self.vectors)
+        found = 0
+        for query in self.queries:
+            exact = set(np.argsort(-(exact_vectors @ normalize(query)))[:10])
+            results = self.index.scan(query, 10)
+            found += len(exact & {i for i, _ in results})
+            scores = [score for _, score in results]
+            self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertGreater(found / (10 * len(self.queries)), 0.9)
+    
+    def test_sketches_survive_save_and_compaction(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = IndexStore(tmp)
+            store.publish(self.index)
+            query = self.queries[0]
+            store.append(upserts=[(99999, query)])
+            self.assertEqual(store.load().search(query, 1, method='sketch')[0][0], 99999)
+            store.compact()
+            compacted = store.load()
+            self.assertEqual(compacted.pending_ops, 0)
+            self.assertEqual(len(compacted.base.bits), 4001)
+            self.assertEqual(compacted.search(query, 1, method='sketch')[0][0], 99999)
+
+if __name__ == '__main__':
+    unittest.main()
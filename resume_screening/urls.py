@@ -2,10 +2,12 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     ResumeUploadAPI, 
+    ResumeBulkUploadAPI,
     ResumeViewSet,
     JobDescriptionUploadAPI,
     JobDescriptionViewSet,
     JobAnalysisAPI,
+    SimilarResumesAPI,
     SkillMatchingAPI,
     EnhancedResumeAnalysisAPI,
     EnhancedSkillMatchingAPI
@@ -18,6 +20,7 @@ router.register(r'job-descriptions', JobDescriptionViewSet)
 urlpatterns = [
     # resume endpoints
     path('resumes/upload/', ResumeUploadAPI.as_view(), name='resume_upload_api'),
+    path('resumes/bulk-upload/', ResumeBulkUploadAPI.as_view(), name='resume_bulk_upload_api'),
     
     # jobdesc endpoints
     path('jobs/upload/', JobDescriptionUploadAPI.as_view(), name='job_desc_upload_api'),
@@ -27,6 +30,7 @@ urlpatterns = [
 
     # Analysis endpoints
     path('jobs/<int:job_id>/analysis/', JobAnalysisAPI.as_view(), name='job_analysis_api'),
+    path('jobs/<int:job_id>/similar-resumes/', SimilarResumesAPI.as_view(), name='similar_resumes_api'),
     path('resumes/<int:resume_id>/enhanced-analysis/', EnhancedResumeAnalysisAPI.as_view(), name='enhanced_resume_analysis_api'),
     
     # Skill matching endpoints  
@@ -1,12 +1,15 @@
 from typing import List, Dict, Tuple
-import torch
 from .enhanced_skill_extraction import EnhancedSkillExtractor
 import re
 from collections import Counter
 
 class JobRequirementsAnalyzer:
-    def __init__(self):
-        self.skill_extractor = EnhancedSkillExtractor()
+    def __init__(self, skill_extractor: EnhancedSkillExtractor = None):
+        # Reuse the shared extractor so the model and skill embeddings are not rebuilt per analyzer
+        if skill_extractor is None:
+            from .model_registry import get_skill_extractor
+            skill_extractor = get_skill_extractor()
+        self.skill_extractor = skill_extractor
     
     def analyze(self, job_text: str) -> Dict:
         """
@@ -1,52 +1,135 @@
-import torch
-from .bert_utils import tokenizer, model
+import numpy as np
+from .model_registry import get_model
+
+MAX_LENGTH = 512
+
+# merge subwords and filter common words
+COMMON_WORDS = {'the', 'and', 'a', 'to', 'of', 'in', 'for', 'with', 'on', 'at', 'from',
+                'by', 'as', 'an', 'is', 'are', 'be', 'will', 'or', 'that', 'this'}
+
 
 def extract_key_requirements(job_text, top_n = 20):
-    # tokenize the job description
-    inputs = tokenizer(job_text, return_tensors="pt", padding=True, truncation=True, max_length=512)
+    """Most attended-to words of one job description (see extract_key_requirements_batch)"""
+    return [term for term, _ in extract_key_requirements_batch([job_text], top_n)[0]]
+
+
+def extract_key_requirements_batch(job_texts, top_n=20, batch_size=16):
+    """
+    Rank the words of many job descriptions by the attention they receive in the last layer
+
+    texts are sorted by token length and run through padded batches of batch_size;
+    per-token scores are summed into whole words (wordpieces merged) and a term
+    that occurs several times keeps its best score
+    args: list of job texts, number of terms per text, texts per forward pass
+    returns: one list of (term, score) pairs per text, best first
+    """
+    job_texts = list(job_texts)
+    if not job_texts:
+        return []
+    # attentions are read from the model directly, so this always needs local weights
+    loaded = get_model(remote=None)
+    special_ids = set(loaded.tokenizer.all_special_ids)
+
+    # tokenize everything once without padding, then bucket by length
+    encoded = loaded.tokenize(job_texts, truncation=True, max_length=MAX_LENGTH)['input_ids']
+    order = sorted(range(len(job_texts)), key=lambda i: len(encoded[i]))
+
+    results = [None] * len(job_texts)
+    for start in range(0, len(order), batch_size):
+        bucket = order[start:start + batch_size]
+        received = _last_layer_attention(loaded, [encoded[i] for i in bucket])
+        for row, i in enumerate(bucket):
+            tokens = loaded.tokenizer.convert_ids_to_tokens(encoded[i])
+            special = np.fromiter((token_id in special_ids for token_id in encoded[i]), dtype=bool, count=len(tokens))
+            words, scores = _merge_wordpieces(tokens, received[row, :len(tokens)], special)
+            results[i] = _top_terms(words, scores, top_n)
+    return results
+
+
+def _last_layer_attention(loaded, sequences):
+    """
+    Attention each token receives in the last layer, averaged over heads and summed over
+    the (non-padding) query positions: float32 array of shape (batch, longest sequence)
+    """
+    import torch
+    from .bert_utils import collate
+
+    batch = {name: torch.from_numpy(array) for name, array in collate(loaded, sequences).items()}
+    mask = batch['attention_mask'].to(torch.float32)
+    model = loaded.model
+    self_attention = _last_self_attention(model)
 
-    # getting model's outputs including attention values
     with torch.no_grad(): # disables gradient calculation because we're not training a model
-        outputs = model(**inputs, output_attentions=True)
-
-    # extracting and processing the attention values, average across all attention heads
-    attention = outputs.attentions[-1][0].mean(dim=0)
- 
-    # how much attention each token receives 
-    token_attention = attention.sum(dim=0)
-
-    # map attention scores to tokens
-    tokens = tokenizer.convert_ids_to_tokens(inputs['input_ids'][0])
-    print("Tokens:")
-    print(tokens)
-
-    # create list of (token, attention_score) pairs
-    # filter out special tokens and subword tokens
-    token_importance = []
-    for i, token in enumerate(tokens):
-        # Skip special tokens and subword tokens
-        if token in ['[CLS]', '[SEP]', '[PAD]'] or token.startswith('##'):
-            continue
-        
-        token_importance.append((token, float(token_attention[i])))
-    
-    # sort by importance score
-    token_importance.sort(key=lambda x: x[1], reverse=True)
-    
-    # merge subwords and filter common words
-    common_words = {'the', 'and', 'a', 'to', 'of', 'in', 'for', 'with', 'on', 'at', 'from', 
-                   'by', 'as', 'an', 'is', 'are', 'be', 'will', 'or', 'that', 'this'}
-    
-    important_terms = []
-    for token, score in token_importance:
+        if self_attention is None:
+            # not a BERT-style encoder: ask the model for every layer's attentions, keep the last
+            probs = model(**batch, output_attentions=True).attentions[-1]
+        else:
+            # only the input of the last layer is needed to recompute its attention
+            # probabilities, instead of materializing (heads x seq x seq) for every layer
+            hidden = model(**batch, output_hidden_states=True).hidden_states[-2]
+            probs = _attention_probs(self_attention, hidden, mask)
+
+        # extracting and processing the attention values, average across all attention heads
+        attention = probs.mean(dim=1) * mask[:, :, None]
+        # how much attention each token receives
+        return attention.sum(dim=1).numpy().astype(np.float32)
+
+
+def _last_self_attention(model):
+    try:
+        self_attention = model.encoder.layer[-1].attention.self
+    except AttributeError:
+        return None
+    if not all(hasattr(self_attention, name) for name in ('query', 'key', 'num_attention_heads', 'attention_head_size')):
+        return None
+    return self_attention
+
+
+def _attention_probs(self_attention, hidden, mask):
+    import torch
+
+    batch_size, seq_len, _ = hidden.shape
+    heads, head_size = self_attention.num_attention_heads, self_attention.attention_head_size
+
+    def split_heads(x):
+        return x.view(batch_size, seq_len, heads, head_size).transpose(1, 2)
+
+    query = split_heads(self_attention.query(hidden))
+    key = split_heads(self_attention.key(hidden))
+    scores = query @ key.transpose(-1, -2) / (head_size ** 0.5)
+    # padded keys get no attention
+    scores = scores.masked_fill(mask[:, None, None, :] == 0, torch.finfo(scores.dtype).min)
+    return scores.softmax(dim=-1)
+
+
+def _merge_wordpieces(tokens, token_scores, special):
+    """
+    Sum the scores of "##" continuation pieces into the word they belong to
+    returns: (list of words, float array of word scores)
+    """
+    tokens = np.asarray(tokens, dtype=object)
+    keep = ~special
+    tokens, token_scores = tokens[keep], np.asarray(token_scores, dtype=np.float64)[keep]
+    if not len(tokens):
+        return [], np.zeros(0)
+    continuation = np.char.startswith(tokens.astype(str), '##')
+    continuation[0] = False
+    word_index = np.cumsum(~continuation) - 1
+    scores = np.bincount(word_index, weights=token_scores)
+
+    pieces = np.where(continuation, np.char.lstrip(tokens.astype(str), '#'), tokens.astype(str))
+    starts = np.flatnonzero(~continuation)
+    words = [''.join(pieces[a:b]) for a, b in zip(starts, list(starts[1:]) + [len(pieces)])]
+    return words, scores
+
+
+def _top_terms(words, scores, top_n):
+    best = {}
+    for word, score in zip(words, scores):
         # skip very short tokens and common words
-        if len(token) <= 2 or token.lower() in common_words:
+        if len(word) <= 2 or word.lower() in COMMON_WORDS:
             continue
-        
-        important_terms.append(token)
-        
-        # stop once we have enough terms
-        if len(important_terms) >= top_n:
-            break
-    
-    return important_terms
\ No newline at end of file
+        if score > best.get(word, -1.0):
+            best[word] = float(score)
+    # sort by importance score
+    return sorted(best.items(), key=lambda item: item[1], reverse=True)[:top_n]
@@ -1,20 +1,165 @@
-from transformers import AutoModel, AutoTokenizer
-import torch
-
-MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
-try:
-    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME) # converts text into tokens the model can understand
-    model = AutoModel.from_pretrained(MODEL_NAME) # the neural network that processes these tokens
-except Exception as e:
-    print(f"Error loading model: {e}")
-    # Provide fallback
-    tokenizer = None
-    model = None
-    
-#convert text to bert embedding vector 
+import numpy as np
+from .config import nlp_setting
+from .model_registry import get_model, default_model_name, get_scheduler
+
+MODEL_NAME = default_model_name()
+MAX_LENGTH = 512 # tokenizer/position-embedding limit of the encoder
+
+
+# tokenizer (converts text into tokens the model can understand) and model (the
+# neural network that processes these tokens) used to be loaded right here at
+# import time; they are now loaded by the registry on first access instead
+def __getattr__(name):
+    if name in ('tokenizer', 'model'):
+        try:
+            return getattr(get_model(MODEL_NAME, remote=None), name)
+        except Exception as e:
+            print(f"Error loading model: {e}")
+            return None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+#convert text to bert embedding vector (only the first MAX_LENGTH tokens are used)
 def get_bert_embedding(text):
-    tokens = tokenizer(text, padding=True, truncation=True, return_tensors="pt")
-    with torch.no_grad():
-        output = model(**tokens)
-    embedding = output.last_hidden_state[:, 0, :].squeeze().tolist()  # CLS token representation
-    return embedding
+    return embed_many([text])[0].tolist()  # CLS token representation
+
+
+#convert a whole document to one embedding vector, however long it is
+def get_document_embedding(text):
+    return embed_documents([text])[0].tolist()
+
+
+def collate(loaded, sequences):
+    # pad only up to the longest sequence of this bucket, not to MAX_LENGTH
+    # int64 numpy arrays so the same batch feeds either encoder backend
+    pad_id = loaded.tokenizer.pad_token_id or 0
+    longest = max(len(ids) for ids in sequences)
+    input_ids = np.full((len(sequences), longest), pad_id, dtype=np.int64)
+    attention_mask = np.zeros((len(sequences), longest), dtype=np.int64)
+    for row, ids in enumerate(sequences):
+        input_ids[row, :len(ids)] = ids
+        attention_mask[row, :len(ids)] = 1
+    return {
+        'input_ids': input_ids,
+        'attention_mask': attention_mask,
+        'token_type_ids': np.zeros_like(input_ids),
+    }
+
+
+def _encode_cls(loaded, sequences):
+    return loaded.encoder.cls_vectors(collate(loaded, sequences))
+
+
+def embed_many(texts, batch_size=32, loaded=None):
+    """
+    embeds many texts with as few forward passes as possible
+    texts are sorted by token length so each batch pads to a similar length,
+    and the vectors come back in the original order
+    args: list of texts, number of texts per forward pass, optional model from the registry
+    returns: float32 array of shape (len(texts), hidden_size) with CLS vectors
+    """
+    loaded = loaded or get_model(MODEL_NAME)
+    texts = list(texts)
+    hidden_size = loaded.hidden_size
+    if not texts:
+        return np.zeros((0, hidden_size), dtype=np.float32)
+    if nlp_setting("micro_batching"):
+        # concurrent callers share one batch, see InferenceScheduler
+        scheduler = get_scheduler(('texts', batch_size), loaded, lambda items: _embed_many(items, batch_size, loaded))
+        return scheduler.run(texts)
+    return _embed_many(texts, batch_size, loaded)
+
+
+def _embed_many(texts, batch_size, loaded):
+    if loaded.remote:
+        return loaded.remote.embed_many(texts, batch_size)
+    hidden_size = loaded.hidden_size
+    # tokenize everything once without padding, then bucket by length
+    encoded = loaded.tokenize(texts, truncation=True, max_length=MAX_LENGTH)['input_ids']
+    order = sorted(range(len(texts)), key=lambda i: len(encoded[i]))
+
+    vectors = np.empty((len(texts), hidden_size), dtype=np.float32)
+    for start in range(0, len(order), batch_size):
+        bucket = order[start:start + batch_size]
+        vectors[bucket] = _encode_cls(loaded, [encoded[i] for i in bucket])
+    return vectors
+
+
+def _split_windows(ids, window, overlap):
+    # overlapping windows of at most `window` content tokens covering the whole document
+    if len(ids) <= window:
+        return [ids]
+    step = max(window - overlap, 1)
+    windows = []
+    for start in range(0, len(ids), step):
+        windows.append(ids[start:start + window])
+        if start + window >= len(ids):
+            break
+    return windows
+
+
+def embed_documents(texts, window=None, overlap=None, max_tokens_per_batch=None, loaded=None):
+    """
+    embeds whole documents instead of silently truncating them at MAX_LENGTH tokens
+    every document is split into overlapping token windows, the windows of all
+    documents are bucketed by length and run in batches of at most
+    max_tokens_per_batch (padded) tokens, and each document's window vectors are
+    averaged, weighted by how many tokens each window holds
+    args: list of texts, window size and overlap in tokens, padded-token budget per forward pass,
+          optional model from the registry
+    returns: float32 array of shape (len(texts), hidden_size)
+    """
+    window = window or nlp_setting("chunk_tokens")
+    overlap = nlp_setting("chunk_overlap") if overlap is None else overlap
+    max_tokens_per_batch = max_tokens_per_batch or nlp_setting("max_tokens_per_batch")
+    loaded = loaded or get_model(MODEL_NAME)
+    texts = list(texts)
+    hidden_size = loaded.hidden_size
+    if not texts:
+        return np.zeros((0, hidden_size), dtype=np.float32)
+    if nlp_setting("micro_batching"):
+        # windows of documents from concurrent callers are packed into the same batches
+        scheduler = get_scheduler(('documents', window, overlap, max_tokens_per_batch), loaded,
+                                  lambda items: _embed_documents(items, window, overlap, max_tokens_per_batch, loaded))
+        return scheduler.run(texts)
+    return _embed_documents(texts, window, overlap, max_tokens_per_batch, loaded)
+
+
+def _embed_documents(texts, window, overlap, max_tokens_per_batch, loaded):
+    if loaded.remote:
+        return loaded.remote.embed_documents(texts, window, overlap, max_tokens_per_batch)
+    hidden_size = loaded.hidden_size
+
+    # room for [CLS] and [SEP] in every window
+    window = min(window, MAX_LENGTH - 2)
+    cls_id = loaded.tokenizer.cls_token_id
+    sep_id = loaded.tokenizer.sep_token_id
+    overlap = min(overlap, window // 2)
+
+    encoded = loaded.tokenize(texts, add_special_tokens=False, truncation=False, verbose=False)['input_ids']
+    sequences = []
+    owners = []
+    for doc, ids in enumerate(encoded):
+        for chunk in _split_windows(ids, window, overlap):
+            sequences.append([cls_id] + chunk + [sep_id])
+            owners.append(doc)
+
+    # pack length-sorted windows into batches whose padded size stays within budget
+    order = sorted(range(len(sequences)), key=lambda i: len(sequences[i]))
+    window_vectors = np.empty((len(sequences), hidden_size), dtype=np.float32)
+    batch = []
+    for i in order:
+        if batch and (len(batch) + 1) * len(sequences[i]) > max_tokens_per_batch:
+            window_vectors[batch] = _encode_cls(loaded, [sequences[j] for j in batch])
+            batch = []
+        batch.append(i)
+    if batch:
+        window_vectors[batch] = _encode_cls(loaded, [sequences[j] for j in batch])
+
+    # length-weighted mean of each document's windows
+    owners = np.asarray(owners)
+    weights = np.asarray([len(sequence) for sequence in sequences], dtype=np.float32)
+    vectors = np.zeros((len(texts), hidden_size), dtype=np.float32)
+    np.add.at(vectors, owners, window_vectors * weights[:, None])
+    totals = np.bincount(owners, weights=weights, minlength=len(texts)).astype(np.float32)
+    return vectors / totals[:, None]
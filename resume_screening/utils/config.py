@@ -0,0 +1,90 @@
+from pathlib import Path
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+# defaults used when a key is missing from settings or settings are not configured
+# (e.g. when the utils are used from a plain unittest run without django.setup())
+NLP_MODEL_DEFAULTS = {
+    "encoder_model": "sentence-transformers/all-MiniLM-L6-v2",
+    "encoder_backend": "torch",
+    "quantization": None,
+    "onnx_path": None,  # defaults to <cache_dir>/encoder-<model>.onnx
+    "onnx_threads": None,
+    "cache_dir": None,  # defaults to settings.TRAINED_MODELS_DIR
+    "chunk_tokens": 256,
+    "chunk_overlap": 32,
+    "max_tokens_per_batch": 8192,
+    "embedding_cache_size": 2048,
+    "embedding_dtype": "float32",  # or "float16" to halve stored document embeddings
+    "index_nlist": None,  # inverted lists of the resume index, defaults to 4 * sqrt(resumes)
+    "index_nprobe": 16,  # lists scanned per query (recall vs latency)
+    "index_compact_ops": 1000,  # logged resume changes that trigger a background compaction
+    "index_method": "ivf",  # or "sketch": Hamming/PCA prefilter over every resume, then exact rerank
+    "index_sketch_dims": 64,  # PCA dimensions (and sign bits) per sketch, 0 disables sketches
+    "index_shortlist": None,  # rows reranked with full vectors, defaults to max(30 * k, 300)
+    "inference_address": None,
+    "inference_authkey": None,  # defaults to settings.SECRET_KEY
+    "inference_timeout": 60,  # seconds a request waits for an inference worker before failing
+    "micro_batching": False,
+    "batch_max_size": 64,
+    "batch_max_wait_ms": 5,
+}
+
+SKILL_EXTRACTION_DEFAULTS = {
+    "confidence_threshold": 0.7,
+    "max_phrase_length": 4,
+    "semantic_matching": False,  # embeds every unmatched phrase, so off on the request path unless enabled
+    "semantic_threshold": None,  # minimum cosine similarity, defaults to the one measured by calibrate_semantic_threshold
+    "semantic_top_k": 3,
+    "match_cache_size": 50000,  # phrase -> fuzzy matches memoized per process
+    "stream_window_chars": 20000,  # text per window of iter_skills_with_confidence
+    "write_taxonomy_artifacts": False,  # workers write the taxonomies they compile for the others (build_skill_artifact always does)
+    "taxonomy_poll_seconds": 30,  # how often workers check the database for skill taxonomy changes (0: never)
+    "batch_workers": None,  # processes of extract_skills_batch, defaults to one per CPU
+    "batch_chunk_size": 64,  # documents per work unit of extract_skills_batch
+}
+
+
+def _settings_dict(name):
+    try:
+        return getattr(settings, name, {}) or {}
+    except ImproperlyConfigured:
+        return {}
+
+
+def nlp_setting(key):
+    """Read a key from settings.NLP_MODEL_CONFIG, falling back to the defaults above"""
+    return _settings_dict("NLP_MODEL_CONFIG").get(key, NLP_MODEL_DEFAULTS.get(key))
+
+
+def skill_setting(key):
+    """Read a key from settings.SKILL_EXTRACTION_CONFIG, falling back to the defaults above"""
+    return _settings_dict("SKILL_EXTRACTION_CONFIG").get(key, SKILL_EXTRACTION_DEFAULTS.get(key))
+
+
+def cache_dir() -> Path:
+    """Directory for derived model artifacts (embedding caches, exported graphs)"""
+    path = nlp_setting("cache_dir")
+    if not path:
+        try:
+            path = getattr(settings, "TRAINED_MODELS_DIR", None)
+        except ImproperlyConfigured:
+            path = None
+    if not path:
+        path = Path(__file__).resolve().parents[2] / "trained_models"
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def inference_authkey() -> bytes:
+    """Shared secret between web workers and the inference pool"""
+    key = nlp_setting("inference_authkey")
+    if not key:
+        try:
+            key = settings.SECRET_KEY
+        except ImproperlyConfigured:
+            key = None
+    if not key:
+        raise ImproperlyConfigured("Set NLP_MODEL_CONFIG['inference_authkey'] or SECRET_KEY to use the inference pool")
+    return key.encode() if isinstance(key, str) else key
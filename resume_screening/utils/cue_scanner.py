@@ -0,0 +1,67 @@
+import re
+from bisect import bisect_left
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+# one pass over a document finds every proficiency, negation and importance cue
+# all cue phrases are literals, compiled into a single alternation inside a
+# lookahead so overlapping cues are all seen ("strong" is both a level and an
+# importance cue, "good to have" starts with the level word "good"); at every
+# position the longest phrase is matched and the cues that are prefixes of it
+# are recorded, after checking the word boundaries each cue asks for
+
+
+class Cue(NamedTuple):
+    phrase: str
+    label: str
+    word_start: bool = False  # \b before the phrase
+    word_end: bool = False  # \b after the phrase
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+
+class CuePositions:
+    """Character spans of the cues found in one text, per label, in text order"""
+
+    def __init__(self, found: Dict[str, List[Tuple[int, int]]]):
+        self._starts = {label: [start for start, _ in spans] for label, spans in found.items()}
+        self._ends = {label: [end for _, end in spans] for label, spans in found.items()}
+
+    def within(self, label: str, low: int, high: int) -> bool:
+        """Whether a cue with label lies entirely inside [low, high)"""
+        starts, ends = self._starts.get(label, ()), self._ends.get(label, ())
+        i = bisect_left(starts, low)
+        while i < len(starts) and starts[i] < high:
+            if ends[i] <= high:
+                return True
+            i += 1
+        return False
+
+    def spans(self, label: str) -> List[Tuple[int, int]]:
+        return list(zip(self._starts.get(label, ()), self._ends.get(label, ())))
+
+
+class CueScanner:
+    """Compiled set of cues, scanned for in a single pass per text"""
+
+    def __init__(self, cues: Iterable[Cue]):
+        self.cues = list(cues)
+        self.labels = list(dict.fromkeys(cue.label for cue in self.cues))
+        phrases = sorted({cue.phrase for cue in self.cues}, key=len, reverse=True)
+        self._regex = re.compile('(?=(%s))' % '|'.join(map(re.escape, phrases)))
+        # cues that start wherever a phrase matches: those whose phrase is a prefix of it
+        self._prefixes = {phrase: [cue for cue in self.cues if phrase.startswith(cue.phrase)] for phrase in phrases}
+
+    def scan(self, text: str) -> CuePositions:
+        found = {label: [] for label in self.labels}
+        for match in self._regex.finditer(text):
+            start = match.start()
+            for cue in self._prefixes[match.group(1)]:
+                end = start + len(cue.phrase)
+                if cue.word_start and start and _is_word_char(text[start - 1]):
+                    continue
+                if cue.word_end and end < len(text) and _is_word_char(text[end]):
+                    continue
+                found[cue.label].append((start, end))
+        return CuePositions(found)
@@ -0,0 +1,57 @@
+import re
+from bisect import bisect_left, bisect_right
+from typing import Tuple
+from .skill_automaton import tokenize
+from .cue_scanner import CueScanner
+
+# per-document lookups shared by every match scored in one extraction: the text is
+# lowercased and tokenized once, and word and sentence positions are answered by
+# binary search instead of re-finding phrases and re-splitting context windows
+
+# sentence punctuation followed by whitespace or the end of the text, so the dots
+# of "node.js" or "3.5 years" do not split a sentence
+SENTENCE_END_RE = re.compile(r'[.!?](?=\s|$)')
+
+
+class DocumentIndex:
+    """Lowercased text of one document with word offsets and sentence boundaries"""
+
+    def __init__(self, text: str, scanner: CueScanner = None):
+        self.text = text
+        self.lower = text.lower()
+        self.words, self.spans = tokenize(self.lower)
+        self.word_starts = [start for start, _ in self.spans]
+        self.sentence_ends = [match.start() for match in SENTENCE_END_RE.finditer(self.lower)]
+        # positions of every cue of scanner in the lowercased text
+        self.cues = scanner.scan(self.lower) if scanner else None
+
+    def __len__(self):
+        return len(self.lower)
+
+    def phrase_span(self, first: int, n_words: int, strip: str = '') -> Tuple[int, int]:
+        """Character span of words[first:first + n_words], without leading/trailing strip characters"""
+        start, end = self.spans[first][0], self.spans[first + n_words - 1][1]
+        if strip:
+            start += len(self.words[first]) - len(self.words[first].lstrip(strip))
+            end -= len(self.words[first + n_words - 1]) - len(self.words[first + n_words - 1].rstrip(strip))
+        return start, max(start, end)
+
+    def words_end(self, position: int, limit: int, count: int) -> int:
+        """Offset where the first count words of lower[position:limit] end (position when there are none)"""
+        i = bisect_right(self.word_starts, position) - 1
+        if i < 0 or self.spans[i][1] <= position:
+            i += 1
+        words_end = position
+        for start, end in self.spans[i:i + count]:
+            if max(start, position) >= limit:
+                break
+            words_end = min(end, limit)
+        return words_end
+
+    def sentence(self, start: int, end: int) -> Tuple[int, int]:
+        """Span of the sentence containing lower[start:end], without its closing punctuation"""
+        i = bisect_left(self.sentence_ends, start)
+        sentence_start = self.sentence_ends[i - 1] + 1 if i else 0
+        j = bisect_left(self.sentence_ends, end, lo=i)
+        sentence_end = self.sentence_ends[j] if j < len(self.sentence_ends) else len(self.lower)
+        return sentence_start, sentence_end
@@ -0,0 +1,118 @@
+import hashlib
+import threading
+import unicodedata
+import numpy as np
+from django.db import DatabaseError, transaction
+from .bert_utils import embed_documents
+from .config import nlp_setting
+from .lru_cache import LRUCache
+from .model_registry import get_model
+
+# document embeddings keyed by sha256 of the normalized text plus the id of the
+# model (and pooling settings) that produced them, so re-uploading an identical
+# resume or job posting never runs the encoder again
+# tier 1: bounded in-process LRU, tier 2: the EmbeddingCacheEntry table
+
+
+def normalize_text(text):
+    # whitespace and unicode form do not change what the tokenizer sees
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+def content_hash(text):
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+def vector_id(loaded):
+    """Everything that changes the vector for the same text"""
+    return f"{loaded.model_id}|doc:{nlp_setting('chunk_tokens')}/{nlp_setting('chunk_overlap')}"
+
+
+class EmbeddingCache:
+    def __init__(self, maxsize=None, persistent=True):
+        self.memory = LRUCache(maxsize or nlp_setting("embedding_cache_size"))
+        self.persistent = persistent
+        self._lock = threading.Lock()
+        self.db_hits = 0
+        self.computed = 0
+
+    def get_many(self, texts, loaded=None, max_tokens_per_batch=None):
+        """
+        Document embeddings for texts, computing only the ones never seen before
+        returns: float32 array of shape (len(texts), hidden_size)
+        """
+        loaded = loaded or get_model()
+        model_key = vector_id(loaded)
+        texts = list(texts)
+        keys = [content_hash(text) for text in texts]
+        vectors = [self.memory.get((model_key, key)) for key in keys]
+
+        missing = {key for key, vector in zip(keys, vectors) if vector is None}
+        found = self._load_persistent(model_key, missing) if missing else {}
+
+        to_compute = {}
+        for text, key in zip(texts, keys):
+            if key in missing and key not in found and key not in to_compute:
+                to_compute[key] = text
+        if to_compute:
+            computed = embed_documents(list(to_compute.values()), loaded=loaded,
+                                       max_tokens_per_batch=max_tokens_per_batch)
+            found.update(zip(to_compute.keys(), computed))
+            self._store_persistent(model_key, dict(zip(to_compute.keys(), computed)))
+
+        with self._lock:
+            self.db_hits += len(missing) - len(to_compute)
+            self.computed += len(to_compute)
+        for key in missing:
+            self.memory.put((model_key, key), found[key])
+
+        result = np.empty((len(texts), loaded.hidden_size), dtype=np.float32)
+        for i, (key, vector) in enumerate(zip(keys, vectors)):
+            result[i] = found[key] if vector is None else vector
+        return result
+
+    def get(self, text, loaded=None):
+        return self.get_many([text], loaded)[0]
+
+    def model_id(self, loaded=None):
+        """Identifier stored next to each embedding so vectors of different models are never mixed"""
+        return vector_id(loaded or get_model())
+
+    def _load_persistent(self, model_key, keys):
+        if not self.persistent:
+            return {}
+        from ..models import EmbeddingCacheEntry
+        # a savepoint, so a failed lookup does not abort the caller's transaction
+        try:
+            with transaction.atomic():
+                entries = list(EmbeddingCacheEntry.objects.filter(model_id=model_key, content_hash__in=keys))
+            return {entry.content_hash: entry.as_array() for entry in entries}
+        except DatabaseError as e:
+            print(f"Embedding cache lookup failed: {e}")
+            return {}
+
+    def _store_persistent(self, model_key, vectors):
+        if not self.persistent:
+            return
+        from ..models import EmbeddingCacheEntry
+        entries = [
+            EmbeddingCacheEntry(content_hash=key, model_id=model_key, vector=EmbeddingCacheEntry.pack(vector))
+            for key, vector in vectors.items()
+        ]
+        try:
+            with transaction.atomic():
+                EmbeddingCacheEntry.objects.bulk_create(entries, ignore_conflicts=True)
+        except DatabaseError as e:
+            print(f"Embedding cache write failed: {e}")
+
+    def stats(self):
+        memory = self.memory.stats()
+        lookups = memory['hits'] + memory['misses']
+        return {
+            'memory_hits': memory['hits'],
+            'persistent_hits': self.db_hits,
+            'misses': self.computed,
+            'hit_rate': (memory['hits'] + self.db_hits) / lookups if lookups else 0.0,
+            'memory_size': memory['size'],
+            'memory_maxsize': memory['maxsize'],
+        }
@@ -0,0 +1,169 @@
+import os
+import re
+from pathlib import Path
+import numpy as np
+from django.core.exceptions import ImproperlyConfigured
+from .config import nlp_setting, cache_dir
+
+# encoder backends turn a padded batch of token ids into CLS vectors
+# the backend is picked with NLP_MODEL_CONFIG["encoder_backend"]:
+#   "torch" - eager PyTorch AutoModel (default)
+#   "onnx"  - the same graph exported to ONNX and run with onnxruntime on CPU
+# NLP_MODEL_CONFIG["quantization"] = "int8" switches either backend to dynamic
+# int8 quantization of the linear layers (weights int8, activations quantized per batch)
+
+INPUT_NAMES = ['input_ids', 'attention_mask', 'token_type_ids']
+
+
+class TorchEncoder:
+    name = 'torch'
+
+    def __init__(self, model):
+        self.model = model
+
+    def cls_vectors(self, inputs) -> np.ndarray:
+        """inputs: dict of int64 arrays of shape (batch, seq_len)"""
+        import torch
+        tensors = {key: torch.from_numpy(value) for key, value in inputs.items()}
+        with torch.no_grad():
+            output = self.model(**tensors)
+        return output.last_hidden_state[:, 0, :].numpy()
+
+
+class OnnxEncoder:
+    name = 'onnx'
+
+    def __init__(self, onnx_path, threads=None):
+        try:
+            import onnxruntime
+        except ImportError:
+            raise ImproperlyConfigured("encoder_backend 'onnx' requires the onnxruntime package")
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.onnx_path = Path(onnx_path)
+        self.session = onnxruntime.InferenceSession(str(onnx_path), options, providers=['CPUExecutionProvider'])
+        self.input_names = {node.name for node in self.session.get_inputs()}
+
+    def cls_vectors(self, inputs) -> np.ndarray:
+        feeds = {key: value for key, value in inputs.items() if key in self.input_names}
+        last_hidden_state = self.session.run(['last_hidden_state'], feeds)[0]
+        return np.ascontiguousarray(last_hidden_state[:, 0, :], dtype=np.float32)
+
+
+def onnx_path_for(model_name) -> Path:
+    configured = nlp_setting("onnx_path")
+    if configured:
+        return Path(configured)
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', model_name).strip('-')[-48:]
+    return cache_dir() / f"encoder-{slug}.onnx"
+
+
+def quantize_int8(model):
+    """Dynamically quantize the linear layers of a torch model to int8, in place"""
+    import torch
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def quantize_onnx_int8(onnx_path) -> Path:
+    """Write an int8 dynamically quantized copy of an exported graph next to it"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    onnx_path = Path(onnx_path)
+    quantized_path = onnx_path.with_name(onnx_path.stem + '-int8.onnx')
+    # a re-exported graph makes the quantized copy stale
+    if quantized_path.exists() and quantized_path.stat().st_mtime >= onnx_path.stat().st_mtime:
+        return quantized_path
+    tmp_path = quantized_path.with_name(f"{quantized_path.stem}.{os.getpid()}.tmp.onnx")
+    try:
+        quantize_dynamic(str(onnx_path), str(tmp_path), weight_type=QuantType.QInt8)
+        os.replace(tmp_path, quantized_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return quantized_path
+
+
+def export_onnx(model, onnx_path, opset=17):
+    """Export a transformers encoder to ONNX with dynamic batch and sequence axes"""
+    import torch
+
+    class _ExportWrapper(torch.nn.Module):
+        # fixed positional signature, independent of the argument order of model.forward
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.model(
+                input_ids=input_ids, attention_mask=attention_mask, token_type_ids=token_type_ids
+            ).last_hidden_state
+
+    onnx_path = Path(onnx_path)
+    onnx_path.parent.mkdir(parents=True, exist_ok=True)
+    dummy = torch.ones((2, 8), dtype=torch.long)
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in INPUT_NAMES}
+    dynamic_axes['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+    # per-process temporary file, renamed into place, so concurrent exports never mix
+    tmp_path = onnx_path.with_name(f"{onnx_path.name}.{os.getpid()}.tmp")
+    try:
+        with torch.no_grad():
+            torch.onnx.export(
+                _ExportWrapper(model).eval(),
+                (dummy, dummy, torch.zeros_like(dummy)),
+                str(tmp_path),
+                input_names=INPUT_NAMES,
+                output_names=['last_hidden_state'],
+                dynamic_axes=dynamic_axes,
+                opset_version=opset,
+                dynamo=False,
+            )
+        os.replace(tmp_path, onnx_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return onnx_path
+
+
+def create_encoder(model_name, model, backend=None, quantization=None):
+    """
+    Build the configured backend for an already loaded transformers model
+    with the torch backend and quantization="int8" the model itself is quantized
+    in place, so every user of the loaded model runs the int8 weights
+    """
+    backend = backend or nlp_setting("encoder_backend")
+    if quantization not in (None, 'int8'):
+        raise ImproperlyConfigured(f"Unknown quantization: {quantization}")
+    if backend == 'torch':
+        if quantization == 'int8':
+            quantize_int8(model)
+        return TorchEncoder(model)
+    if backend == 'onnx':
+        onnx_path = onnx_path_for(model_name)
+        if not onnx_path.exists():
+            export_onnx(model, onnx_path)
+        if quantization == 'int8':
+            onnx_path = quantize_onnx_int8(onnx_path)
+        return OnnxEncoder(onnx_path, threads=nlp_setting("onnx_threads"))
+    raise ImproperlyConfigured(f"Unknown encoder_backend: {backend}")
+
+
+def check_parity(reference, candidate, batches, atol=1e-4):
+    """
+    Compare CLS vectors of two backends on the same padded batches
+    returns: dict with the max absolute difference, min cosine similarity and pass/fail
+    """
+    max_abs_diff = 0.0
+    min_cosine = 1.0
+    for inputs in batches:
+        expected = reference.cls_vectors(inputs)
+        actual = candidate.cls_vectors(inputs)
+        max_abs_diff = max(max_abs_diff, float(np.abs(expected - actual).max()))
+        cosine = (expected * actual).sum(axis=1) / (
+            np.linalg.norm(expected, axis=1) * np.linalg.norm(actual, axis=1) + 1e-12)
+        min_cosine = min(min_cosine, float(cosine.min()))
+    return {
+        'max_abs_diff': max_abs_diff,
+        'min_cosine': min_cosine,
+        'passed': max_abs_diff <= atol,
+    }
@@ -1,284 +1,547 @@
-from typing import List, Dict, Tuple, Set
-import torch
-from transformers import AutoTokenizer, AutoModel
-import re
-from Levenshtein import distance
+from typing import List, Dict, Tuple, Set, Iterable, Iterator, Sequence, Union
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from bisect import bisect_left, bisect_right
+import numpy as np
 from collections import defaultdict
-from .skills_dictionaries import ALL_SKILLS, TECHNICAL_SKILLS, SOFT_SKILLS
+from .model_registry import get_model, get_skill_match_cache, get_skill_taxonomy
+from .bert_utils import embed_many
+from .skill_embedding_cache import load_skill_embeddings
+from .skill_taxonomy import SkillTaxonomy
+from .config import skill_setting
+from .document_index import DocumentIndex
+from .cue_scanner import Cue, CueScanner
+from .semantic_calibration import load_calibrated_threshold
+
+# candidate phrases for semantic matching may not start or end with one of these
+PHRASE_STOPWORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in', 'is', 'it',
+    'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'we', 'were', 'will', 'with', 'you', 'your',
+    'our', 'i', 'my', 'me', 'not', 'no', 'but', 'also', 'all', 'any', 'can', 'into', 'using', 'used',
+])
+PHRASE_PUNCTUATION = '.,;:!?()[]{}"\'*-\u2022'
+LEVEL_CONFIDENCE = {
+    'expert': 1.0,
+    'intermediate': 0.7,
+    'beginner': 0.4
+}
 
 class EnhancedSkillExtractor:
-    def __init__(self):
-        self.model_name = "sentence-transformers/all-MiniLM-L6-v2"
-        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-        self.model = AutoModel.from_pretrained(self.model_name)
-        
-        # Pre-compute embeddings for all skills
-        self.skill_embeddings = self._precompute_skill_embeddings()
-        
-        # Create acronym mappings
-        self.acronym_map = self._create_acronym_mappings()
-        
-        # Proficiency level patterns - made more specific and ordered by precedence
-        self.proficiency_patterns = {
-            'expert': r'\b(expert|advanced|extensive|strong|proficient)\b',
-            'intermediate': r'\b(intermediate|moderate|working|good)\b',
-            'beginner': r'\b(basic|beginner|elementary|familiar|exposure)\b'
+    def __init__(self, loaded_model=None, taxonomy: SkillTaxonomy = None):
+        # Tokenizer and model come from the process-wide registry instead of being reloaded per instance,
+        # and only on first use - dictionary and fuzzy matching never touch the model
+        self._loaded_model = loaded_model
+        self._skill_matrix = None
+        self._skill_unit_matrix = None
+        self._skill_embeddings = None
+        self._calibrated_threshold = None
+        self._model_lock = threading.Lock()
+        
+        # Skill table, acronyms, matcher automaton and fuzzy index come precompiled
+        # from the process-wide taxonomy artifact (see skill_taxonomy.py)
+        self.taxonomy = taxonomy or get_skill_taxonomy()
+        self.skills = self.taxonomy.skills
+        self.skill_names = self.taxonomy.skill_names
+        self.acronym_map = self.taxonomy.acronym_map
+        self.dictionary_matches = self.taxonomy.dictionary_matches
+        self.automaton = self.taxonomy.automaton
+        self.fuzzy_index = self.taxonomy.fuzzy_index
+        
+        # Fuzzy results are memoized across documents (and extractors) for this version of the dictionary
+        self.dictionary_version = self.taxonomy.version
+        self.match_cache = get_skill_match_cache()
+        
+        # Proficiency level words - ordered by precedence, matched as whole words
+        self.proficiency_cues = {
+            'expert': ['expert', 'advanced', 'extensive', 'strong', 'proficient'],
+            'intermediate': ['intermediate', 'moderate', 'working', 'good'],
+            'beginner': ['basic', 'beginner', 'elementary', 'familiar', 'exposure']
         }
         
-        # Negation patterns
-        self.negation_patterns = [
-            r'(?:is |are |was |were )?not required\b',
-            r'(?:is |are |was |were )?not necessary\b',
-            r'no need for\b',
-            r'no experience (?:in|with)\b',
-            r"don't need\b",
-            r'(?:is |are |was |were )?optional\b'
+        # Negation phrases (must end on a word boundary)
+        self.negation_cues = [
+            'not required',
+            'not necessary',
+            'no need for',
+            'no experience in',
+            'no experience with',
+            "don't need",
+            'optional'
         ]
         
-        # Context importance words
+        # Context importance words (matched anywhere in the sentence, also inside longer words)
         self.context_importance = {
             'high': set(['required', 'must', 'must-have', 'essential', 'critical', 'key', 'core']),
             'medium': set(['preferred', 'desired', 'important', 'should have', 'good to have', 'strong']),
             'low': set(['plus', 'bonus', 'nice to have', 'optional', 'helpful'])
         }
-
-    def _precompute_skill_embeddings(self) -> Dict[str, torch.Tensor]:
-        """Pre-compute BERT embeddings for all skills in our dictionary"""
-        skill_embeddings = {}
         
-        for skill_lower, skill_info in ALL_SKILLS.items():
-            skill_name = skill_info['name']
-            embedding = self._get_embedding(skill_name)
-            skill_embeddings[skill_name] = embedding
-            
-        return skill_embeddings
+        # All of the above in one scanner, run once per document
+        self.cue_scanner = CueScanner(
+            [Cue(word, level, True, True) for level, words in self.proficiency_cues.items() for word in words] +
+            [Cue(phrase, 'negation', False, True) for phrase in self.negation_cues] +
+            [Cue(term, importance, False, False) for importance, terms in self.context_importance.items() for term in terms]
+        )
+
+    @property
+    def loaded_model(self):
+        if self._loaded_model is None:
+            self._loaded_model = get_model()
+        return self._loaded_model
+
+    @property
+    def model_name(self) -> str:
+        return self.loaded_model.name
+
+    @property
+    def tokenizer(self):
+        return self.loaded_model.tokenizer
+
+    @property
+    def model(self):
+        return self.loaded_model.model
+
+    @property
+    def skill_matrix(self) -> np.ndarray:
+        """Embeddings for all skills (memory-mapped from the on-disk cache when warm)"""
+        if self._skill_matrix is None:
+            with self._model_lock:
+                if self._skill_matrix is None:
+                    self._skill_matrix = load_skill_embeddings(
+                        self.loaded_model.model_id, self.skill_names, self._embed_skill_names,
+                        version=self.dictionary_version)
+        return self._skill_matrix
+
+    @property
+    def skill_unit_matrix(self) -> np.ndarray:
+        """skill_matrix with L2-normalized rows, so cosine similarity is a single matrix multiply"""
+        if self._skill_unit_matrix is None:
+            matrix = np.asarray(self.skill_matrix, dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            self._skill_unit_matrix = matrix / np.maximum(norms, 1e-12)
+        return self._skill_unit_matrix
+
+    @property
+    def skill_embeddings(self) -> Dict[str, np.ndarray]:
+        if self._skill_embeddings is None:
+            self._skill_embeddings = self._precompute_skill_embeddings()
+        return self._skill_embeddings
+
+    def _precompute_skill_embeddings(self) -> Dict[str, np.ndarray]:
+        """Map every skill in our dictionary to its row of the cached embedding matrix"""
+        return {skill_name: self.skill_matrix[i] for i, skill_name in enumerate(self.skill_names)}
+
+    def _embed_skill_names(self, skill_names: List[str]) -> np.ndarray:
+        """Compute BERT embeddings for the skill dictionary in batches (only runs on a cold cache)"""
+        return embed_many(skill_names, loaded=self.loaded_model)
     
-    def _create_acronym_mappings(self) -> Dict[str, str]:
-        """Create mappings between skills and their acronyms"""
-        acronym_map = {}
-        
-        # Common manual mappings
-        manual_mappings = {
-            'amazon web services': 'AWS',
-            'artificial intelligence': 'AI',
-            'machine learning': 'ML',
-            'natural language processing (nlp)': 'NLP',
-            'user interface': 'UI',
-            'user experience': 'UX',
-            'continuous integration': 'CI',
-            'continuous deployment': 'CD',
-            'infrastructure as code': 'IaC'
-        }
-        
-        # Add both directions for manual mappings
-        for full_form, acronym in manual_mappings.items():
-            acronym_map[full_form] = acronym
-            acronym_map[acronym.lower()] = full_form
-            # Also add the skill name as it appears in ALL_SKILLS
-            if full_form in ALL_SKILLS:
-                actual_name = ALL_SKILLS[full_form]['name']
-                acronym_map[acronym.lower()] = actual_name.lower()
-            # Special case for AWS which is in ALL_SKILLS as just "AWS"
-            if acronym == "AWS":
-                acronym_map[acronym.lower()] = acronym
-        
-        # Generate acronyms for multi-word skills
-        for skill_info in ALL_SKILLS.values():
-            name = skill_info['name'].lower()
-            if ' ' in name:
-                words = name.split()
-                acronym = ''.join(word[0].upper() for word in words)
-                if len(acronym) >= 2:  # Only add if acronym is 2+ letters
-                    acronym_map[name] = acronym
-                    acronym_map[acronym.lower()] = name
-        
-        return acronym_map
-
-    def _get_embedding(self, text: str) -> torch.Tensor:
-        """Get BERT embedding for a piece of text"""
-        inputs = self.tokenizer(text, return_tensors="pt", padding=True, truncation=True, max_length=512)
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            embedding = outputs.last_hidden_state[:, 0, :].squeeze()
-        return embedding
+    @property
+    def semantic_threshold(self):
+        """
+        Minimum cosine similarity of a semantic match: SKILL_EXTRACTION_CONFIG['semantic_threshold'],
+        else the one `manage.py calibrate_semantic_threshold` measured for the model (None if never run)
+        """
+        threshold = skill_setting("semantic_threshold")
+        if threshold is None:
+            if self._calibrated_threshold is None:
+                self._calibrated_threshold = load_calibrated_threshold(self.loaded_model.model_id) or False
+            threshold = self._calibrated_threshold or None
+        return threshold
+
+    def _get_embedding(self, text: str):
+        """Get BERT embedding for a piece of text (as a torch tensor)"""
+        import torch
+        return torch.from_numpy(embed_many([text], loaded=self.loaded_model)[0])
 
     def _get_fuzzy_matches(self, text: str, max_distance: int = 2) -> List[Tuple[str, float]]:
         """Find fuzzy matches for a text against our skill dictionary"""
-        matches = []
         text_lower = text.lower()
         
-        # Check exact matches first
-        if text_lower in ALL_SKILLS:
-            matches.append((ALL_SKILLS[text_lower]['name'], 1.0))
-            return matches
-            
-        # Check acronym matches
-        if text_lower in self.acronym_map:
-            full_form = self.acronym_map[text_lower]
-            # Special case for AWS which is directly in ALL_SKILLS
-            if full_form.upper() == "AWS":
-                matches.append(("AWS", 0.95))
-                return matches
-            if full_form in ALL_SKILLS:
-                matches.append((ALL_SKILLS[full_form]['name'], 0.95))
-                return matches
-        
-        # Fuzzy matching using Levenshtein distance
-        for skill_info in ALL_SKILLS.values():
-            name = skill_info['name'].lower()
-            dist = distance(text_lower, name)
-            if dist <= max_distance:
-                confidence = 1.0 - (dist / (max_distance + 1))
-                matches.append((skill_info['name'], confidence))
-        
-        return sorted(matches, key=lambda x: x[1], reverse=True)
-
-    def _detect_skill_level(self, context: str, skill_name: str) -> Tuple[str, float]:
-        """Detect the skill level from the surrounding context for a specific skill"""
-        context_lower = context.lower()
-        skill_lower = skill_name.lower()
-        
-        # Find the skill position in context
-        skill_pos = context_lower.find(skill_lower)
-        if skill_pos == -1:
+        # Check exact and acronym matches first
+        if text_lower in self.dictionary_matches:
+            return [self.dictionary_matches[text_lower]]
+        
+        return self._fuzzy_scan(text_lower, max_distance)
+
+    def _fuzzy_scan(self, text_lower: str, max_distance: int = 2) -> List[Tuple[str, float]]:
+        """Skills within max_distance edits of text_lower, best first (ties in dictionary order)"""
+        key = (self.dictionary_version, text_lower, max_distance)
+        matches = self.match_cache.get(key)
+        if matches is None:
+            # Fuzzy matching using Levenshtein distance, only against the names the index can't rule out
+            neighbours = sorted(self.fuzzy_index.lookup(text_lower, max_distance))
+            matches = tuple((self.skill_names[position], 1.0 - (dist / (max_distance + 1))) for dist, position in neighbours)
+            self.match_cache.put(key, matches)
+        return list(matches)
+
+    def _detect_skill_level(self, doc: DocumentIndex, anchor: Tuple[int, int], context_start: int,
+                            context_end: int) -> Tuple[str, float]:
+        """Detect the skill level from the level cues within 50 characters of the skill mention at anchor"""
+        if anchor is None:
             return 'unspecified', 0.5
         
-        # Look for level indicators near the skill (before and after)
-        before_context = context_lower[:skill_pos]
-        after_context = context_lower[skill_pos + len(skill_lower):]
-        
-        # Check patterns in order of precedence
-        for level, pattern in self.proficiency_patterns.items():
-            # Look for pattern close to the skill mention
-            if re.search(pattern, before_context[-50:]) or re.search(pattern, after_context[:50]):
-                confidence_map = {
-                    'expert': 1.0,
-                    'intermediate': 0.7,
-                    'beginner': 0.4
-                }
-                return level, confidence_map[level]
+        # Look for level indicators near the skill (before and after), inside the context
+        before = (max(context_start, anchor[0] - 50), anchor[0])
+        after = (anchor[1], min(context_end, anchor[1] + 50))
+        
+        # Check levels in order of precedence
+        for level in self.proficiency_cues:
+            if doc.cues.within(level, *before) or doc.cues.within(level, *after):
+                return level, LEVEL_CONFIDENCE[level]
         
         # Default to unspecified with medium confidence
         return 'unspecified', 0.5
 
-    def _check_negation(self, context: str, phrase: str) -> bool:
-        """Check if the skill is mentioned in a negative context"""
-        context_lower = context.lower()
-        phrase_pos = context_lower.find(phrase.lower())
+    def _check_negation(self, doc: DocumentIndex, span: Tuple[int, int], context_start: int,
+                        context_end: int) -> bool:
+        """Check if the phrase at span is mentioned in a negative context"""
+        # Check only the part of the context before the phrase and a few words after
+        return doc.cues.within('negation', context_start, doc.words_end(span[0], context_end, 3))
+
+    def _calculate_context_importance(self, doc: DocumentIndex, anchor: Tuple[int, int], context_start: int,
+                                      context_end: int) -> float:
+        """Calculate importance based on contextual words in the sentence of the skill mention at anchor"""
+        if anchor is None:
+            return 0.5
+        
+        # Look for importance indicators in the same sentence/clause as the skill
+        sentence_start, sentence_end = doc.sentence(*anchor)
+        sentence = (max(context_start, sentence_start), min(context_end, sentence_end))
         
-        if phrase_pos == -1:
-            return False
+        # Check for high importance first, then medium, then low
+        for importance, score in (('high', 1.0), ('medium', 0.7), ('low', 0.4)):
+            if doc.cues.within(importance, *sentence):
+                return score
             
-        # Check only the part before the phrase and a few words after
-        pre_context = context_lower[:phrase_pos].strip()
-        words_after = ' '.join(context_lower[phrase_pos:].split()[:3])
-        check_context = pre_context + ' ' + words_after
+        # Default to medium if no importance indicators found
+        return 0.5
+
+    def _semantic_matches(self, phrases: List[str], top_k: int = None,
+                          threshold: float = None) -> List[Tuple[str, str, float]]:
+        """
+        Score candidate phrases against every skill at once
+
+        All phrases are embedded in one batch and compared with the normalized skill
+        matrix in a single matrix multiply; each phrase keeps at most top_k skills
+        whose cosine similarity reaches the threshold.
+        returns: list of (phrase, skill name, similarity), phrases in input order
+        """
+        if not phrases:
+            return []
+        top_k = top_k or skill_setting("semantic_top_k")
+        threshold = self.semantic_threshold if threshold is None else threshold
+        if threshold is None:
+            # similarities of an uncalibrated model mean nothing; skip the forward pass
+            _warn_uncalibrated(self.loaded_model.model_id)
+            return []
+        
+        vectors = np.asarray(embed_many(phrases, loaded=self.loaded_model), dtype=np.float32)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        scores = vectors @ self.skill_unit_matrix.T  # (phrases, skills)
+        
+        k = min(top_k, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
         
-        return any(re.search(pattern, check_context) for pattern in self.negation_patterns)
+        matches = []
+        for row, col in zip(*np.nonzero(top_scores >= threshold)):
+            matches.append((phrases[row], self.skill_names[top[row, col]], float(top_scores[row, col])))
+        return matches
 
-    def _calculate_context_importance(self, context: str, skill_name: str) -> float:
-        """Calculate importance based on contextual words near the skill"""
-        context_lower = context.lower()
-        skill_lower = skill_name.lower()
+    def _candidate_phrases(self, words: List[str], skip: Set[str], first: int = 0,
+                           last: int = None) -> Dict[str, Tuple[int, int]]:
+        """
+        Distinct phrases of up to max_phrase_length words worth embedding, in document order
+        only phrases starting at words[first:last] are considered
+        returns: phrase -> (first word, number of words) of its first occurrence
+        """
+        max_length = skill_setting("max_phrase_length")
+        cleaned = [word.strip(PHRASE_PUNCTUATION) for word in words]
+        phrases = {}
+        for i in range(first, len(cleaned) if last is None else last):
+            for length in range(1, min(max_length, len(cleaned) - i) + 1):
+                span = cleaned[i:i + length]
+                if not all(span) or span[0] in PHRASE_STOPWORDS or span[-1] in PHRASE_STOPWORDS:
+                    continue
+                phrase = ' '.join(span)
+                if len(phrase) < 3 or phrase.isdigit() or phrase in skip:
+                    continue
+                phrases.setdefault(phrase, (i, length))
+        return phrases
+
+    def _add_match(self, results: Dict[str, Dict], doc: DocumentIndex, span: Tuple[int, int], phrase: str,
+                   skill_name: str, base_confidence: float, context_window: int, anchor: str = None):
+        """Score one phrase -> skill match at its occurrence span and merge it into results"""
+        # Get context around the match
+        start_pos, end_pos = span
+        context_start = max(0, start_pos - context_window)
+        context_end = min(len(doc), end_pos + context_window)
+        context = doc.text[context_start:context_end]
         
-        # Find the skill position in context
-        skill_pos = context_lower.find(skill_lower)
-        if skill_pos == -1:
-            return 0.5
+        # Various confidence factors; level and importance are looked up around the
+        # matched phrase when it is the anchor or spells the skill name, otherwise
+        # around the first mention of the skill name in the context
+        if anchor or ' '.join(doc.lower[start_pos:end_pos].split()) == skill_name.lower():
+            anchor_span = span
+        else:
+            anchor_pos = doc.lower.find(skill_name.lower(), context_start, context_end)
+            anchor_span = (anchor_pos, anchor_pos + len(skill_name)) if anchor_pos != -1 else None
+        skill_level, level_confidence = self._detect_skill_level(doc, anchor_span, context_start, context_end)
+        is_negated = self._check_negation(doc, span, context_start, context_end)
+        context_importance = self._calculate_context_importance(doc, anchor_span, context_start, context_end)
         
-        # Look for importance indicators in the same sentence/clause as the skill
-        # Split by sentence boundaries and find which sentence contains the skill
-        sentences = re.split(r'[.!?]', context_lower)
-        skill_sentence = None
+        # Skip if negated
+        if is_negated:
+            return
         
-        for sentence in sentences:
-            if skill_lower in sentence:
-                skill_sentence = sentence.strip()
-                break
+        # Calculate final confidence score with adjusted weights
+        # For preferred/optional skills, reduce the final confidence
+        if context_importance <= 0.7:  # Medium or low importance
+            base_confidence *= 0.8  # Reduce base confidence for non-required skills
         
-        if not skill_sentence:
-            return 0.5
+        confidence = (
+            base_confidence * 0.5 +    # Base match confidence
+            level_confidence * 0.2 +   # Skill level confidence
+            context_importance * 0.3    # Context importance
+        )
         
-        # Check for high importance first
-        if any(term in skill_sentence for term in self.context_importance['high']):
-            return 1.0
-            
-        # Check for medium importance 
-        if any(term in skill_sentence for term in self.context_importance['medium']):
-            return 0.7
-            
-        # Check for low importance
-        if any(term in skill_sentence for term in self.context_importance['low']):
-            return 0.4
-            
-        # Default to medium if no importance indicators found
-        return 0.5
+        # Get skill info
+        skill_info = self.skills.get(skill_name.lower(), {'name': skill_name, 'category': 'technical', 'subcategory': 'other'}).copy()
+        
+        # Add enhanced information
+        skill_info.update({
+            'confidence': confidence,
+            'skill_level': skill_level,
+            'context': context,
+            'matched_text': phrase,
+            'base_confidence': base_confidence,
+            'context_importance': context_importance,
+            'dictionary_version': self.dictionary_version
+        })
+        
+        # Check for duplicates and keep highest confidence (a better match moves to the end)
+        key = skill_info['name'].lower()
+        existing = results.get(key)
+        if existing:
+            if confidence > existing['confidence']:
+                del results[key]
+                results[key] = skill_info
+        else:
+            results[key] = skill_info
 
-    def extract_skills_with_confidence(self, text: str, context_window: int = 100) -> List[Dict]:
+    def extract_skills_with_confidence(self, text: str, context_window: int = 100,
+                                       semantic: bool = None) -> List[Dict]:
         """
         Main method to extract skills with enhanced confidence scoring
+
+        semantic: also match paraphrased skills by embedding similarity
+                  (defaults to SKILL_EXTRACTION_CONFIG['semantic_matching'])
         """
-        results = []
-        text_lower = text.lower()
+        if semantic is None:
+            semantic = skill_setting("semantic_matching")
+        doc = DocumentIndex(text, self.cue_scanner)
+        return self._extract_from_words(doc, 0, len(doc.words), context_window, semantic)
+
+    def iter_skills_with_confidence(self, text: Union[str, Iterable[str]], context_window: int = 100,
+                                    semantic: bool = None, window_size: int = None) -> Iterator[Dict]:
+        """
+        Streaming version of extract_skills_with_confidence for very large documents
+
+        text is a string or an iterable of text chunks (e.g. an open file), consumed
+        in windows of about window_size characters (SKILL_EXTRACTION_CONFIG['stream_window_chars']);
+        consecutive windows overlap by the context window and the longest phrase, so
+        every occurrence is scored with the same context as in the whole document.
+        Each skill is yielded once, with its best match in the first window where it
+        occurs, as soon as that window is processed.
+        """
+        if semantic is None:
+            semantic = skill_setting("semantic_matching")
+        window_size = window_size or skill_setting("stream_window_chars")
+        chunks = text
+        if isinstance(text, str):
+            chunks = (text[start:start + window_size] for start in range(0, len(text), window_size))
+        
+        seen = set()
+        parts, size = [], 0
+        carried, own_start = '', 0  # overlap kept from the previous window, offset of its first unscored word
+        for chunk in chunks:
+            parts.append(chunk)
+            size += len(chunk)
+            if size < window_size:
+                continue
+            window = carried + ''.join(parts)
+            parts, size = [], 0
+            results, carried, own_start = self._extract_window(window, own_start, context_window, semantic)
+            for skill in results:
+                if skill['name'].lower() not in seen:
+                    seen.add(skill['name'].lower())
+                    yield skill
+        
+        window = carried + ''.join(parts)
+        results, _, _ = self._extract_window(window, own_start, context_window, semantic, final=True)
+        for skill in results:
+            if skill['name'].lower() not in seen:
+                seen.add(skill['name'].lower())
+                yield skill
+
+    def _extract_window(self, window: str, own_start: int, context_window: int, semantic: bool,
+                        final: bool = False) -> Tuple[List[Dict], str, int]:
+        """
+        Score the phrases starting at or after own_start whose context lies entirely in window
+        returns: (results, text to carry into the next window, offset of its first unscored word)
+        """
+        doc = DocumentIndex(window, self.cue_scanner)
+        first = bisect_left(doc.word_starts, own_start)
+        last = len(doc.words)
+        if not final:
+            # a phrase may start no later than max_length words before the last context_window characters
+            max_length = max(4, skill_setting("max_phrase_length"))
+            last = max(first, bisect_left(doc.word_starts, len(window) - context_window) - max_length)
+        results = self._extract_from_words(doc, first, last, context_window, semantic)
+        if final:
+            return results, '', 0
+        
+        # carry the unscored words and the context before them, starting on a word boundary
+        next_start = doc.spans[last][0] if last < len(doc.words) else len(window)
+        carry_start = max(0, next_start - context_window)
+        word = bisect_right(doc.word_starts, carry_start) - 1
+        if word >= 0 and doc.spans[word][1] > carry_start:
+            carry_start = doc.spans[word][0]
+        return results, window[carry_start:], next_start - carry_start
+
+    def extract_skills_batch(self, texts: Sequence[str], context_window: int = 100, semantic: bool = None,
+                             workers: int = None, chunk_size: int = None) -> List[List[Dict]]:
+        """
+        extract_skills_with_confidence for many documents, e.g. when re-analysing every resume
+
+        The dictionary and fuzzy matching of chunk_size documents at a time
+        (SKILL_EXTRACTION_CONFIG['batch_chunk_size']) runs in a pool of workers processes
+        (default: one per CPU, 1 runs everything in this process); the candidate phrases
+        of each chunk are then embedded in one batch here, where the model lives.
+        returns: the skills of every text, in the order of texts
+        """
+        if semantic is None:
+            semantic = skill_setting("semantic_matching")
+        workers = workers or skill_setting("batch_workers") or os.cpu_count() or 1
+        chunk_size = chunk_size or skill_setting("batch_chunk_size")
+        chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+        workers = min(workers, len(chunks))
+        
+        batch = []
+        if workers <= 1:
+            lexical = (self._lexical_batch(chunk, context_window, semantic) for chunk in chunks)
+            for chunk, (results, phrases) in zip(chunks, lexical):
+                batch.extend(self._semantic_batch(chunk, results, phrases, context_window))
+            return batch
+        
+        # workers get this taxonomy, so a hot swap in between cannot mix two versions in one batch
+        with ProcessPoolExecutor(workers, initializer=_init_batch_worker, initargs=(self.taxonomy,)) as pool:
+            lexical = pool.map(_lexical_batch, chunks, [context_window] * len(chunks), [semantic] * len(chunks))
+            for chunk, (results, phrases) in zip(chunks, lexical):
+                batch.extend(self._semantic_batch(chunk, results, phrases, context_window))
+        return batch
+
+    def _lexical_batch(self, texts: Sequence[str], context_window: int,
+                       semantic: bool) -> Tuple[List[Dict[str, Dict]], List[Dict[str, Tuple[int, int]]]]:
+        """
+        Dictionary and fuzzy phase of extract_skills_batch for one chunk
+        returns: (results per text, candidate phrases per text - None without semantic matching)
+        """
+        results, phrases = [], []
+        for text in texts:
+            doc = DocumentIndex(text, self.cue_scanner)
+            matches, lexical_phrases = self._lexical_matches(doc, 0, len(doc.words), context_window)
+            results.append(matches)
+            phrases.append(self._candidate_phrases(doc.words, lexical_phrases) if semantic else None)
+        return results, phrases
+
+    def _semantic_batch(self, texts: Sequence[str], results: List[Dict[str, Dict]],
+                        phrases: List[Dict[str, Tuple[int, int]]], context_window: int) -> List[List[Dict]]:
+        """Semantic phase of extract_skills_batch: the candidate phrases of every text embedded at once"""
+        distinct = list(dict.fromkeys(phrase for candidates in phrases if candidates for phrase in candidates))
+        matches = defaultdict(list)  # phrase -> [(skill name, similarity)], best first
+        for phrase, skill_name, similarity in self._semantic_matches(distinct):
+            matches[phrase].append((skill_name, similarity))
+        
+        batch = []
+        for text, text_results, candidates in zip(texts, results, phrases):
+            hits = [(phrase, match) for phrase in candidates or () for match in matches.get(phrase, ())]
+            if hits:
+                doc = DocumentIndex(text, self.cue_scanner)
+                for phrase, (skill_name, similarity) in hits:
+                    span = doc.phrase_span(*candidates[phrase], strip=PHRASE_PUNCTUATION)
+                    self._add_match(text_results, doc, span, phrase, skill_name, similarity, context_window,
+                                    anchor=phrase)
+            batch.append(list(text_results.values()))
+        return batch
+
+    def _extract_from_words(self, doc: DocumentIndex, first: int, last: int, context_window: int,
+                            semantic: bool) -> List[Dict]:
+        """Skills matched by the phrases starting at doc.words[first:last], best match per skill"""
+        results, lexical_phrases = self._lexical_matches(doc, first, last, context_window)
+        
+        # Second pass: semantic matching of the phrases the dictionary did not recognise
+        if semantic:
+            phrases = self._candidate_phrases(doc.words, lexical_phrases, first, last)
+            for phrase, skill_name, similarity in self._semantic_matches(list(phrases)):
+                span = doc.phrase_span(*phrases[phrase], strip=PHRASE_PUNCTUATION)
+                self._add_match(results, doc, span, phrase, skill_name, similarity, context_window, anchor=phrase)
+        
+        return list(results.values())
+
+    def _lexical_matches(self, doc: DocumentIndex, first: int, last: int,
+                         context_window: int) -> Tuple[Dict[str, Dict], Set[str]]:
+        """
+        Exact, acronym and fuzzy matches of the phrases starting at doc.words[first:last]
+        returns: (lowercased skill name -> best match, phrases that matched)
+        """
+        results = {}  # lowercased skill name -> best match, in order of insertion
+        lexical_phrases = set()
         
         # First pass: Exact and fuzzy matching
-        words = text_lower.split()
-        for i in range(len(words)):
+        words = doc.words
+        # every exact/acronym phrase of the text in one pass, keyed by (first word, length)
+        exact_hits = {(hit.word, hit.n_words): hit.value for hit in self.automaton.iter_hits(words)}
+        for i in range(first, last):
             # Check phrases of different lengths
             for length in range(1, min(5, len(words) - i + 1)):
                 phrase = ' '.join(words[i:i+length])
                 
-                # Get fuzzy matches for the phrase
-                fuzzy_matches = self._get_fuzzy_matches(phrase)
+                # Dictionary hit, otherwise fuzzy matches for the phrase
+                exact = exact_hits.get((i, length))
+                fuzzy_matches = [exact] if exact else self._fuzzy_scan(phrase)
+                if fuzzy_matches:
+                    lexical_phrases.add(phrase.strip(PHRASE_PUNCTUATION))
                 
                 for skill_name, base_confidence in fuzzy_matches:
-                    # Get context around the match
-                    start_pos = text_lower.find(phrase)
-                    if start_pos != -1:
-                        context_start = max(0, start_pos - context_window)
-                        context_end = min(len(text), start_pos + len(phrase) + context_window)
-                        context = text[context_start:context_end]
-                        
-                        # Various confidence factors
-                        skill_level, level_confidence = self._detect_skill_level(context, skill_name)
-                        is_negated = self._check_negation(context, phrase)
-                        context_importance = self._calculate_context_importance(context, skill_name)
-                        
-                        # Skip if negated
-                        if is_negated:
-                            continue
-                        
-                        # Calculate final confidence score with adjusted weights
-                        # For preferred/optional skills, reduce the final confidence
-                        if context_importance <= 0.7:  # Medium or low importance
-                            base_confidence *= 0.8  # Reduce base confidence for non-required skills
-                        
-                        confidence = (
-                            base_confidence * 0.5 +    # Base match confidence
-                            level_confidence * 0.2 +   # Skill level confidence
-                            context_importance * 0.3    # Context importance
-                        )
-                        
-                        # Get skill info
-                        skill_info = ALL_SKILLS.get(skill_name.lower(), {'name': skill_name, 'category': 'technical', 'subcategory': 'other'}).copy()
-                        
-                        # Add enhanced information
-                        skill_info.update({
-                            'confidence': confidence,
-                            'skill_level': skill_level,
-                            'context': context,
-                            'matched_text': phrase,
-                            'base_confidence': base_confidence,
-                            'context_importance': context_importance
-                        })
-                        
-                        # Check for duplicates and keep highest confidence
-                        existing = next((r for r in results if r['name'].lower() == skill_name.lower()), None)
-                        if existing:
-                            if confidence > existing['confidence']:
-                                results.remove(existing)
-                                results.append(skill_info)
-                        else:
-                            results.append(skill_info)
-        
-        return results 
\ No newline at end of file
+                    self._add_match(results, doc, doc.phrase_span(i, length), phrase, skill_name,
+                                    base_confidence, context_window)
+        
+        return results, lexical_phrases
+
+
+_warned_uncalibrated = set()
+
+
+def _warn_uncalibrated(model_id: str):
+    if model_id not in _warned_uncalibrated:
+        _warned_uncalibrated.add(model_id)
+        print(f"Semantic skill matching skipped: no semantic_threshold configured or calibrated for {model_id} "
+              f"(run `manage.py calibrate_semantic_threshold`)")
+
+
+# extractor of a process in the extract_skills_batch pool (dictionary and fuzzy matching only)
+_batch_extractor = None
+
+
+def _init_batch_worker(taxonomy: SkillTaxonomy):
+    global _batch_extractor
+    _batch_extractor = EnhancedSkillExtractor(taxonomy=taxonomy)
+
+
+def _lexical_batch(texts: Sequence[str], context_window: int, semantic: bool):
+    return _batch_extractor._lexical_batch(texts, context_window, semantic) 
\ No newline at end of file
@@ -1,5 +1,10 @@
 import re
-from resume_screening.utils.skills_dictionaries import ALL_SKILLS
+from resume_screening.utils.model_registry import get_skill_taxonomy
+
+
+def skill_automaton():
+    """Automaton over every skill phrase of the dictionary, from the shared taxonomy artifact"""
+    return get_skill_taxonomy().phrase_automaton
 
 
 def extract_skills_from_text(text):
@@ -14,31 +19,15 @@ def extract_skills_from_text(text):
     text_lower = text.lower()
     text_lower = re.sub(r'[^\w\s+#\./-]', ' ', text_lower)
     
-    words = text_lower.split()
-    phrases = []
-    
-    # add singular words
-    phrases.extend(words)
-    
-    # add 2-word phrases
-    for i in range(len(words) - 1):
-        phrases.append(words[i] + ' ' + words[i + 1]) #we subtract 1 because we're going to use both the current index (i) and the next index (i+1) in each iteration
-    
-    # add 3-word phrases
-    for i in range(len(words) - 2):
-        phrases.append(words[i] + ' ' + words[i + 1] + ' ' + words[i + 2])
-    
-    # add 4-word phrases
-    for i in range(len(words) - 3):
-        phrases.append(words[i] + ' ' + words[i + 1] + ' ' + words[i + 2] + ' ' + words[i + 3])
+    # every 1-4 word dictionary phrase in one pass over the words
+    hits = skill_automaton().find(text_lower)
     
     found_skills = {} #we use a dictionary instead of a list to ensure we don't add duplicate skills.
-    for phrase in phrases:
-        skill_info = ALL_SKILLS.get(phrase)
-        if skill_info:
-            skill_name = skill_info['name']
-            if skill_name not in found_skills:
-                found_skills[skill_name] = skill_info
+    # single words first, then 2-word phrases and so on, each in text order
+    for hit in sorted(hits, key=lambda hit: (hit.n_words, hit.word)):
+        skill_name = hit.value['name']
+        if skill_name not in found_skills:
+            found_skills[skill_name] = hit.value
     
     # convert to list for return
     return list(found_skills.values())
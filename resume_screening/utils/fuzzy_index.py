@@ -0,0 +1,56 @@
+from typing import Iterable, List, Tuple
+from Levenshtein import distance
+
+# Levenshtein neighbourhood lookups without comparing the query to every key
+# keys are bucketed by length (two strings are at least |len(a) - len(b)| edits
+# apart, so a query only visits buckets within max_distance of its length) and
+# every bucket is a BK-tree: a child hangs under its parent at their exact
+# distance, and the triangle inequality prunes every subtree whose edge is more
+# than max_distance away from the query's distance to the parent
+
+
+class FuzzyIndex:
+    """Strings with attached values, searchable by edit distance"""
+
+    def __init__(self, items: Iterable[Tuple[str, object]] = ()):
+        self._buckets = {}  # length -> root node [key, values, {distance: child node}]
+        self._size = 0
+        for key, value in items:
+            self.add(key, value)
+
+    def __len__(self):
+        return self._size
+
+    def add(self, key: str, value: object):
+        self._size += 1
+        node = self._buckets.get(len(key))
+        if node is None:
+            self._buckets[len(key)] = [key, [value], {}]
+            return
+        while True:
+            dist = distance(key, node[0])
+            if dist == 0:
+                node[1].append(value)
+                return
+            child = node[2].get(dist)
+            if child is None:
+                node[2][dist] = [key, [value], {}]
+                return
+            node = child
+
+    def lookup(self, query: str, max_distance: int = 2) -> List[Tuple[int, object]]:
+        """(distance, value) of every key within max_distance edits of query, in no particular order"""
+        found = []
+        for length in range(max(0, len(query) - max_distance), len(query) + max_distance + 1):
+            root = self._buckets.get(length)
+            if root is None:
+                continue
+            stack = [root]
+            while stack:
+                key, values, children = stack.pop()
+                dist = distance(query, key)
+                if dist <= max_distance:
+                    found.extend((dist, value) for value in values)
+                low, high = dist - max_distance, dist + max_distance
+                stack.extend(child for edge, child in children.items() if low <= edge <= high)
+        return found
@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+
+# modules that must only be imported once a request actually needs the encoder
+HEAVY_MODULES = ('torch', 'transformers', 'onnxruntime')
+
+# what every Django process (runserver, gunicorn worker, migrate, shell) imports on boot
+STARTUP_IMPORTS = ('resume_screening.models', 'resume_screening.views', 'resume_screening.urls')
+
+
+def parse_importtime(stderr):
+    """
+    Parse the output of python -X importtime
+
+    returns: dict module -> (self_us, cumulative_us), top-level packages included
+    """
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        timings[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return timings
+
+
+def profile_startup(modules=STARTUP_IMPORTS, settings_module=None):
+    """
+    Import Django and the given modules in a fresh interpreter under -X importtime
+
+    returns: (timings dict as returned by parse_importtime, total wall time in microseconds)
+    """
+    code = (
+        "import django\n"
+        "django.setup()\n"
+        + "".join(f"import {module}\n" for module in modules)
+    )
+    env = dict(os.environ)
+    if settings_module:
+        env['DJANGO_SETTINGS_MODULE'] = settings_module
+    env.setdefault('DJANGO_SETTINGS_MODULE', 'resume_screener.settings')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, env=env,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'import failed')
+    timings = parse_importtime(result.stderr)
+    return timings, sum(self_us for self_us, _ in timings.values())
+
+
+def heavy_imports(timings):
+    """Heavy packages (see HEAVY_MODULES) that were imported, with their cumulative time"""
+    return {name: timings[name][1] for name in HEAVY_MODULES if name in timings}
@@ -0,0 +1,189 @@
+import gc
+import os
+import signal
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from .config import inference_authkey, nlp_setting
+
+# inference worker pool
+# `manage.py run_inference_pool` loads the encoder once, then forks N workers
+# that share the weights copy-on-write and answer embedding requests on a
+# local unix socket. Web workers configured with NLP_MODEL_CONFIG["inference_address"]
+# get a RemoteModel from the registry and never load the weights themselves,
+# so memory grows with the number of inference workers, not web workers
+# onnxruntime sessions are not fork-safe: with the onnx backend every worker opens
+# its own session on the exported graph after the fork (only the torch backend
+# shares its weights)
+
+# seconds a worker waits for the request of a connection it accepted
+REQUEST_TIMEOUT = 10
+
+
+class InferenceClient:
+    """Sends embedding requests to the pool, one short-lived connection per call"""
+
+    def __init__(self, address, authkey=None, timeout=None):
+        self.address = address
+        self.authkey = authkey or inference_authkey()
+        self.timeout = timeout or nlp_setting("inference_timeout")
+        self._info = None
+        self._info_lock = threading.Lock()
+
+    def _call(self, operation, *args):
+        with Client(self.address, family='AF_UNIX', authkey=self.authkey) as conn:
+            conn.send((operation, args))
+            # a worker stuck on a request must not hang its callers forever
+            if not conn.poll(self.timeout):
+                raise TimeoutError(f"Inference worker did not answer {operation} within {self.timeout}s")
+            status, payload = conn.recv()
+        if status != 'ok':
+            raise RuntimeError(f"Inference worker failed on {operation}: {payload}")
+        return payload
+
+    def info(self):
+        if self._info is None:
+            with self._info_lock:
+                if self._info is None:
+                    self._info = self._call('info')
+        return self._info
+
+    def embed_many(self, texts, batch_size=32):
+        return self._call('embed_many', list(texts), batch_size)
+
+    def embed_documents(self, texts, window, overlap, max_tokens_per_batch):
+        return self._call('embed_documents', list(texts), window, overlap, max_tokens_per_batch)
+
+
+class RemoteModel:
+    """
+    Stands in for LoadedModel when inference runs in the worker pool
+    the pool decides which model and quantization it serves; model_id and
+    hidden_size are read from it on first use
+    """
+    tokenizer = None
+    model = None
+    encoder = None
+
+    def __init__(self, name, quantization, client):
+        self.name = name
+        self.quantization = quantization
+        self.remote = client
+
+    @property
+    def model_id(self):
+        return self.remote.info()['model_id']
+
+    @property
+    def hidden_size(self):
+        return self.remote.info()['hidden_size']
+
+
+def _handle(loaded, operation, args):
+    from .bert_utils import _embed_documents, _embed_many
+    if operation == 'info':
+        return {'model_id': loaded.model_id, 'hidden_size': loaded.hidden_size}
+    if operation == 'embed_many':
+        texts, batch_size = args
+        return _embed_many(texts, batch_size, loaded)
+    if operation == 'embed_documents':
+        texts, window, overlap, max_tokens_per_batch = args
+        return _embed_documents(texts, window, overlap, max_tokens_per_batch, loaded)
+    raise ValueError(f"Unknown operation: {operation}")
+
+
+def _worker_loop(listener, loaded, threads, onnx_path=None):
+    import torch
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the parent handles ctrl-c and stops us
+    torch.set_num_threads(threads)
+    if onnx_path is not None:
+        from .encoders import OnnxEncoder
+        loaded.encoder = OnnxEncoder(onnx_path, threads=threads)
+    while True:
+        try:
+            conn = listener.accept()
+        except (OSError, EOFError, AuthenticationError):
+            continue
+        with conn:
+            try:
+                if not conn.poll(REQUEST_TIMEOUT):
+                    continue
+                operation, args = conn.recv()
+            except (OSError, EOFError):
+                continue
+            try:
+                conn.send(('ok', _handle(loaded, operation, args)))
+            except Exception as e:
+                try:
+                    conn.send(('error', repr(e)))
+                except OSError:
+                    pass
+
+
+def serve(address, workers=2, threads_per_worker=1, authkey=None, model_name=None, log=print):
+    """Load the model, fork the workers and supervise them until SIGTERM/SIGINT"""
+    import torch
+    from .bert_utils import _embed_many
+    from .model_registry import get_model
+
+    # keep the parent single-threaded so no intra-op thread pool exists at fork time
+    torch.set_num_threads(1)
+    loaded = get_model(model_name, remote=None)
+    _embed_many(['warm up'], 1, loaded)  # allocate lazily created state before forking
+    onnx_path = None
+    if loaded.encoder.name == 'onnx':
+        # close the parent's session (and its thread pool); each worker opens its own
+        onnx_path = loaded.encoder.onnx_path
+        loaded.encoder = None
+
+    if os.path.exists(address):
+        os.unlink(address)
+    listener = Listener(address, family='AF_UNIX', authkey=authkey or inference_authkey())
+
+    # move everything allocated so far out of the collector's reach, so gc passes
+    # in the children do not write to (and thereby copy) the shared pages
+    gc.collect()
+    gc.freeze()
+
+    children = set()
+    stopping = False
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            try:
+                _worker_loop(listener, loaded, threads_per_worker, onnx_path)
+            finally:
+                os._exit(0)
+        children.add(pid)
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        spawn()
+    log(f"Serving {loaded.model_id} on {address} with {workers} workers")
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if not stopping:
+            log(f"Inference worker {pid} exited with status {status}, restarting")
+            spawn()
+
+    listener.close()
+    if os.path.exists(address):
+        os.unlink(address)
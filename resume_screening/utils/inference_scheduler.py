@@ -0,0 +1,103 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class _Request:
+    __slots__ = ('items', 'future')
+
+    def __init__(self, items):
+        self.items = items
+        self.future = Future()
+
+
+class InferenceScheduler:
+    """
+    Coalesces concurrent inference requests into shared batches
+
+    Request threads call submit() with their own list of items and block on
+    the returned future. A single worker thread waits up to max_wait_ms after
+    the first pending request for more to arrive (or until max_batch_size items
+    are queued), runs run_batch once over everything, and hands each caller
+    its slice of the results. Under load one padded forward pass serves many
+    requests instead of each thread running its own batch of one.
+    """
+
+    def __init__(self, run_batch, max_batch_size=64, max_wait_ms=5.0, name='inference-scheduler'):
+        self.run_batch = run_batch  # list of items -> sequence of results in the same order
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+        self._queue = queue.Queue()
+        self._carry = None  # request that did not fit into the previous batch
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, items) -> Future:
+        request = _Request(list(items))
+        if not request.items:
+            request.future.set_result([])
+            return request.future
+        self._ensure_worker()
+        self._queue.put(request)
+        return request.future
+
+    def run(self, items):
+        """Submit and wait for the results"""
+        return self.submit(items).result()
+
+    def _ensure_worker(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._worker, name=self.name, daemon=True)
+                    self._thread.start()
+
+    def _collect(self):
+        first = self._carry or self._queue.get()
+        self._carry = None
+        pending = [first]
+        count = len(first.items)
+        deadline = time.monotonic() + self.max_wait
+        while count < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if count + len(request.items) > self.max_batch_size:
+                self._carry = request  # starts the next batch
+                break
+            pending.append(request)
+            count += len(request.items)
+        return pending
+
+    def _worker(self):
+        while True:
+            pending = self._collect()
+            items = [item for request in pending for item in request.items]
+            try:
+                results = self.run_batch(items)
+            except Exception as e:
+                for request in pending:
+                    request.future.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(items)
+            offset = 0
+            for request in pending:
+                request.future.set_result(results[offset:offset + len(request.items)])
+                offset += len(request.items)
+
+    def stats(self):
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'mean_batch_size': self.items / self.batches if self.batches else 0.0,
+            'queued': self._queue.qsize(),
+        }
@@ -0,0 +1,167 @@
+import threading
+from .config import nlp_setting, skill_setting, cache_dir
+from .encoders import create_encoder
+
+# one registry per process: every model is loaded at most once and shared
+# between bert_utils, EnhancedSkillExtractor and JobRequirementsAnalyzer
+# torch/transformers are imported on the first get_model() call, not at import
+# time, so migrate/shell/admin and worker boot never pay for them
+_lock = threading.RLock()
+_models = {}
+_shared = {}
+
+
+class LoadedModel:
+    """Tokenizer/model pair shared by every caller in the process"""
+
+    def __init__(self, name, tokenizer, model, encoder, quantization=None):
+        self.name = name
+        self.tokenizer = tokenizer
+        self.model = model
+        self.encoder = encoder  # backend used for embedding forward passes
+        self.backend = encoder.name
+        self.quantization = quantization
+        self.remote = None  # set on RemoteModel, which forwards inference to the worker pool
+        # fast (rust) tokenizers raise "Already borrowed" when two threads call them
+        # with different padding/truncation settings, so tokenization is serialized
+        self._tokenizer_lock = threading.Lock()
+
+    def tokenize(self, texts, **kwargs):
+        with self._tokenizer_lock:
+            return self.tokenizer(texts, **kwargs)
+
+    @property
+    def hidden_size(self):
+        return self.model.config.hidden_size
+
+    @property
+    def model_id(self):
+        """
+        Identifies the vectors this model produces: quantized models and other backends
+        drift from torch fp32 (torch ids carry no backend, so stored vectors stay valid)
+        """
+        variant = '-'.join(part for part in (self.backend if self.backend != 'torch' else None, self.quantization) if part)
+        return f"{self.name}#{variant}" if variant else self.name
+
+
+def default_model_name():
+    return nlp_setting("encoder_model")
+
+
+_DEFAULT = object()
+
+
+def get_model(model_name=None, quantization=_DEFAULT, remote=_DEFAULT) -> LoadedModel:
+    """
+    Return the shared model for model_name, loading it on first use
+    quantization defaults to NLP_MODEL_CONFIG["quantization"]; fp32 and int8
+    variants of the same model are separate registry entries
+    remote defaults to NLP_MODEL_CONFIG["inference_address"]; when set, a
+    RemoteModel is returned and no weights are loaded in this process
+    (pass remote=None to force a local model, e.g. inside the pool itself)
+    """
+    model_name = model_name or default_model_name()
+    if quantization is _DEFAULT:
+        quantization = nlp_setting("quantization")
+    if remote is _DEFAULT:
+        remote = nlp_setting("inference_address")
+    key = (model_name, quantization, remote)
+    loaded = _models.get(key)
+    if loaded is None:
+        with _lock:
+            loaded = _models.get(key)
+            if loaded is None and remote:
+                from .inference_pool import InferenceClient, RemoteModel
+                loaded = RemoteModel(model_name, quantization, InferenceClient(remote))
+                _models[key] = loaded
+            elif loaded is None:
+                from transformers import AutoModel, AutoTokenizer
+                tokenizer = AutoTokenizer.from_pretrained(model_name)
+                model = AutoModel.from_pretrained(model_name)
+                model.eval()  # inference only, disables dropout
+                encoder = create_encoder(model_name, model, quantization=quantization)
+                loaded = LoadedModel(model_name, tokenizer, model, encoder, quantization)
+                _models[key] = loaded
+    return loaded
+
+
+def _get_shared(key, factory):
+    instance = _shared.get(key)
+    if instance is None:
+        with _lock:
+            instance = _shared.get(key)
+            if instance is None:
+                instance = factory()
+                _shared[key] = instance
+    return instance
+
+
+def _get_versioned(key, version, factory):
+    # like _get_shared, but the instance is replaced when version changes
+    entry = _shared.get(key)
+    if entry is None or entry[0] != version:
+        with _lock:
+            entry = _shared.get(key)
+            if entry is None or entry[0] != version:
+                entry = (version, factory())
+                _shared[key] = entry
+    return entry[1]
+
+
+def get_skill_extractor():
+    """Process-wide EnhancedSkillExtractor for the current skill taxonomy (skill embeddings are computed once)"""
+    from .enhanced_skill_extraction import EnhancedSkillExtractor
+    taxonomy = get_skill_taxonomy()
+    return _get_versioned("skill_extractor", taxonomy.version, lambda: EnhancedSkillExtractor(taxonomy=taxonomy))
+
+
+def get_skill_taxonomy():
+    """
+    Process-wide compiled skill taxonomy (skill dictionaries plus Skill/SkillAlias rows)
+    swapped for a rebuilt one in the background when the database version moves
+    """
+    from .taxonomy_watcher import TaxonomyWatcher
+    return _get_shared("taxonomy_watcher", TaxonomyWatcher).current()
+
+
+def get_skill_match_cache():
+    """Process-wide memo of fuzzy phrase -> skill matches, keyed by dictionary version"""
+    from .lru_cache import LRUCache
+    return _get_shared("skill_match_cache", lambda: LRUCache(maxsize=skill_setting("match_cache_size")))
+
+
+def get_job_analyzer():
+    """Process-wide JobRequirementsAnalyzer built on the shared skill extractor"""
+    from .analyze_job_requirements import JobRequirementsAnalyzer
+    extractor = get_skill_extractor()
+    return _get_versioned("job_analyzer", extractor.dictionary_version, lambda: JobRequirementsAnalyzer(extractor))
+
+
+def get_embedding_cache():
+    """Process-wide content-hash cache of document embeddings"""
+    from .embedding_cache import EmbeddingCache
+    return _get_shared("embedding_cache", EmbeddingCache)
+
+
+def get_resume_index_store():
+    """Process-wide handle on the persisted resume similarity index (see resume_index.py)"""
+    from .vector_index import IndexStore
+    return _get_shared("resume_index", lambda: IndexStore(cache_dir() / "resume_index"))
+
+
+def get_scheduler(kind, loaded, run_batch):
+    """Process-wide micro-batching scheduler for one kind of inference call on one model"""
+    from .inference_scheduler import InferenceScheduler
+    return _get_shared(("scheduler", kind, loaded.model_id), lambda: InferenceScheduler(
+        run_batch,
+        max_batch_size=nlp_setting("batch_max_size"),
+        max_wait_ms=nlp_setting("batch_max_wait_ms"),
+        name=f"inference-{kind}",
+    ))
+
+
+def clear():
+    """Drop every loaded model and shared instance (used by tests and reloads)"""
+    with _lock:
+        _models.clear()
+        _shared.clear()
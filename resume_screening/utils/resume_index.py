@@ -0,0 +1,130 @@
+import threading
+import numpy as np
+from django.db import transaction
+from .config import nlp_setting
+from .model_registry import get_embedding_cache, get_resume_index_store
+from .vector_codec import unpack
+from .vector_index import IVFIndex
+
+# approximate nearest-neighbour search over Resume embeddings, see vector_index.py
+# the index lives in <cache_dir>/resume_index and is memory-mapped by every worker;
+# saved and deleted resumes are logged against it (after the transaction commits)
+# and folded in by a background compaction once index_compact_ops have piled up
+
+_compaction = None
+_compaction_lock = threading.Lock()
+
+
+def iter_resume_vectors(model_id, chunk_size=2000):
+    """
+    Stored resume embeddings produced by model_id, in chunks of (ids, float32 matrix)
+    rows converted from the old JSON column carry no model id (and were pooled
+    differently) so they are left out until `manage.py reindex_embeddings` recomputes them
+    """
+    from ..models import Resume
+    rows = (
+        Resume.objects.filter(embedding__isnull=False, embedding_model=model_id)
+        .values_list('pk', 'embedding', 'embedding_dtype', 'embedding_dim')
+        .order_by('pk')
+    )
+    ids, vectors = [], []
+    for pk, data, dtype, dim in rows.iterator(chunk_size=chunk_size):
+        ids.append(pk)
+        vectors.append(unpack(data, dtype, dim))
+        if len(ids) >= chunk_size:
+            yield np.array(ids, dtype=np.int64), np.stack(vectors).astype(np.float32, copy=False)
+            ids, vectors = [], []
+    if ids:
+        yield np.array(ids, dtype=np.int64), np.stack(vectors).astype(np.float32, copy=False)
+
+
+def build_resume_index(model_id=None, nlist=None, iterations=10, chunk_size=2000):
+    """Build the index from every stored resume embedding and publish it; returns the manifest"""
+    model_id = model_id or get_embedding_cache().model_id()
+    store = get_resume_index_store()
+    # changes logged while the rows are read are replayed on top of the new generation
+    position = store.log_position()
+    chunks = list(iter_resume_vectors(model_id, chunk_size))
+    if not chunks:
+        raise ValueError(f"No resume embeddings stored for {model_id}, run `manage.py reindex_embeddings` first")
+    ids = np.concatenate([chunk_ids for chunk_ids, _ in chunks])
+    vectors = np.concatenate([chunk_vectors for _, chunk_vectors in chunks])
+    index = IVFIndex.build(ids, vectors, nlist=nlist or nlp_setting("index_nlist"),
+                           iterations=iterations, meta={'model_id': model_id},
+                           sketch_dims=nlp_setting("index_sketch_dims"))
+    return store.publish(index, replay_from=position)
+
+
+def index_resumes(resumes):
+    """Log the current embeddings of saved resumes once the surrounding transaction commits"""
+    upserts = [
+        (resume.pk, resume.embedding_vector, resume.embedding_model)
+        for resume in resumes if resume.pk and resume.embedding is not None
+    ]
+    if upserts:
+        transaction.on_commit(lambda: _log_changes(upserts=upserts))
+
+
+def unindex_resumes(resume_ids):
+    """Tombstone deleted resumes once the surrounding transaction commits"""
+    resume_ids = [resume_id for resume_id in resume_ids if resume_id is not None]
+    if resume_ids:
+        transaction.on_commit(lambda: _log_changes(deletes=resume_ids))
+
+
+def _log_changes(upserts=(), deletes=()):
+    store = get_resume_index_store()
+    manifest = store.manifest()
+    if manifest is None:
+        return  # nothing to maintain until build_resume_index has run once
+    # vectors of another encoder (or dimension) cannot be compared with the indexed ones
+    upserts = [
+        (resume_id, vector) for resume_id, vector, model_id in upserts
+        if model_id == manifest.get('model_id') and len(vector) == manifest['dim']
+    ]
+    try:
+        pending = store.append(upserts, deletes)
+    except OSError as e:
+        print(f"Resume index update failed: {e}")
+        return
+    if pending and pending >= nlp_setting("index_compact_ops"):
+        compact_in_background()
+
+
+def compact_in_background():
+    """Fold the operation log into a new index generation on a daemon thread"""
+    global _compaction
+    with _compaction_lock:
+        if _compaction is not None and _compaction.is_alive():
+            return _compaction
+        _compaction = threading.Thread(target=_compact, name="resume-index-compaction", daemon=True)
+        _compaction.start()
+        return _compaction
+
+
+def _compact():
+    try:
+        # returns None straight away when another process is already compacting
+        get_resume_index_store().compact()
+    except (OSError, ValueError) as e:
+        print(f"Resume index compaction failed: {e}")
+
+
+def similar_resumes(vector, k=10, nprobe=None, method=None, model_id=None):
+    """
+    Top-k resumes for an embedding, as (resume id, cosine similarity) pairs
+    method: "ivf" (probe the closest lists) or "sketch" (two-stage scan of every resume),
+    defaults to NLP_MODEL_CONFIG["index_method"]
+    model_id: encoder that produced vector, checked against the indexed one when given
+    raises LookupError when no index has been built yet, or only for another model
+    """
+    index = get_resume_index_store().load()
+    if index is None:
+        raise LookupError("No resume index has been built yet, run `manage.py build_resume_index`")
+    if model_id is not None and model_id != index.meta.get('model_id'):
+        raise LookupError(f"The resume index holds {index.meta.get('model_id')} embeddings, not "
+                          f"{model_id or 'unlabelled (pre-migration)'} ones; run `manage.py reindex_embeddings` "
+                          f"and `manage.py build_resume_index`")
+    return index.search(vector, k, nprobe or nlp_setting("index_nprobe"),
+                        method=method or nlp_setting("index_method"),
+                        shortlist=nlp_setting("index_shortlist"))
@@ -0,0 +1,100 @@
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from .config import cache_dir
+
+# cosine similarities between encoder vectors depend on the model, its pooling
+# and its quantization, so the semantic threshold is measured per model: known
+# paraphrases of skills (positives) and phrases that name no skill (negatives)
+# are scored like candidate phrases, and the lowest threshold whose precision
+# reaches the target is stored next to the skill embeddings for that model
+
+# phrase -> skill it paraphrases; kept only when the skill is in the taxonomy
+PARAPHRASES = {
+    'container orchestration platform': 'Kubernetes',
+    'container orchestration': 'Kubernetes',
+    'statistical learning': 'Machine Learning',
+    'predictive modelling': 'Machine Learning',
+    'relational database design': 'SQL',
+    'structured query language': 'SQL',
+    'version control': 'Git',
+    'source control management': 'Git',
+    'amazon cloud': 'AWS',
+    'google cloud': 'GCP',
+    'frontend component library': 'React',
+    'infrastructure provisioning': 'Terraform',
+    'containerization': 'Docker',
+    'managing a team': 'Team management',
+    'giving talks': 'Public speaking',
+    'working with others': 'Teamwork',
+}
+
+# phrases of resumes and job posts that must not match any skill
+NON_SKILLS = [
+    'weekend hiking', 'annual revenue', 'office location', 'travel required', 'full time position',
+    'competitive salary', 'health insurance', 'years of experience', 'bachelor degree', 'our mission',
+    'fast paced environment', 'equal opportunity employer', 'remote friendly', 'company culture',
+    'parental leave', 'free lunch', 'job title', 'start date', 'references available', 'hobbies include',
+]
+
+
+def top_matches(vectors: np.ndarray, skill_unit_matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(index of the most similar skill, its cosine similarity) for every row of vectors"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    scores = vectors @ skill_unit_matrix.T
+    best = scores.argmax(axis=1)
+    return best, scores[np.arange(len(best)), best]
+
+
+def measure_thresholds(positive_hits: Sequence[Tuple[bool, float]], negative_scores: Sequence[float],
+                       thresholds: Sequence[float]) -> List[Dict]:
+    """
+    Precision and recall of the semantic stage at every threshold
+    positive_hits: (top skill is the paraphrased one, its similarity) per positive
+    negative_scores: top similarity per negative; any match above the threshold is wrong
+    """
+    rows = []
+    for threshold in thresholds:
+        correct = sum(1 for right, score in positive_hits if right and score >= threshold)
+        wrong = sum(1 for right, score in positive_hits if not right and score >= threshold)
+        wrong += sum(1 for score in negative_scores if score >= threshold)
+        rows.append({
+            'threshold': round(float(threshold), 4),
+            'precision': correct / (correct + wrong) if correct + wrong else 1.0,
+            'recall': correct / len(positive_hits) if positive_hits else 0.0,
+        })
+    return rows
+
+
+def pick_threshold(rows: List[Dict], min_precision: float) -> Optional[Dict]:
+    """Lowest threshold that still finds something at min_precision, None if there is none"""
+    for row in sorted(rows, key=lambda row: row['threshold']):
+        if row['recall'] > 0 and row['precision'] >= min_precision:
+            return row
+    return None
+
+
+def calibration_path(model_id: str, directory: Path = None) -> Path:
+    directory = Path(directory) if directory else cache_dir()
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', model_id).strip('-')[-64:]
+    return directory / f"semantic_threshold-{slug}.json"
+
+
+def save_calibration(model_id: str, calibration: Dict, directory: Path = None) -> Path:
+    path = calibration_path(model_id, directory)
+    path.write_text(json.dumps(dict(calibration, model_id=model_id), indent=2))
+    return path
+
+
+def load_calibrated_threshold(model_id: str, directory: Path = None) -> Optional[float]:
+    """Threshold measured by `manage.py calibrate_semantic_threshold` for model_id, None if never run"""
+    try:
+        calibration = json.loads(calibration_path(model_id, directory).read_text())
+    except (OSError, ValueError):
+        return None
+    if calibration.get('model_id') != model_id:
+        return None
+    return calibration.get('threshold')
@@ -0,0 +1,100 @@
+import re
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+# Aho-Corasick automaton over skill phrases, with whitespace-separated words as the
+# alphabet: one pass over the words of a text reports every dictionary phrase that
+# occurs in it, with character offsets. Matching whole words keeps the semantics of
+# the n-gram lookups it replaces ("react" does not match inside "reactjs")
+
+TOKEN_RE = re.compile(r'\S+')
+
+
+class Hit(NamedTuple):
+    start: int  # character offsets in the searched text
+    end: int
+    word: int  # index of the first word
+    n_words: int
+    phrase: str
+    value: object
+
+
+def tokenize(text: str) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """Whitespace-separated words of text and their (start, end) character offsets"""
+    words, spans = [], []
+    for match in TOKEN_RE.finditer(text):
+        words.append(match.group())
+        spans.append(match.span())
+    return words, spans
+
+
+class SkillAutomaton:
+    """
+    Multi-pattern matcher for phrases of at most max_words words
+
+    patterns: phrase -> value returned with every hit; phrases are matched word by
+    word, so they are normalized to single spaces (longer phrases are left out,
+    like the n-gram lookups this replaces never produced them)
+    """
+
+    def __init__(self, patterns: Dict[str, object], max_words: int = 4):
+        self.max_words = max_words
+        self._goto = [{}]  # state -> {word: next state}
+        self._fail = [0]
+        self._out = [()]  # state -> ((phrase, n_words, value), ...) ending here, incl. via fail links
+        self._size = 0
+        for phrase, value in patterns.items():
+            words = phrase.split()
+            if 0 < len(words) <= max_words:
+                self._add(words, value)
+        self._link()
+
+    def __len__(self):
+        return self._size
+
+    def _add(self, words, value):
+        state = 0
+        for word in words:
+            next_state = self._goto[state].get(word)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][word] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = next_state
+        self._size += not self._out[state]
+        self._out[state] = ((' '.join(words), len(words), value),)
+
+    def _link(self):
+        # breadth-first, so the fail target of every state is final before its children
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(word, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def iter_hits(self, words: Iterable[str], spans: List[Tuple[int, int]] = None):
+        """Hits in order of their last word, longest first for the same last word"""
+        state = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for i, word in enumerate(words):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for phrase, n_words, value in out[state]:
+                first = i - n_words + 1
+                start = spans[first][0] if spans else None
+                end = spans[i][1] if spans else None
+                yield Hit(start, end, first, n_words, phrase, value)
+
+    def find(self, text: str) -> List[Hit]:
+        """Every hit in text, ordered by first word and then length (like nested n-gram loops)"""
+        words, spans = tokenize(text)
+        return sorted(self.iter_hits(words, spans), key=lambda hit: (hit.word, hit.n_words))
@@ -0,0 +1,93 @@
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Callable, List
+import numpy as np
+from .config import cache_dir
+
+# skill-dictionary embeddings are stored as one contiguous float32 .npy file per
+# (model, dictionary) pair and memory-mapped on load, so a warm start costs a
+# single mmap instead of one forward pass per skill
+
+
+# read as bytes, without importing (and so building) the dictionaries
+DICTIONARY_PATH = Path(__file__).with_name("skills_dictionaries.py")
+
+
+def dictionary_hash() -> str:
+    """Hash of skills_dictionaries.py - any edit to the taxonomy invalidates the cache"""
+    return hashlib.sha256(DICTIONARY_PATH.read_bytes()).hexdigest()[:16]
+
+
+# version of a dictionary compiled with the Skill/SkillAlias rows of a database version
+# (see taxonomy_watcher.py)
+DB_VERSION_RE = re.compile(r'([0-9a-f]{16})-db([0-9]+)')
+
+
+def is_superseded(stale_version: str, version: str) -> bool:
+    """
+    True when stale_version is an older database version of the same dictionary as version
+    plain dictionary versions never are: every worker falls back to them, and during
+    a deploy workers of the previous release still use theirs
+    """
+    new, old = DB_VERSION_RE.fullmatch(version), DB_VERSION_RE.fullmatch(stale_version)
+    return bool(new and old and old.group(1) == new.group(1) and int(old.group(2)) < int(new.group(2)))
+
+
+def _cache_prefix(model_name: str) -> str:
+    key = hashlib.sha256(model_name.encode()).hexdigest()[:12]
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', model_name).strip('-')[-48:]
+    return f"skill_embeddings-{slug}-{key}-"
+
+
+def cache_path(model_name: str, directory: Path = None, version: str = None) -> Path:
+    directory = Path(directory) if directory else cache_dir()
+    version = re.sub(r'[^A-Za-z0-9]+', '-', version or dictionary_hash())
+    return directory / f"{_cache_prefix(model_name)}{version}.npy"
+
+
+def load_skill_embeddings(model_name: str, skill_names: List[str],
+                          compute: Callable[[List[str]], np.ndarray], directory: Path = None,
+                          version: str = None) -> np.ndarray:
+    """
+    Return a read-only (len(skill_names), dim) float32 matrix for skill_names
+
+    Loads the memory-mapped cache file when it matches the current model and
+    dictionary, otherwise calls compute(skill_names), writes the file and maps it
+    version identifies the dictionary (defaults to the hash of skills_dictionaries.py)
+    """
+    path = cache_path(model_name, directory, version)
+    if path.exists():
+        try:
+            matrix = np.load(path, mmap_mode='r')
+            if matrix.dtype == np.float32 and matrix.ndim == 2 and matrix.shape[0] == len(skill_names):
+                return matrix
+        except (ValueError, OSError) as e:
+            print(f"Ignoring unreadable skill embedding cache {path}: {e}")
+
+    matrix = np.ascontiguousarray(compute(skill_names), dtype=np.float32)
+
+    # write to a temporary file and rename so concurrent workers never map a partial file
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            np.save(f, matrix)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Could not write skill embedding cache {path}: {e}")
+        return matrix
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    # drop the caches of older database versions of this dictionary for the same model
+    prefix = _cache_prefix(model_name)
+    for stale in path.parent.glob(f"{prefix}*.npy"):
+        if is_superseded(stale.name[len(prefix):-len('.npy')], path.name[len(prefix):-len('.npy')]):
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+    return np.load(path, mmap_mode='r')
@@ -0,0 +1,198 @@
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, Tuple
+from .config import cache_dir, skill_setting
+from .fuzzy_index import FuzzyIndex
+from .skill_automaton import SkillAutomaton
+from .skill_embedding_cache import dictionary_hash, is_superseded
+
+# everything the extractors derive from the skill dictionary - the skill table,
+# acronyms, the exact/acronym matcher automaton and the fuzzy index - compiled
+# once into a single pickled artifact per dictionary version, so a worker loads
+# it with one unpickle instead of rebuilding it in every extractor
+# build it ahead of deployment with `manage.py build_skill_artifact`; a worker
+# that finds no artifact for the current version compiles the dictionaries, and
+# writes the artifact for the next worker when write_taxonomy_artifacts is on
+
+ARTIFACT_FORMAT = 2  # bump when the pickled layout changes
+
+# the code that compiles the artifact and the classes pickled into it; an artifact
+# written by other code is compiled again (see compiler_hash)
+COMPILER_PATHS = [
+    Path(__file__),
+    Path(__file__).with_name("skill_automaton.py"),
+    Path(__file__).with_name("fuzzy_index.py"),
+]
+
+# Common manual mappings
+MANUAL_ACRONYMS = {
+    'amazon web services': 'AWS',
+    'artificial intelligence': 'AI',
+    'machine learning': 'ML',
+    'natural language processing (nlp)': 'NLP',
+    'user interface': 'UI',
+    'user experience': 'UX',
+    'continuous integration': 'CI',
+    'continuous deployment': 'CD',
+    'infrastructure as code': 'IaC'
+}
+
+
+def compiler_hash() -> str:
+    """Hash of COMPILER_PATHS - an edit to the builders or the pickled classes invalidates the artifact"""
+    digest = hashlib.sha256()
+    for path in COMPILER_PATHS:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def build_acronym_map(skills: Dict[str, Dict]) -> Dict[str, str]:
+    """Create mappings between skills and their acronyms"""
+    acronym_map = {}
+
+    # Add both directions for manual mappings
+    for full_form, acronym in MANUAL_ACRONYMS.items():
+        acronym_map[full_form] = acronym
+        acronym_map[acronym.lower()] = full_form
+        # Also add the skill name as it appears in the skill table
+        if full_form in skills:
+            actual_name = skills[full_form]['name']
+            acronym_map[acronym.lower()] = actual_name.lower()
+        # Special case for AWS which is in the skill table as just "AWS"
+        if acronym == "AWS":
+            acronym_map[acronym.lower()] = acronym
+
+    # Generate acronyms for multi-word skills
+    for skill_info in skills.values():
+        name = skill_info['name'].lower()
+        if ' ' in name:
+            words = name.split()
+            acronym = ''.join(word[0].upper() for word in words)
+            if len(acronym) >= 2:  # Only add if acronym is 2+ letters
+                acronym_map[name] = acronym
+                acronym_map[acronym.lower()] = name
+
+    return acronym_map
+
+
+def build_dictionary_matches(skills: Dict[str, Dict], acronym_map: Dict[str, str]) -> Dict[str, Tuple[str, float]]:
+    """Phrase -> (skill name, confidence) for every phrase that resolves without fuzzy matching"""
+    matches = {}
+    # Check acronym matches (acronyms that resolve to no skill fall through to fuzzy matching)
+    for phrase, full_form in acronym_map.items():
+        # Special case for AWS which is directly in the skill table
+        if full_form.upper() == "AWS":
+            matches[phrase] = ("AWS", 0.95)
+        elif full_form in skills:
+            matches[phrase] = (skills[full_form]['name'], 0.95)
+    # Exact matches take precedence
+    for phrase, skill_info in skills.items():
+        matches[phrase] = (skill_info['name'], 1.0)
+    return matches
+
+
+class SkillTaxonomy:
+    """Compiled skill dictionary shared by every extractor in the process"""
+
+    def __init__(self, skills: Dict[str, Dict], version: str):
+        self.version = version
+        self.skills = skills  # lowercased phrase (name or alias) -> {'name', 'category', 'subcategory'}
+        # distinct names, in dictionary order (aliases repeat the name of their skill)
+        self.skill_names = list(dict.fromkeys(skill_info['name'] for skill_info in skills.values()))
+        self.acronym_map = build_acronym_map(skills)
+        # exact and acronym tiers of EnhancedSkillExtractor._get_fuzzy_matches
+        self.dictionary_matches = build_dictionary_matches(skills, self.acronym_map)
+        self.automaton = SkillAutomaton(self.dictionary_matches)
+        # plain phrase -> skill info lookups of extract_skills_from_text
+        self.phrase_automaton = SkillAutomaton(skills)
+        # lowercased skill names for the Levenshtein tier, valued by their position in skill_names
+        self.fuzzy_index = FuzzyIndex((name.lower(), position) for position, name in enumerate(self.skill_names))
+
+    def __len__(self):
+        return len(self.skills)
+
+    @classmethod
+    def from_dictionaries(cls) -> 'SkillTaxonomy':
+        """Compile skills_dictionaries.py, versioned by the hash of its source"""
+        from .skills_dictionaries import ALL_SKILLS
+        return cls(ALL_SKILLS, dictionary_hash())
+
+    def save(self, path: Path):
+        # write to a temporary file and rename so concurrent workers never load a partial file
+        path = Path(path)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((ARTIFACT_FORMAT, compiler_hash(), self), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    @classmethod
+    def load(cls, path: Path) -> 'SkillTaxonomy':
+        """Unpickle an artifact written by save(); None if it is missing or from another format or code"""
+        try:
+            with open(path, 'rb') as f:
+                artifact = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError) as e:
+            print(f"Ignoring unreadable skill taxonomy artifact {path}: {e}")
+            return None
+        if not isinstance(artifact, tuple) or artifact[:2] != (ARTIFACT_FORMAT, compiler_hash()):
+            return None
+        taxonomy = artifact[-1]
+        return taxonomy if isinstance(taxonomy, cls) else None
+
+
+def artifact_path(version: str, directory: Path = None) -> Path:
+    directory = Path(directory) if directory else cache_dir()
+    return directory / f"skill_taxonomy-{version}.pkl"
+
+
+def write_artifact(taxonomy: SkillTaxonomy, directory: Path = None) -> Path:
+    """Save taxonomy as the artifact of its version and drop those of older database versions"""
+    path = artifact_path(taxonomy.version, directory)
+    taxonomy.save(path)
+    for stale in path.parent.glob("skill_taxonomy-*.pkl"):
+        if is_superseded(stale.name[len("skill_taxonomy-"):-len(".pkl")], taxonomy.version):
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+    return path
+
+
+def share_artifact(taxonomy: SkillTaxonomy, directory: Path = None, write: bool = None):
+    """
+    Write a taxonomy this worker compiled so the next one unpickles it instead
+    write defaults to SKILL_EXTRACTION_CONFIG['write_taxonomy_artifacts']
+    """
+    if write is None:
+        write = skill_setting("write_taxonomy_artifacts")
+    if not write:
+        return
+    try:
+        write_artifact(taxonomy, directory)
+    except OSError as e:
+        print(f"Could not write skill taxonomy artifact: {e}")
+
+
+def load_skill_taxonomy(directory: Path = None, write: bool = None) -> SkillTaxonomy:
+    """
+    Return the compiled taxonomy of the current skill dictionaries
+
+    Unpickles the artifact for the current dictionary version when there is one,
+    otherwise compiles the dictionaries (and shares the artifact, see share_artifact)
+    """
+    version = dictionary_hash()
+    taxonomy = SkillTaxonomy.load(artifact_path(version, directory))
+    if taxonomy is not None and taxonomy.version == version:
+        return taxonomy
+
+    taxonomy = SkillTaxonomy.from_dictionaries()
+    share_artifact(taxonomy, directory, write)
+    return taxonomy
@@ -0,0 +1,143 @@
+import threading
+import time
+from django.conf import settings
+from django.core.exceptions import AppRegistryNotReady, ImproperlyConfigured
+from django.db import DatabaseError, connections
+from .config import skill_setting
+from .skill_embedding_cache import dictionary_hash
+from .skill_taxonomy import SkillTaxonomy, artifact_path, load_skill_taxonomy, share_artifact
+
+# the skill taxonomy of a worker follows the Skill and SkillAlias tables: every
+# change to them bumps the single TaxonomyVersion row (see signals.py), and each
+# worker polls that row from a background thread at most every
+# taxonomy_poll_seconds; when it moved, the new taxonomy is compiled (and its
+# skill embeddings computed) off the request path and swapped in with a single
+# reference assignment - requests already running finish on the old one
+
+
+def database_version() -> int:
+    """Version of the Skill and SkillAlias tables, 0 when they were never changed"""
+    from ..models import TaxonomyVersion
+    return TaxonomyVersion.current()
+
+
+def build_taxonomy(db_version: int, directory=None) -> SkillTaxonomy:
+    """
+    skills_dictionaries.py merged with the Skill and SkillAlias rows
+    Skill rows add skills or override the category of a dictionary skill, aliases
+    name an existing skill; with an untouched database this is the dictionary
+    artifact itself. Compiled taxonomies are shared as artifacts too (when
+    write_taxonomy_artifacts is on), so the other workers noticing the same version
+    unpickle instead of querying and compiling.
+    """
+    if not db_version:
+        return load_skill_taxonomy(directory)
+    version = f"{dictionary_hash()}-db{db_version}"
+    taxonomy = SkillTaxonomy.load(artifact_path(version, directory))
+    if taxonomy is not None:
+        return taxonomy
+
+    from ..models import Skill, SkillAlias
+    from .skills_dictionaries import ALL_SKILLS
+    skills = dict(ALL_SKILLS)
+    for name, category, subcategory in Skill.objects.order_by('pk').values_list('name', 'category', 'subcategory'):
+        skills[name.lower()] = {"category": category, "subcategory": subcategory, "name": name}
+    aliases = SkillAlias.objects.order_by('pk').values_list('alias', 'skill__name', 'skill__category', 'skill__subcategory')
+    for alias, name, category, subcategory in aliases:
+        # an alias never shadows the name of another skill
+        skills.setdefault(alias, {"category": category, "subcategory": subcategory, "name": name})
+
+    taxonomy = SkillTaxonomy(skills, version)
+    share_artifact(taxonomy, directory)
+    return taxonomy
+
+
+def describes_known_skill(taxonomy: SkillTaxonomy, name: str, category: str, subcategory: str) -> bool:
+    """True when a Skill row only repeats what taxonomy already compiled, so it needs no rebuild"""
+    known = taxonomy.skills.get(name.lower())
+    return known is not None and (known['name'], known['category'], known['subcategory']) == (name, category, subcategory)
+
+
+def warm_skill_embeddings(taxonomy: SkillTaxonomy):
+    """Compute the skill embeddings of a new taxonomy before requests need them"""
+    if skill_setting("semantic_matching"):
+        from .enhanced_skill_extraction import EnhancedSkillExtractor
+        EnhancedSkillExtractor(taxonomy=taxonomy).skill_matrix
+
+
+class TaxonomyWatcher:
+    """Current compiled taxonomy of the process, replaced when the database version moves"""
+
+    def __init__(self, read_version=database_version, build=build_taxonomy, warm=warm_skill_embeddings,
+                 poll_interval=None):
+        self.read_version = read_version
+        self.build = build
+        self.warm = warm
+        self.poll_interval = skill_setting("taxonomy_poll_seconds") if poll_interval is None else poll_interval
+        self.taxonomy = None
+        self.db_version = None
+        self.swaps = 0
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._refreshing = False
+
+    def current(self) -> SkillTaxonomy:
+        """The taxonomy to use for the next extraction; never waits for a rebuild once one is loaded"""
+        taxonomy = self.taxonomy
+        if taxonomy is None:
+            with self._lock:
+                if self.taxonomy is None:
+                    self._checked_at = time.monotonic()
+                    self.db_version = self._initial_version()
+                    self.taxonomy = self.build(self.db_version)
+                return self.taxonomy
+        if self.poll_interval and time.monotonic() - self._checked_at >= self.poll_interval:
+            self._refresh_in_background()
+        return taxonomy
+
+    def _initial_version(self):
+        try:
+            return self.read_version()
+        except (ImproperlyConfigured, AppRegistryNotReady):
+            # used outside of Django: the dictionaries are all there is
+            self.poll_interval = 0
+            return 0
+        except DatabaseError as e:
+            # e.g. before the first migrate; the dictionaries until the table answers
+            print(f"Skill taxonomy version unavailable, using the dictionaries: {e}")
+            return 0
+
+    def refresh(self) -> bool:
+        """Poll the database version and swap in the rebuilt taxonomy if it moved; True when swapped"""
+        version = self.read_version()
+        if version == self.db_version:
+            return False
+        taxonomy = self.build(version)
+        try:
+            self.warm(taxonomy)
+        except Exception as e:
+            # a cold embedding cache only slows down the first semantic match
+            print(f"Could not precompute skill embeddings for taxonomy {taxonomy.version}: {e}")
+        self.db_version = version
+        self.taxonomy = taxonomy
+        self.swaps += 1
+        return True
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing or time.monotonic() - self._checked_at < self.poll_interval:
+                return
+            self._refreshing = True
+            self._checked_at = time.monotonic()
+        threading.Thread(target=self._run_refresh, name="skill-taxonomy-refresh", daemon=True).start()
+
+    def _run_refresh(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            # keep serving the current taxonomy and try again at the next poll
+            print(f"Skill taxonomy refresh failed: {e}")
+        finally:
+            self._refreshing = False
+            if settings.configured:
+                connections.close_all()  # this thread's connections only
@@ -0,0 +1,47 @@
+import numpy as np
+
+# embeddings are stored as raw little-endian bytes plus their dtype and dimension
+# instead of JSON float lists: 4 (or 2) bytes per value, and decoding is a
+# zero-copy np.frombuffer view over the bytes the database driver returned
+STORAGE_DTYPES = ('float32', 'float16')
+
+
+def pack(vector, dtype='float32'):
+    """
+    Encode a 1-d vector for storage
+    returns: (bytes, dimension)
+    """
+    if dtype not in STORAGE_DTYPES:
+        raise ValueError(f"Unsupported embedding dtype {dtype!r}, expected one of {STORAGE_DTYPES}")
+    array = np.asarray(vector, dtype=np.dtype(dtype).newbyteorder('<')).reshape(-1)
+    return array.tobytes(), array.shape[0]
+
+
+def unpack(data, dtype='float32', dim=None):
+    """
+    Read-only view of stored bytes as a vector (no copy is made)
+    bytes, bytearray and memoryview (what postgres returns for bytea) are accepted
+    """
+    if data is None:
+        return None
+    if dtype not in STORAGE_DTYPES:
+        raise ValueError(f"Unsupported embedding dtype {dtype!r}, expected one of {STORAGE_DTYPES}")
+    vector = np.frombuffer(data, dtype=np.dtype(dtype).newbyteorder('<'))
+    if dim is not None and vector.shape[0] != dim:
+        raise ValueError(f"Stored embedding has {vector.shape[0]} values, expected {dim}")
+    return vector
+
+
+def stack(rows, dtype=np.float32):
+    """
+    Stack (bytes, dtype, dim) rows into one 2-d array with a single allocation
+    rows of a different dimension than the first are rejected
+    """
+    rows = list(rows)
+    if not rows:
+        return np.zeros((0, 0), dtype=dtype)
+    dim = rows[0][2]
+    matrix = np.empty((len(rows), dim), dtype=dtype)
+    for i, (data, row_dtype, row_dim) in enumerate(rows):
+        matrix[i] = unpack(data, row_dtype, row_dim if row_dim is not None else dim)
+    return matrix
@@ -0,0 +1,486 @@
+import fcntl
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+import numpy as np
+from .vector_sketch import PCASketch, sketch_search
+
+# inverted-file (IVF) index for cosine similarity search, built on numpy only
+# vectors are L2-normalized and grouped by their nearest k-means centroid; a query
+# scores the centroids first and then only the rows of the nprobe closest lists.
+# rows of one list are contiguous on disk, so each probed list is a single
+# sequential read from the memory-mapped vectors.npy
+#
+# between rebuilds, changes are appended to a per-generation operation log
+# (upserts and tombstones) that every reader replays on top of the mapped base,
+# and compaction folds the log into a new generation without retraining
+#
+# every generation also stores PCA/sign-bit sketches of its rows (vector_sketch.py)
+# for exhaustive two-stage scans that do not depend on the list assignment
+
+
+def normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def default_nlist(count):
+    # ~4 * sqrt(N) lists keeps both the centroid scan and each probed list small
+    return max(1, min(count, int(4 * np.sqrt(count))))
+
+
+def _assign(vectors, centroids, chunk_size=65536):
+    # nearest centroid for every row, computed in chunks to bound the (rows x lists) score matrix
+    labels = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), chunk_size):
+        labels[start:start + chunk_size] = np.argmax(vectors[start:start + chunk_size] @ centroids.T, axis=1)
+    return labels
+
+
+def kmeans(vectors, nlist, iterations=10, train_size=None, seed=0):
+    """
+    Spherical k-means on (a sample of) normalized vectors
+    returns: (nlist, dim) float32 matrix of normalized centroids
+    """
+    rng = np.random.default_rng(seed)
+    train_size = min(len(vectors), train_size or max(nlist * 64, 10000))
+    sample = vectors if train_size == len(vectors) else vectors[np.sort(rng.choice(len(vectors), train_size, replace=False))]
+    sample = np.ascontiguousarray(sample, dtype=np.float32)
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        counts = np.bincount(labels, minlength=nlist)
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            # restart empty lists from random points instead of leaving them unused
+            sums[empty] = sample[rng.choice(len(sample), len(empty), replace=False)]
+        centroids = normalize(sums)
+    return centroids
+
+
+class IVFIndex:
+    """Cosine-similarity index: centroids, list offsets and per-list contiguous rows"""
+
+    def __init__(self, centroids, offsets, vectors, ids, meta=None, sketch=None, codes=None, bits=None):
+        self.centroids = centroids
+        self.offsets = offsets  # rows of list i are vectors[offsets[i]:offsets[i + 1]]
+        self.vectors = vectors
+        self.ids = ids
+        self.meta = meta or {}
+        self.sketch = sketch  # PCASketch, with codes/bits holding one row per vector
+        self.codes = codes
+        self.bits = bits
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def nlist(self):
+        return len(self.centroids)
+
+    @classmethod
+    def build(cls, ids, vectors, nlist=None, iterations=10, meta=None, sketch_dims=64):
+        vectors = normalize(vectors)
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(vectors) == 0:
+            raise ValueError("Cannot build an index without vectors")
+        nlist = min(nlist or default_nlist(len(vectors)), len(vectors))
+        centroids = kmeans(vectors, nlist, iterations)
+        labels = _assign(vectors, centroids)
+        order = np.argsort(labels, kind='stable')
+        offsets = np.zeros(nlist + 1, dtype=np.int64)
+        np.cumsum(np.bincount(labels, minlength=nlist), out=offsets[1:])
+        meta = dict(meta or {}, count=len(ids), dim=int(vectors.shape[1]), nlist=nlist, metric='cosine')
+        index = cls(centroids, offsets, vectors[order], ids[order], meta)
+        if sketch_dims:
+            index.sketch = PCASketch.fit(index.vectors, sketch_dims)
+            index.codes, index.bits = index.sketch.encode(index.vectors)
+            index.meta['sketch_dims'] = index.sketch.dims
+        return index
+
+    def labels(self):
+        """List number of every row"""
+        return np.repeat(np.arange(self.nlist), np.diff(self.offsets))
+
+    def apply(self, ids, vectors, removed):
+        """
+        New index with rows of `removed` and `ids` dropped and (ids, vectors) inserted
+        new rows go to their nearest existing centroid, the centroids are not retrained
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        dim = self.centroids.shape[1]
+        vectors = normalize(np.asarray(vectors, dtype=np.float32).reshape(len(ids), dim))
+        keep = ~np.isin(self.ids, np.concatenate([ids, np.asarray(list(removed), dtype=np.int64)]))
+        all_labels = np.concatenate([self.labels()[keep], _assign(vectors, self.centroids)])
+        all_ids = np.concatenate([self.ids[keep], ids])
+        all_vectors = np.concatenate([self.vectors[keep], vectors])
+        order = np.argsort(all_labels, kind='stable')
+        offsets = np.zeros(self.nlist + 1, dtype=np.int64)
+        np.cumsum(np.bincount(all_labels, minlength=self.nlist), out=offsets[1:])
+        meta = {key: value for key, value in self.meta.items() if key not in ('generation', 'published_at')}
+        meta['count'] = len(all_ids)
+        index = IVFIndex(self.centroids, offsets, all_vectors[order], all_ids[order], meta)
+        if self.sketch is not None:
+            # new rows are encoded with the fitted projection, kept rows reuse their codes
+            codes, bits = self.sketch.encode(vectors)
+            index.sketch = self.sketch
+            index.codes = np.concatenate([self.codes[keep], codes])[order]
+            index.bits = np.concatenate([self.bits[keep], bits])[order]
+        return index
+
+    def search(self, query, k=10, nprobe=16):
+        """
+        Approximate top-k by cosine similarity
+        returns: list of (id, score), best first
+        """
+        if not len(self.ids):
+            return []
+        query = normalize(query).reshape(-1)
+        nprobe = max(1, min(nprobe, self.nlist))
+        centroid_scores = self.centroids @ query
+        lists = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+
+        scores, ids = [], []
+        for i in lists:
+            start, end = self.offsets[i], self.offsets[i + 1]
+            if end > start:
+                scores.append(self.vectors[start:end] @ query)
+                ids.append(self.ids[start:end])
+        if not scores:
+            return []
+        return _top_k(np.concatenate(ids), np.concatenate(scores), k)
+
+    def scan(self, query, k=10, shortlist=None):
+        """
+        Top-k over every row: Hamming prefilter on the sign bits, projected dot product
+        on the PCA codes, exact rerank of the shortlist with the full vectors
+        """
+        if self.sketch is None:
+            raise ValueError("This index was built without sketches, rebuild it to scan")
+        return sketch_search(self.sketch, self.codes, self.bits, self.vectors, self.ids,
+                             normalize(query).reshape(-1), k, shortlist)
+
+    def save(self, directory):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in ('centroids', 'offsets', 'vectors', 'ids'):
+            np.save(directory / f"{name}.npy", np.ascontiguousarray(getattr(self, name)))
+        if self.sketch is not None:
+            self.sketch.save(directory)
+            np.save(directory / "codes.npy", np.ascontiguousarray(self.codes))
+            np.save(directory / "bits.npy", np.ascontiguousarray(self.bits))
+        (directory / "meta.json").write_text(json.dumps(self.meta))
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Load an index; the (large) vectors and ids are memory-mapped and shared between processes"""
+        directory = Path(directory)
+        mode = 'r' if mmap else None
+        index = cls(
+            np.load(directory / "centroids.npy"),
+            np.load(directory / "offsets.npy"),
+            np.load(directory / "vectors.npy", mmap_mode=mode),
+            np.load(directory / "ids.npy", mmap_mode=mode),
+            json.loads((directory / "meta.json").read_text()),
+        )
+        index.sketch = PCASketch.load(directory)
+        if index.sketch is not None:
+            index.codes = np.load(directory / "codes.npy", mmap_mode=mode)
+            index.bits = np.load(directory / "bits.npy", mmap_mode=mode)
+        return index
+
+
+def _top_k(ids, scores, k):
+    k = min(k, len(scores))
+    if k <= 0:
+        return []
+    best = np.argpartition(-scores, k - 1)[:k]
+    best = best[np.lexsort((ids[best], -scores[best]))]
+    return [(int(ids[i]), float(scores[i])) for i in best]
+
+
+UPSERT, DELETE = 1, 2
+
+
+def log_dtype(dim):
+    """One fixed-size record of the operation log"""
+    return np.dtype([('op', '<i8'), ('id', '<i8'), ('vector', '<f4', (dim,))])
+
+
+def replay(records):
+    """
+    Net effect of log records in order
+    returns: (dict id -> vector of rows to insert or replace, set of deleted ids)
+    """
+    upserts, deleted = {}, set()
+    for op, row_id, vector in zip(records['op'], records['id'].tolist(), records['vector']):
+        if op == UPSERT:
+            upserts[row_id] = vector
+            deleted.discard(row_id)
+        else:
+            upserts.pop(row_id, None)
+            deleted.add(row_id)
+    return upserts, deleted
+
+
+class LiveIndex:
+    """Memory-mapped base generation plus the changes logged since it was built"""
+
+    def __init__(self, base, log_path):
+        self.base = base
+        self.meta = base.meta
+        self.log_path = Path(log_path)
+        self.dtype = log_dtype(base.centroids.shape[1])
+        self._lock = threading.Lock()
+        self._records = np.zeros(0, dtype=self.dtype)
+        self._read_bytes = 0
+        self._upserts, self._deleted = {}, set()
+        self._shadowed = set()
+        self._overlay_ids = np.zeros(0, dtype=np.int64)
+        self._overlay = np.zeros((0, base.centroids.shape[1]), dtype=np.float32)
+
+    def __len__(self):
+        base_live = len(self.base) - int(np.isin(self.base.ids, list(self._shadowed)).sum()) if self._shadowed else len(self.base)
+        return base_live + len(self._overlay_ids)
+
+    @property
+    def pending_ops(self):
+        return len(self._records)
+
+    def refresh(self):
+        """Replay log records appended since the last call (one stat() when nothing changed)"""
+        try:
+            size = self.log_path.stat().st_size
+        except FileNotFoundError:
+            return
+        complete = size - size % self.dtype.itemsize  # ignore a record still being written
+        if complete <= self._read_bytes:
+            return
+        with self._lock:
+            if complete <= self._read_bytes:
+                return
+            with open(self.log_path, 'rb') as f:
+                f.seek(self._read_bytes)
+                new = np.frombuffer(f.read(complete - self._read_bytes), dtype=self.dtype)
+            self._records = np.concatenate([self._records, new])
+            self._read_bytes = complete
+            self._upserts, self._deleted = replay(self._records)
+            self._shadowed = set(self._upserts) | self._deleted
+            self._overlay_ids = np.fromiter(self._upserts.keys(), dtype=np.int64, count=len(self._upserts))
+            self._overlay = normalize(np.stack(list(self._upserts.values()))) if self._upserts else self._overlay[:0]
+
+    def search(self, query, k=10, nprobe=16, method='ivf', shortlist=None):
+        """method: 'ivf' probes the nprobe closest lists, 'sketch' scans every row's sketch"""
+        query = normalize(query).reshape(-1)
+        shadowed, overlay_ids, overlay = self._shadowed, self._overlay_ids, self._overlay
+        # ask the base for extra rows in case some of its best ones were replaced or deleted
+        if method == 'sketch':
+            base_results = self.base.scan(query, k + len(shadowed), shortlist)
+        elif method == 'ivf':
+            base_results = self.base.search(query, k + len(shadowed), nprobe)
+        else:
+            raise ValueError(f"Unknown search method {method!r}, expected 'ivf' or 'sketch'")
+        results = [(i, score) for i, score in base_results if i not in shadowed]
+        if len(overlay_ids):
+            results += _top_k(overlay_ids, overlay @ query, k)
+        results.sort(key=lambda item: (-item[1], item[0]))
+        return results[:k]
+
+
+def _generation_time(generation):
+    # gen-<time_ns> of the publish that named it
+    try:
+        return int(generation[len("gen-"):])
+    except ValueError:
+        return -1
+
+
+class IndexStore:
+    """
+    Directory holding successive index generations and a manifest naming the current one
+
+    publish() writes a new generation next to the old one and swaps manifest.json
+    atomically, so readers in other processes always map a complete index; load()
+    re-reads the manifest only when it changed on disk. append() logs upserts and
+    deletes against the current generation and compact() folds them into a new one;
+    writers in different processes are serialized with a lock file
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._loaded = None
+        self._loaded_key = None
+
+    @property
+    def manifest_path(self):
+        return self.root / "manifest.json"
+
+    def log_path(self, generation):
+        return self.root / f"{generation}.ops"
+
+    def manifest(self):
+        try:
+            return json.loads(self.manifest_path.read_text())
+        except FileNotFoundError:
+            return None
+
+    @contextmanager
+    def locked(self, name="write", blocking=True):
+        """Exclusive lock shared by every process using this directory; yields False if not acquired"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / f".{name}.lock", 'a') as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _read_log(self, manifest, start=0, end=None):
+        dtype = log_dtype(manifest['dim'])
+        try:
+            data = self.log_path(manifest['generation']).read_bytes()
+        except FileNotFoundError:
+            data = b''
+        records = np.frombuffer(data[:len(data) - len(data) % dtype.itemsize], dtype=dtype)
+        return records[start:end]
+
+    def log_position(self):
+        """(generation, logged operations) - where a rebuild starting now has to resume from"""
+        with self.locked():
+            manifest = self.manifest()
+            if manifest is None:
+                return None
+            return manifest['generation'], len(self._read_log(manifest))
+
+    def append(self, upserts=(), deletes=()):
+        """
+        Log (id, vector) upserts and id deletes against the current generation
+        returns: operations pending compaction, or None when no index was built yet
+        """
+        upserts, deletes = list(upserts), list(deletes)
+        with self.locked():
+            manifest = self.manifest()
+            if manifest is None:
+                return None
+            records = np.zeros(len(upserts) + len(deletes), dtype=log_dtype(manifest['dim']))
+            for i, (row_id, vector) in enumerate(upserts):
+                records[i] = (UPSERT, row_id, np.asarray(vector, dtype=np.float32).reshape(-1))
+            for i, row_id in enumerate(deletes, start=len(upserts)):
+                records[i]['op'], records[i]['id'] = DELETE, row_id
+            path = self.log_path(manifest['generation'])
+            with open(path, 'ab') as f:
+                f.write(records.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            return path.stat().st_size // records.dtype.itemsize
+
+    def publish(self, index, replay_from=None):
+        """
+        Make index the current generation
+        replay_from=(generation, position) carries over operations logged after
+        position, i.e. while the index was being built from the database
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_dir = self.root / f"gen-{time.time_ns()}.{os.getpid()}.tmp"
+        index.save(tmp_dir)
+
+        try:
+            with self.locked():
+                # named and moved into place under the lock, so a concurrent publisher's
+                # cleanup never sees a generation that is not in the manifest yet
+                generation = f"gen-{time.time_ns()}"
+                os.replace(tmp_dir, self.root / generation)
+                current = self.manifest()
+                if replay_from and current and current['generation'] == replay_from[0]:
+                    carried = self._read_log(current, replay_from[1])
+                    if len(carried):
+                        self.log_path(generation).write_bytes(carried.tobytes())
+                manifest = dict(index.meta, generation=generation, published_at=time.time())
+                tmp_manifest = self.root / f"manifest.json.{os.getpid()}.tmp"
+                tmp_manifest.write_text(json.dumps(manifest))
+                os.replace(tmp_manifest, self.manifest_path)
+                self._remove_old_generations(current=generation)
+        finally:
+            if tmp_dir.exists():
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        return manifest
+
+    def compact(self):
+        """
+        Fold the operation log into a new generation; operations logged while compacting
+        are carried over. Returns the new manifest, or None if there was nothing to do or
+        another process is already compacting
+        """
+        with self.locked("compact", blocking=False) as acquired:
+            if not acquired:
+                return None
+            position = self.log_position()
+            if position is None or position[1] == 0:
+                return None
+            manifest = self.manifest()
+            if manifest['generation'] != position[0]:
+                return None
+            upserts, deleted = replay(self._read_log(manifest, 0, position[1]))
+            base = IVFIndex.load(self.root / manifest['generation'])
+            base.meta = manifest
+            ids = np.fromiter(upserts.keys(), dtype=np.int64, count=len(upserts))
+            vectors = np.stack(list(upserts.values())) if upserts else np.zeros((0, manifest['dim']), dtype=np.float32)
+            compacted = base.apply(ids, vectors, deleted)
+            compacted.meta['compacted_from'] = manifest['generation']
+            return self.publish(compacted, replay_from=position)
+
+    def _remove_old_generations(self, current):
+        # called under the write lock; generations being written (*.tmp) and any newer
+        # than the current one are left alone. Processes that still map an old generation
+        # keep reading it: unlinked files stay valid until their last mapping is closed
+        for path in self.root.glob("gen-*"):
+            if path.name.endswith('.tmp'):
+                continue
+            generation = path.name[:-len('.ops')] if path.suffix == '.ops' else path.name
+            if generation == current or _generation_time(generation) > _generation_time(current):
+                continue
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            elif path.suffix == '.ops':
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def load(self):
+        """Current index with logged changes applied, or None when nothing was published yet"""
+        try:
+            stat = self.manifest_path.stat()
+        except FileNotFoundError:
+            return None
+        key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if key != self._loaded_key:
+            with self._lock:
+                if key != self._loaded_key:
+                    for attempt in range(3):
+                        manifest = self.manifest()
+                        try:
+                            base = IVFIndex.load(self.root / manifest['generation'])
+                            break
+                        except FileNotFoundError:
+                            # another process published (and cleaned up) in between
+                            if attempt == 2:
+                                raise
+                    base.meta = manifest
+                    self._loaded = LiveIndex(base, self.log_path(manifest['generation']))
+                    self._loaded_key = key
+        self._loaded.refresh()
+        return self._loaded
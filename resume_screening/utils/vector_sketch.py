@@ -0,0 +1,123 @@
+from pathlib import Path
+import numpy as np
+
+# compact sketches of normalized embeddings for two-stage corpus scans
+# each vector is centred and projected on the top principal components of the
+# corpus (kept as float16) and the signs of that projection are packed into bits;
+# a query first ranks every row by Hamming distance over the bits (dims / 8 bytes
+# per row instead of 4 * dim), then re-scores the survivors with the float16
+# projection and finally the shortlist with the full vectors
+
+# number of set bits of every byte value
+_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+def _popcount64(x):
+    # SWAR bit count of every uint64 (numpy 1.x has no vectorized popcount)
+    x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return (x * np.uint64(0x0101010101010101)) >> np.uint64(56)
+
+
+def hamming(bits, query_bits):
+    """Hamming distance between one packed query and every packed row: (rows,) int array"""
+    bits, query_bits = np.asarray(bits), np.asarray(query_bits)
+    if bits.shape[1] % 8 == 0 and bits.flags.c_contiguous:
+        # rows padded to whole 64-bit words are compared one word at a time
+        words = np.bitwise_xor(bits.view('<u8'), np.ascontiguousarray(query_bits).view('<u8'))
+        return _popcount64(words).sum(axis=1, dtype=np.int32)
+    return _POPCOUNT[np.bitwise_xor(bits, query_bits)].sum(axis=1, dtype=np.int32)
+
+
+def pack_signs(projected):
+    """Sign bits of projected rows, packed and zero-padded to whole 64-bit words"""
+    projected = np.atleast_2d(projected)
+    bits = np.packbits(projected > 0, axis=1)
+    width = -(-bits.shape[1] // 8) * 8
+    if width != bits.shape[1]:
+        bits = np.pad(bits, ((0, 0), (0, width - bits.shape[1])))
+    return bits
+
+
+class PCASketch:
+    """Mean and principal components fitted on the corpus, persisted with the index"""
+
+    def __init__(self, mean, components):
+        self.mean = mean  # (dim,)
+        self.components = components  # (dims, dim), orthonormal rows
+
+    @property
+    def dims(self):
+        return len(self.components)
+
+    @classmethod
+    def fit(cls, vectors, dims=64, sample_size=50000, seed=0):
+        rng = np.random.default_rng(seed)
+        if len(vectors) > sample_size:
+            vectors = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+        vectors = np.asarray(vectors, dtype=np.float32)
+        mean = vectors.mean(axis=0)
+        # rows of vt are the principal directions, strongest first
+        _, _, vt = np.linalg.svd(vectors - mean, full_matrices=False)
+        dims = min(dims, vt.shape[0])
+        return cls(mean.astype(np.float32), np.ascontiguousarray(vt[:dims], dtype=np.float32))
+
+    def project(self, vectors):
+        return (np.asarray(vectors, dtype=np.float32) - self.mean) @ self.components.T
+
+    def encode(self, vectors, chunk_size=65536):
+        """(float16 projections, packed sign bits) of every row"""
+        codes = np.empty((len(vectors), self.dims), dtype=np.float16)
+        bits = np.empty((len(vectors), -(-self.dims // 64) * 8), dtype=np.uint8)
+        for start in range(0, len(vectors), chunk_size):
+            projected = self.project(vectors[start:start + chunk_size])
+            codes[start:start + chunk_size] = projected
+            bits[start:start + chunk_size] = pack_signs(projected)
+        return codes, bits
+
+    def save(self, directory):
+        np.save(Path(directory) / "pca_mean.npy", self.mean)
+        np.save(Path(directory) / "pca_components.npy", self.components)
+
+    @classmethod
+    def load(cls, directory):
+        directory = Path(directory)
+        if not (directory / "pca_components.npy").exists():
+            return None
+        return cls(np.load(directory / "pca_mean.npy"), np.load(directory / "pca_components.npy"))
+
+
+def sketch_search(sketch, codes, bits, vectors, ids, query, k=10, shortlist=None):
+    """
+    Two-stage top-k by cosine similarity over every row
+    stage 1 keeps the 8 * shortlist rows closest in Hamming distance, stage 2 the
+    shortlist rows with the best projected dot product; those are reranked exactly
+    shortlist defaults to max(30 * k, 300)
+    returns: list of (id, score), best first
+    """
+    if not len(ids):
+        return []
+    query = np.asarray(query, dtype=np.float32).reshape(-1)
+    shortlist = min(shortlist or max(30 * k, 300), len(ids))
+    projected = sketch.project(query[None, :])[0]
+
+    candidates = min(8 * shortlist, len(ids))
+    distances = hamming(bits, pack_signs(projected)[0])
+    if candidates < len(ids):
+        rows = np.argpartition(distances, candidates - 1)[:candidates]
+    else:
+        rows = np.arange(len(ids))
+    rows.sort()  # sequential access into the memory-mapped arrays
+
+    # the mean term of the projection is the same for every row, so the uncentred
+    # projection of the query ranks candidates like the full dot product would
+    approximate = codes[rows].astype(np.float32) @ (sketch.components @ query)
+    if shortlist < len(rows):
+        rows = np.sort(rows[np.argpartition(-approximate, shortlist - 1)[:shortlist]])
+
+    scores = vectors[rows] @ query
+    k = min(k, len(rows))
+    best = np.argpartition(-scores, k - 1)[:k]
+    best = best[np.lexsort((ids[rows[best]], -scores[best]))]
+    return [(int(ids[rows[i]]), float(scores[i])) for i in best]
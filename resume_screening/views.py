@@ -7,9 +7,9 @@ from django.core.exceptions import ValidationError
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from .serializers import JobDescriptionSerializer, ResumeSerializer
-from .utils.analyze_job_requirements import JobRequirementsAnalyzer
 from resume_screening.utils.skill_matching import calculate_skill_match
-from .utils.enhanced_skill_extraction import EnhancedSkillExtractor
+from .utils.model_registry import get_skill_extractor, get_job_analyzer
+from .utils.resume_index import similar_resumes
 
 #i removed the forms and now validation is here
 #receives file, checks if it exists, creates resume object, saves the resume
@@ -36,6 +36,41 @@ class ResumeUploadAPI(APIView):
         except ValidationError as e:
             return Response({'error': str(e)}, status=400)
 
+#receives several files at once and embeds all of them in batched forward passes
+
+class ResumeBulkUploadAPI(APIView):
+    parser_classes = (MultiPartParser,)
+    permission_classes = [AllowAny]
+    
+    def post(self, request, *args, **kwargs):
+        files = request.FILES.getlist('files')
+        
+        if not files:
+            return Response({'error': 'No files provided'}, status=400)
+
+        resumes = []
+        errors = []
+        for file in files:
+            resume = Resume(file=file)
+            try:
+                resume.full_clean()
+            except ValidationError as e:
+                errors.append({'file': file.name, 'error': str(e)})
+                continue
+            resume.save(embed=False)  # embeddings are computed below for the whole upload
+            resumes.append(resume)
+
+        Resume.update_embeddings(resumes)
+        
+        return Response({
+            'uploaded': [
+                {'id': resume.id, 'extracted_text': resume.extracted_text}
+                for resume in resumes
+            ],
+            'errors': errors,
+            'message': f'{len(resumes)} resumes uploaded successfully'
+        }, status=201 if resumes else 400)
+
 #viewsets provide API for interacting with resume and jobdesc models
 
 class ResumeViewSet(viewsets.ModelViewSet):
@@ -101,8 +136,8 @@ class JobAnalysisAPI(APIView):
         try:
             job = JobDescription.objects.get(id=job_id)
 
-            # Use enhanced job requirements analyzer
-            analyzer = JobRequirementsAnalyzer()
+            # Use enhanced job requirements analyzer (shared per process)
+            analyzer = get_job_analyzer()
             requirements = analyzer.analyze(job.raw_text)
             
             return Response({
@@ -119,6 +154,44 @@ class JobAnalysisAPI(APIView):
         except JobDescription.DoesNotExist:
             return Response({'error': 'Job description not found'}, status=status.HTTP_404_NOT_FOUND)
 
+class SimilarResumesAPI(APIView):
+    """Top-k resumes closest to a job description, from the approximate nearest-neighbour index"""
+    permission_classes = [AllowAny]
+    max_k = 100
+    
+    def get(self, request, job_id, *args, **kwargs):
+        try:
+            k = int(request.query_params.get('k', 10))
+        except ValueError:
+            return Response({'error': 'k must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= k <= self.max_k:
+            return Response({'error': f'k must be between 1 and {self.max_k}'}, status=status.HTTP_400_BAD_REQUEST)
+        method = request.query_params.get('method')
+        if method not in (None, 'ivf', 'sketch'):
+            return Response({'error': "method must be 'ivf' or 'sketch'"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            job = JobDescription.objects.only('id', *JobDescription.EMBEDDING_FIELDS).get(id=job_id)
+        except JobDescription.DoesNotExist:
+            return Response({'error': 'Job description not found'}, status=status.HTTP_404_NOT_FOUND)
+        if job.embedding_vector is None:
+            return Response({'error': 'Job description has no embedding yet'}, status=status.HTTP_409_CONFLICT)
+        
+        try:
+            matches = similar_resumes(job.embedding_vector, k, method=method, model_id=job.embedding_model)
+        except (LookupError, ValueError) as e:
+            return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        
+        files = dict(Resume.objects.filter(id__in=[resume_id for resume_id, _ in matches]).values_list('id', 'file'))
+        return Response({
+            'job_id': job.id,
+            'results': [
+                {'resume_id': resume_id, 'score': round(score, 4), 'file': files.get(resume_id)}
+                for resume_id, score in matches
+                if resume_id in files  # deleted since the index was built
+            ]
+        }, status=status.HTTP_200_OK)
+
 class EnhancedResumeAnalysisAPI(APIView):
     """New API endpoint for enhanced resume skill analysis"""
     permission_classes = [AllowAny]
@@ -131,8 +204,8 @@ class EnhancedResumeAnalysisAPI(APIView):
                 return Response({'error': 'No text extracted from resume'}, 
                               status=status.HTTP_400_BAD_REQUEST)
             
-            # Use enhanced skill extractor
-            extractor = EnhancedSkillExtractor()
+            # Use enhanced skill extractor (shared per process)
+            extractor = get_skill_extractor()
             extracted_skills = extractor.extract_skills_with_confidence(resume.extracted_text)
             
             # Sort skills by confidence
@@ -179,9 +252,9 @@ class EnhancedSkillMatchingAPI(APIView):
                 return Response({'error': 'No text extracted from resume'}, 
                               status=status.HTTP_400_BAD_REQUEST)
             
-            # Use enhanced analyzers
-            skill_extractor = EnhancedSkillExtractor()
-            job_analyzer = JobRequirementsAnalyzer()
+            # Use enhanced analyzers (shared per process)
+            skill_extractor = get_skill_extractor()
+            job_analyzer = get_job_analyzer()
             
             # Analyze resume and job
             resume_skills = skill_extractor.extract_skills_with_confidence(resume.extracted_text)